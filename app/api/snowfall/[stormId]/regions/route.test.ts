@@ -0,0 +1,67 @@
+// ABOUTME: Test suite for /api/snowfall/[stormId]/regions endpoint
+// ABOUTME: Verifies the server-built choropleth FeatureCollection and its cache headers
+
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { GET } from './route';
+import { NextRequest } from 'next/server';
+import { SHARED_CACHE_CONTROL } from '@/lib/http-cache';
+
+describe('/api/snowfall/[stormId]/regions', () => {
+  const testStormId = 'storm-2025-12-04';
+  const originalEnv = process.env.USE_REAL_NOAA_DATA;
+
+  beforeEach(() => {
+    // Use mock data for tests to avoid slow API calls
+    process.env.USE_REAL_NOAA_DATA = 'false';
+  });
+
+  afterEach(() => {
+    process.env.USE_REAL_NOAA_DATA = originalEnv;
+  });
+
+  it('returns a FeatureCollection of colored band shapes', async () => {
+    const mockRequest = new NextRequest(
+      `http://localhost:3000/api/snowfall/${testStormId}/regions`
+    );
+    const response = await GET(mockRequest, { params: Promise.resolve({ stormId: testStormId }) });
+    const data = await response.json();
+
+    expect(response.status).toBe(200);
+    expect(data.type).toBe('FeatureCollection');
+    expect(data.features.length).toBeGreaterThan(0);
+    expect(data.features[0].geometry.type).toBe('MultiPolygon');
+    expect(data.features[0].properties).toHaveProperty('color');
+  });
+
+  it('serves repeat requests from cache with the data routes\' validators', async () => {
+    const mockRequest = new NextRequest(
+      `http://localhost:3000/api/snowfall/${testStormId}/regions`
+    );
+    const first = await GET(mockRequest, { params: Promise.resolve({ stormId: testStormId }) });
+    const response = await GET(mockRequest, { params: Promise.resolve({ stormId: testStormId }) });
+
+    expect(response.headers.get('Cache-Control')).toBe(SHARED_CACHE_CONTROL);
+    expect(response.headers.get('X-Cache-Hit')).toBe('true');
+    expect(response.headers.get('ETag')).toBe(first.headers.get('ETag'));
+  });
+
+  it('returns 304 when the client\'s regions are current', async () => {
+    const url = `http://localhost:3000/api/snowfall/${testStormId}/regions`;
+    const first = await GET(new NextRequest(url), { params: Promise.resolve({ stormId: testStormId }) });
+
+    const response = await GET(
+      new NextRequest(url, { headers: { 'If-None-Match': first.headers.get('ETag')! } }),
+      { params: Promise.resolve({ stormId: testStormId }) }
+    );
+    expect(response.status).toBe(304);
+  });
+
+  it('rejects malformed storm IDs', async () => {
+    const invalidStormId = 'invalid-storm-999';
+    const mockRequest = new NextRequest(
+      `http://localhost:3000/api/snowfall/${invalidStormId}/regions`
+    );
+    const response = await GET(mockRequest, { params: Promise.resolve({ stormId: invalidStormId }) });
+    expect(response.status).toBe(400);
+  });
+});
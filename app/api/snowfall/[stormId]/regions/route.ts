@@ -0,0 +1,61 @@
+// ABOUTME: API route handler for /api/snowfall/[stormId]/regions endpoint
+// ABOUTME: Returns the precomputed choropleth FeatureCollection for a storm so clients skip interpolation
+
+import { NextRequest, NextResponse } from 'next/server';
+import type { SnowfallEvent } from '@/types';
+import { cache } from '@/lib/cache';
+import { buildChoroplethFeatures, type ChoroplethFeatureCollection } from '@/lib/choropleth';
+import { toSampleColumns } from '@/lib/idw-grid';
+import { getStormSnowfall, resolveStormDate, stormSnowfallCacheKey } from '@/lib/storm-snowfall';
+import { internalServerError } from '@/lib/api-error';
+import { cachedResponse } from '@/lib/http-cache';
+
+// Keyed by the cached event, so each refresh is interpolated once and its regions are dropped with it
+const eventRegions = new WeakMap<SnowfallEvent, ChoroplethFeatureCollection>();
+
+/**
+ * Gets the choropleth regions for an event, building them on first use
+ */
+function toRegions(event: SnowfallEvent): ChoroplethFeatureCollection {
+  let regions = eventRegions.get(event);
+  if (!regions) {
+    regions = buildChoroplethFeatures(toSampleColumns(event.measurements));
+    eventRegions.set(event, regions);
+  }
+  return regions;
+}
+
+/**
+ * GET handler for /api/snowfall/[stormId]/regions
+ * Returns choropleth regions built once on the server from the storm's measurements
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ stormId: string }> }
+) {
+  try {
+    const { stormId } = await params;
+
+    const stormDate = resolveStormDate(stormId);
+    if (stormDate instanceof NextResponse) {
+      return stormDate;
+    }
+
+    const cacheKey = stormSnowfallCacheKey(stormId);
+    const cacheStatus = cache.getStatus(cacheKey);
+
+    // Built from the cached storm data, so the NOAA fetch is shared with /api/snowfall/[stormId]
+    // and the regions refresh exactly when the measurements do
+    const snowfallEvent = await getStormSnowfall(stormId, stormDate);
+
+    return cachedResponse(request, toRegions(snowfallEvent), {
+      modifiedAt: cache.getStoredAt(cacheKey),
+      headers: {
+        'X-Cache-Hit': String(cacheStatus !== 'miss'),
+        'X-Cache-Status': cacheStatus,
+      },
+    });
+  } catch (error) {
+    return internalServerError(error);
+  }
+}
@@ -4,6 +4,8 @@
 import { describe, it, expect, beforeEach, afterEach } from 'vitest';
 import { GET } from './route';
 import { NextRequest } from 'next/server';
+import { COLUMNAR_MEDIA_TYPE, decodeColumnar } from '@/lib/columnar';
+import { BINARY_MEDIA_TYPE, decodeBinary } from '@/lib/binary-snowfall';
 
 describe('/api/snowfall/[stormId]', () => {
   const testStormId = 'storm-2025-12-04';
@@ -80,4 +82,55 @@ describe('/api/snowfall/[stormId]', () => {
     const response = await GET(mockRequest, { params: Promise.resolve({ stormId: invalidStormId }) });
     expect(response.status).toBe(404);
   });
+
+  it('returns the columnar format when asked with ?format=columnar', async () => {
+    const mockRequest = new NextRequest(
+      `http://localhost:3000/api/snowfall/${testStormId}?format=columnar`
+    );
+    const response = await GET(mockRequest, { params: Promise.resolve({ stormId: testStormId }) });
+    const data = await response.json();
+
+    expect(response.headers.get('Content-Type')).toBe(COLUMNAR_MEDIA_TYPE);
+    expect(data.format).toBe('columnar');
+    expect(decodeColumnar(data).event.measurements.length).toBe(data.lats.length);
+  });
+
+  it('returns the binary format when asked with ?format=binary', async () => {
+    const mockRequest = new NextRequest(
+      `http://localhost:3000/api/snowfall/${testStormId}?format=binary`
+    );
+    const response = await GET(mockRequest, { params: Promise.resolve({ stormId: testStormId }) });
+    const { event } = decodeBinary(await response.arrayBuffer());
+
+    expect(response.headers.get('Content-Type')).toBe(BINARY_MEDIA_TYPE);
+    expect(event.stormId).toBe(testStormId);
+  });
+
+  it('returns only the measurements in a viewport with ?bbox=', async () => {
+    const all = await (await GET(
+      new NextRequest(`http://localhost:3000/api/snowfall/${testStormId}`),
+      { params: Promise.resolve({ stormId: testStormId }) }
+    )).json();
+
+    const response = await GET(
+      new NextRequest(`http://localhost:3000/api/snowfall/${testStormId}?bbox=-88,41.6,-87.3,42.1&zoom=11`),
+      { params: Promise.resolve({ stormId: testStormId }) }
+    );
+    const data = await response.json();
+
+    expect(response.status).toBe(200);
+    expect(data.measurements.length).toBeLessThanOrEqual(all.measurements.length);
+    for (const m of data.measurements) {
+      expect(m.lon).toBeGreaterThanOrEqual(-88.1);
+      expect(m.lon).toBeLessThanOrEqual(-87.2);
+    }
+  });
+
+  it('returns 400 for a malformed bbox', async () => {
+    const response = await GET(
+      new NextRequest(`http://localhost:3000/api/snowfall/${testStormId}?bbox=-88,41.6`),
+      { params: Promise.resolve({ stormId: testStormId }) }
+    );
+    expect(response.status).toBe(400);
+  });
 });
@@ -2,14 +2,20 @@
 // ABOUTME: Returns snowfall data for a specific storm by ID
 
 import { NextRequest, NextResponse } from 'next/server';
-import { SnowfallEvent } from '@/types';
 import { cache } from '@/lib/cache';
-import { fetchAllNoaaSnowfall } from '@/lib/noaa-client';
-import { badRequestError, notFoundError, internalServerError } from '@/lib/api-error';
+import { getStormSnowfall, resolveStormDate, stormSnowfallCacheKey } from '@/lib/storm-snowfall';
+import { internalServerError } from '@/lib/api-error';
+import { cachedResponse } from '@/lib/http-cache';
+import { COLUMNAR_MEDIA_TYPE, toColumnar, wantsColumnar } from '@/lib/columnar';
+import { BINARY_MEDIA_TYPE, toBinary, wantsBinary } from '@/lib/binary-snowfall';
+import { parseViewport, queryViewport } from '@/lib/viewport-snowfall';
 
 /**
  * GET handler for /api/snowfall/[stormId]
- * Returns snowfall measurements for a specific storm
+ * Returns snowfall measurements for a specific storm, or 304 if the client's copy is current
+ * Clients may ask for the compact columnar format (?format=columnar) or the binary
+ * format (?format=binary), by query string or Accept header, and for just the
+ * measurements in a viewport (?bbox=minLon,minLat,maxLon,maxLat&zoom=z)
  */
 export async function GET(
   request: NextRequest,
@@ -18,57 +24,45 @@ export async function GET(
   try {
     const { stormId } = await params;
 
-    // Validate stormId format (should be like "storm-2025-12-04")
-    if (!stormId || !stormId.match(/^storm-\d{4}-\d{2}-\d{2}$/)) {
-      return badRequestError('Storm ID must be in format: storm-YYYY-MM-DD');
+    const stormDate = resolveStormDate(stormId);
+    if (stormDate instanceof NextResponse) {
+      return stormDate;
     }
 
-    // Check cache first
-    const cacheKey = `snowfall:${stormId}`;
-    const cachedData = cache.get<SnowfallEvent>(cacheKey);
-    if (cachedData) {
-      return NextResponse.json(cachedData, {
-        headers: {
-          'Content-Type': 'application/json',
-          'X-Cache-Hit': 'true',
-        },
-      });
+    const { searchParams } = request.nextUrl;
+    const viewport = parseViewport(searchParams);
+    if (viewport instanceof NextResponse) {
+      return viewport;
     }
 
-    // Extract date from stormId
-    const dateMatch = stormId.match(/storm-(\d{4})-(\d{2})-(\d{2})/);
-    if (!dateMatch) {
-      return badRequestError('Could not parse date from storm ID');
-    }
-
-    const [, year, month, day] = dateMatch;
-    const stormDate = new Date(`${year}-${month}-${day}`);
+    // Check cache freshness first
+    const cacheStatus = cache.getStatus(stormSnowfallCacheKey(stormId));
 
-    // Verify the storm date is not in the future
-    const now = new Date();
-    if (stormDate > now) {
-      return notFoundError('Storm date is in the future');
-    }
+    // Serve cached data (stale entries refresh in the background) or fetch fresh
+    // data, with concurrent misses sharing one NOAA fetch
+    const snowfallEvent = await getStormSnowfall(stormId, stormDate);
 
-    // Fetch snowfall data for this storm
-    // For MVP, we'll use the same NOAA data regardless of stormId
-    // In production, this would query historical data for the specific date
-    const measurements = await fetchAllNoaaSnowfall();
+    // Narrow to the client's viewport, binned when zoomed out
+    const event = viewport ? queryViewport(snowfallEvent, viewport) : snowfallEvent;
+    const accept = request.headers.get('accept');
 
-    // Create snowfall event
-    const snowfallEvent: SnowfallEvent = {
-      stormId,
-      date: stormDate.toISOString(),
-      measurements,
-    };
-
-    // Store in cache (2-hour TTL by default)
-    cache.set(cacheKey, snowfallEvent);
+    let body: object = event;
+    let contentType: string | undefined;
+    if (wantsBinary(searchParams, accept)) {
+      body = toBinary(event);
+      contentType = BINARY_MEDIA_TYPE;
+    } else if (wantsColumnar(searchParams, accept)) {
+      body = toColumnar(event);
+      contentType = COLUMNAR_MEDIA_TYPE;
+    }
 
-    return NextResponse.json(snowfallEvent, {
+    return cachedResponse(request, body, {
+      modifiedAt: cache.getStoredAt(stormSnowfallCacheKey(stormId)),
+      contentType,
+      vary: 'Accept',
       headers: {
-        'Content-Type': 'application/json',
-        'X-Cache-Hit': 'false',
+        'X-Cache-Hit': String(cacheStatus !== 'miss'),
+        'X-Cache-Status': cacheStatus,
       },
     });
   } catch (error) {
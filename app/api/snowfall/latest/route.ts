@@ -1,52 +1,57 @@
 // ABOUTME: API route handler for /api/snowfall/latest endpoint
 // ABOUTME: Returns the most recent snowfall event data with caching
 
-import { NextRequest, NextResponse } from 'next/server';
+import { NextRequest } from 'next/server';
 import { SnowfallEvent } from '@/types';
 import { fetchAllNoaaSnowfall } from '@/lib/noaa-client';
 import { cache } from '@/lib/cache';
 import { internalServerError } from '@/lib/api-error';
+import { cachedResponse } from '@/lib/http-cache';
+import { COLUMNAR_MEDIA_TYPE, toColumnar, wantsColumnar } from '@/lib/columnar';
 
 const CACHE_KEY = 'snowfall:latest';
 
+/**
+ * Builds the latest snowfall event from NOAA sources
+ */
+async function loadLatestSnowfall(): Promise<SnowfallEvent> {
+  const measurements = await fetchAllNoaaSnowfall();
+
+  // Generate storm ID based on current date
+  const now = new Date();
+  const stormId = `storm-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
+
+  return {
+    stormId,
+    date: now.toISOString(),
+    measurements,
+  };
+}
+
 /**
  * GET handler for /api/snowfall/latest
- * Returns the most recent snowfall event with measurements from NOAA sources
+ * Returns the most recent snowfall event with measurements from NOAA sources,
+ * or 304 if the client's copy is current
+ * Clients may ask for the compact columnar format with ?format=columnar or an Accept header
  */
 export async function GET(request: NextRequest) {
   try {
-    // Check cache first
-    const cachedData = cache.get<SnowfallEvent>(CACHE_KEY);
-    if (cachedData) {
-      return NextResponse.json(cachedData, {
-        headers: {
-          'Content-Type': 'application/json',
-          'X-Cache-Hit': 'true',
-        },
-      });
-    }
-
-    // Fetch fresh data from NOAA APIs
-    const measurements = await fetchAllNoaaSnowfall();
-
-    // Generate storm ID based on current date
-    const now = new Date();
-    const stormId = `storm-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
-
-    // Create snowfall event
-    const snowfallEvent: SnowfallEvent = {
-      stormId,
-      date: now.toISOString(),
-      measurements,
-    };
-
-    // Store in cache (2-hour TTL by default)
-    cache.set(CACHE_KEY, snowfallEvent);
-
-    return NextResponse.json(snowfallEvent, {
+    // Check cache freshness first
+    const cacheStatus = cache.getStatus(CACHE_KEY);
+
+    // Serve cached data (stale entries refresh in the background) or fetch fresh
+    // data, with concurrent misses sharing one NOAA fetch
+    const snowfallEvent = await cache.getOrLoad(CACHE_KEY, loadLatestSnowfall);
+
+    const columnar = wantsColumnar(request.nextUrl.searchParams, request.headers.get('accept'));
+
+    return cachedResponse(request, columnar ? toColumnar(snowfallEvent) : snowfallEvent, {
+      modifiedAt: cache.getStoredAt(CACHE_KEY),
+      contentType: columnar ? COLUMNAR_MEDIA_TYPE : undefined,
+      vary: 'Accept',
       headers: {
-        'Content-Type': 'application/json',
-        'X-Cache-Hit': 'false',
+        'X-Cache-Hit': String(cacheStatus !== 'miss'),
+        'X-Cache-Status': cacheStatus,
       },
     });
   } catch (error) {
@@ -70,4 +70,25 @@ describe('/api/storms', () => {
       expect(currentDate.getTime()).toBeGreaterThanOrEqual(nextDate.getTime());
     }
   });
+
+  it('sends validators and a shared Cache-Control', async () => {
+    const response = await GET(mockRequest);
+
+    expect(response.headers.get('ETag')).toMatch(/^".+"$/);
+    expect(response.headers.get('Last-Modified')).toBeTruthy();
+    expect(response.headers.get('Cache-Control')).toContain('s-maxage=');
+  });
+
+  it('answers a matching If-None-Match with an empty 304', async () => {
+    const first = await GET(mockRequest);
+    const etag = first.headers.get('ETag')!;
+
+    const response = await GET(
+      new NextRequest('http://localhost:3000/api/storms', { headers: { 'If-None-Match': etag } })
+    );
+
+    expect(response.status).toBe(304);
+    expect(response.headers.get('ETag')).toBe(etag);
+    expect(await response.text()).toBe('');
+  });
 });
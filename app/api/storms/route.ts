@@ -1,62 +1,62 @@
 // ABOUTME: API route handler for /api/storms endpoint
 // ABOUTME: Returns current snow depth data (MVP - no historical storms yet)
 
-import { NextRequest, NextResponse } from 'next/server';
+import { NextRequest } from 'next/server';
 import { StormMetadata } from '@/types';
 import { cache } from '@/lib/cache';
 import { fetchAllNoaaSnowfall } from '@/lib/noaa-client';
 import { internalServerError } from '@/lib/api-error';
+import { cachedResponse } from '@/lib/http-cache';
 
 const CACHE_KEY = 'storms:list';
 
 /**
- * GET handler for /api/storms
- * Returns current snow depth data only (MVP)
- * Historical storm data not yet implemented
+ * Builds the storm list with real stats from the latest NOAA measurements
  */
-export async function GET(request: NextRequest) {
-  try {
-    // Check cache first
-    const cachedData = cache.get<StormMetadata[]>(CACHE_KEY);
-    if (cachedData) {
-      return NextResponse.json(cachedData, {
-        headers: {
-          'Content-Type': 'application/json',
-          'X-Cache-Hit': 'true',
-        },
-      });
-    }
+async function loadStorms(): Promise<StormMetadata[]> {
+  // Fetch latest snowfall data to calculate real stats
+  const measurements = await fetchAllNoaaSnowfall();
 
-    // Fetch latest snowfall data to calculate real stats
-    const measurements = await fetchAllNoaaSnowfall();
+  // Calculate real stats from measurements
+  const now = new Date();
+  const stormId = `storm-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
 
-    // Calculate real stats from measurements
-    const now = new Date();
-    const stormId = `storm-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
+  const totalStations = measurements.length;
+  const maxSnowfall = measurements.length > 0
+    ? Math.round(Math.max(...measurements.map(m => m.amount)) * 10) / 10
+    : 0;
 
-    const totalStations = measurements.length;
-    const maxSnowfall = measurements.length > 0
-      ? Math.round(Math.max(...measurements.map(m => m.amount)) * 10) / 10
-      : 0;
+  // Create current storm with real stats
+  const currentStorm: StormMetadata = {
+    id: stormId,
+    date: now.toISOString(),
+    totalStations,
+    maxSnowfall,
+  };
 
-    // Create current storm with real stats
-    const currentStorm: StormMetadata = {
-      id: stormId,
-      date: now.toISOString(),
-      totalStations,
-      maxSnowfall,
-    };
+  // MVP: Only return current storm (no historical data yet)
+  return [currentStorm];
+}
 
-    // MVP: Only return current storm (no historical data yet)
-    const storms = [currentStorm];
+/**
+ * GET handler for /api/storms
+ * Returns current snow depth data only (MVP)
+ * Historical storm data not yet implemented
+ */
+export async function GET(request: NextRequest) {
+  try {
+    // Check cache freshness first
+    const cacheStatus = cache.getStatus(CACHE_KEY);
 
-    // Store in cache (2-hour TTL by default)
-    cache.set(CACHE_KEY, storms);
+    // Serve cached data (stale entries refresh in the background) or fetch fresh
+    // data, with concurrent misses sharing one NOAA fetch
+    const storms = await cache.getOrLoad(CACHE_KEY, loadStorms);
 
-    return NextResponse.json(storms, {
+    return cachedResponse(request, storms, {
+      modifiedAt: cache.getStoredAt(CACHE_KEY),
       headers: {
-        'Content-Type': 'application/json',
-        'X-Cache-Hit': 'false',
+        'X-Cache-Hit': String(cacheStatus !== 'miss'),
+        'X-Cache-Status': cacheStatus,
       },
     });
   } catch (error) {
@@ -0,0 +1,66 @@
+// ABOUTME: Test suite for /api/tiles/[stormId]/[z]/[x]/[y] endpoint
+// ABOUTME: Verifies PNG tile rendering, tile caching, revalidation and coordinate validation
+
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { GET } from './route';
+import { NextRequest } from 'next/server';
+import { SHARED_CACHE_CONTROL } from '@/lib/http-cache';
+
+const PNG_SIGNATURE = [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a];
+
+describe('/api/tiles/[stormId]/[z]/[x]/[y]', () => {
+  const testStormId = 'storm-2025-12-04';
+  const originalEnv = process.env.USE_REAL_NOAA_DATA;
+
+  // Tile containing Chicago at zoom 8
+  const chicagoTile = { stormId: testStormId, z: '8', x: '65', y: '95.png' };
+
+  beforeEach(() => {
+    // Use mock data for tests to avoid slow API calls
+    process.env.USE_REAL_NOAA_DATA = 'false';
+  });
+
+  afterEach(() => {
+    process.env.USE_REAL_NOAA_DATA = originalEnv;
+  });
+
+  it('returns a PNG tile', async () => {
+    const mockRequest = new NextRequest(`http://localhost:3000/api/tiles/${testStormId}/8/65/95.png`);
+    const response = await GET(mockRequest, { params: Promise.resolve(chicagoTile) });
+    const body = new Uint8Array(await response.arrayBuffer());
+
+    expect(response.status).toBe(200);
+    expect(response.headers.get('Content-Type')).toBe('image/png');
+    expect(Array.from(body.subarray(0, 8))).toEqual(PNG_SIGNATURE);
+  });
+
+  it('serves repeat requests from the tile cache', async () => {
+    const mockRequest = new NextRequest(`http://localhost:3000/api/tiles/${testStormId}/8/65/95.png`);
+    await GET(mockRequest, { params: Promise.resolve(chicagoTile) });
+    const response = await GET(mockRequest, { params: Promise.resolve(chicagoTile) });
+
+    expect(response.headers.get('X-Cache-Hit')).toBe('true');
+    expect(response.headers.get('Cache-Control')).toBe(SHARED_CACHE_CONTROL);
+  });
+
+  it('returns 304 when the client\'s tile is current', async () => {
+    const url = `http://localhost:3000/api/tiles/${testStormId}/8/65/95.png`;
+    const first = await GET(new NextRequest(url), { params: Promise.resolve(chicagoTile) });
+    expect(first.headers.get('Last-Modified')).not.toBeNull();
+
+    const response = await GET(
+      new NextRequest(url, { headers: { 'If-None-Match': first.headers.get('ETag')! } }),
+      { params: Promise.resolve(chicagoTile) }
+    );
+    expect(response.status).toBe(304);
+  });
+
+  it('rejects out-of-range tile coordinates', async () => {
+    const mockRequest = new NextRequest(`http://localhost:3000/api/tiles/${testStormId}/2/4/0`);
+    const response = await GET(mockRequest, {
+      params: Promise.resolve({ stormId: testStormId, z: '2', x: '4', y: '0' }),
+    });
+
+    expect(response.status).toBe(400);
+  });
+});
@@ -0,0 +1,84 @@
+// ABOUTME: API route handler for /api/tiles/[stormId]/[z]/[x]/[y] endpoint
+// ABOUTME: Renders PNG raster tiles of the interpolated snow surface on demand from the storm's cached samples
+
+import { NextRequest, NextResponse } from 'next/server';
+import type { SnowfallEvent } from '@/types';
+import { tileCache } from '@/lib/tile-cache';
+import { renderSnowTile } from '@/lib/snow-tiles';
+import { toSampleColumns } from '@/lib/idw-grid';
+import { getStormSnowfall, resolveStormDate } from '@/lib/storm-snowfall';
+import { badRequestError, internalServerError } from '@/lib/api-error';
+import { cachedResponse } from '@/lib/http-cache';
+
+const MAX_TILE_ZOOM = 18;
+
+// A number per cached event object, so each refresh of a storm renders its own tiles
+const eventVersions = new WeakMap<SnowfallEvent, number>();
+let nextEventVersion = 0;
+
+/**
+ * Gets the tile cache version of an event, assigning one on first use
+ */
+function eventVersion(event: SnowfallEvent): number {
+  let version = eventVersions.get(event);
+  if (version === undefined) {
+    version = nextEventVersion++;
+    eventVersions.set(event, version);
+  }
+  return version;
+}
+
+/**
+ * Parses a tile coordinate path segment, allowing a trailing .png on y
+ */
+function parseTileIndex(segment: string): number | null {
+  const match = segment.match(/^(\d+)(\.png)?$/);
+  return match ? Number(match[1]) : null;
+}
+
+/**
+ * GET handler for /api/tiles/[stormId]/[z]/[x]/[y]
+ * Returns a 256px PNG tile of the storm's snow depth, colored by snowfall band
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ stormId: string; z: string; x: string; y: string }> }
+) {
+  try {
+    const { stormId, z: zSegment, x: xSegment, y: ySegment } = await params;
+
+    const stormDate = resolveStormDate(stormId);
+    if (stormDate instanceof NextResponse) {
+      return stormDate;
+    }
+
+    const z = parseTileIndex(zSegment);
+    const x = parseTileIndex(xSegment);
+    const y = parseTileIndex(ySegment);
+    if (z === null || x === null || y === null || z > MAX_TILE_ZOOM || x >= 2 ** z || y >= 2 ** z) {
+      return badRequestError(`Tile must be z/x/y with z <= ${MAX_TILE_ZOOM} and x, y < 2^z`);
+    }
+
+    const snowfallEvent = await getStormSnowfall(stormId, stormDate);
+
+    // Keyed by the event the tile is rendered from, so tiles of a refreshed storm never
+    // mix with tiles of its previous data; old versions age out of the tile cache
+    const cacheKey = `tile:${stormId}:${eventVersion(snowfallEvent)}:${z}/${x}/${y}`;
+    const cacheStatus = tileCache.getStatus(cacheKey);
+
+    const png = await tileCache.getOrLoad(cacheKey, async () =>
+      renderSnowTile(toSampleColumns(snowfallEvent.measurements), { z, x, y })
+    );
+
+    // Last-Modified is when the tile was rendered, which always follows its data's load
+    return cachedResponse(request, png, {
+      contentType: 'image/png',
+      headers: {
+        'X-Cache-Hit': String(cacheStatus !== 'miss'),
+        'X-Cache-Status': cacheStatus,
+      },
+    });
+  } catch (error) {
+    return internalServerError(error);
+  }
+}
@@ -2,7 +2,7 @@
 // ABOUTME: Verifies map rendering and interaction with Mapbox
 
 import { describe, it, expect } from 'vitest';
-import { render, screen } from '@testing-library/react';
+import { fireEvent, render, screen } from '@testing-library/react';
 import { SnowfallProvider } from '@/lib/contexts/SnowfallContext';
 import SnowfallMap from './SnowfallMap';
 import type { SnowfallEvent, StormMetadata } from '@/types';
@@ -51,4 +51,16 @@ describe('SnowfallMap', () => {
     const mapContainer = screen.getByTestId('map-container');
     expect(mapContainer).toHaveClass('w-full', 'h-full');
   });
+
+  it('switches to the GPU heatmap mode', () => {
+    render(
+      <SnowfallProvider initialData={mockData} storms={mockStorms}>
+        <SnowfallMap />
+      </SnowfallProvider>
+    );
+    const gpuToggle = screen.getByTestId('toggle-gpu');
+    fireEvent.click(gpuToggle);
+    expect(gpuToggle).toHaveClass('bg-blue-600');
+    expect(screen.getByTestId('toggle-both')).not.toHaveClass('bg-blue-600');
+  });
 });
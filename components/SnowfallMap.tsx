@@ -1,15 +1,24 @@
 // ABOUTME: Map component that displays snowfall data on an interactive Mapbox map
-// ABOUTME: Shows filled regions (choropleth) and markers for snowfall measurements
+// ABOUTME: Shows filled regions (choropleth), a GPU heatmap and markers for snowfall measurements
 
 'use client';
 
 import { useEffect, useRef, useState } from 'react';
 import mapboxgl from 'mapbox-gl';
-import { Delaunay } from 'd3-delaunay';
 import 'mapbox-gl/dist/mapbox-gl.css';
 import type { SnowfallEvent } from '@/types';
 import { formatTimestamp } from '@/lib/format-date';
 import { useSnowfall } from '@/lib/contexts/SnowfallContext';
+import {
+  CHOROPLETH_BOUNDS,
+  getSnowfallColor,
+  SNOWFALL_BANDS,
+  type ChoroplethFeatureCollection,
+  type ChoroplethProperties,
+} from '@/lib/choropleth';
+import { ChoroplethWorkerClient } from '@/lib/choropleth-client';
+import { DETAIL_MIN_ZOOM, DetailSurface } from '@/lib/choropleth-detail';
+import { FEATURE_ID_PROPERTY, GeoJSONSourceSync } from '@/lib/geojson-sync';
 
 declare global {
   interface Window {
@@ -17,167 +26,326 @@ declare global {
   }
 }
 
-type VisualizationMode = 'heatmap' | 'markers' | 'both';
+type VisualizationMode = 'heatmap' | 'markers' | 'both' | 'gpu';
 
-// Color mapping for snowfall amounts
-function getSnowfallColor(amount: number): string {
-  if (amount >= 10) return '#7C3AED'; // Purple
-  if (amount >= 6) return '#1E40AF';  // Dark blue
-  if (amount >= 4) return '#2563EB';  // Deep blue
-  if (amount >= 2) return '#60A5FA';  // Medium blue
-  return '#DBEAFE';                   // Light blue
+// NEXT_PUBLIC_SNOW_SURFACE_SOURCE=tiles draws the snow surface from server-rendered
+// raster tiles instead of GeoJSON regions, so only on-screen tiles are downloaded
+const USE_TILED_SURFACE = process.env.NEXT_PUBLIC_SNOW_SURFACE_SOURCE === 'tiles';
+
+// Raster tile URL template for a storm's snow surface
+function snowTileUrl(stormId: string): string {
+  return `${window.location.origin}/api/tiles/${stormId}/{z}/{x}/{y}.png`;
 }
 
-// Interpolate snowfall value at a point using Inverse Distance Weighting
-function interpolateValue(
-  lon: number,
-  lat: number,
-  measurements: SnowfallEvent['measurements'],
-  power: number = 2,
-  searchRadius?: number
-): number {
-  let weightSum = 0;
-  let valueSum = 0;
-
-  for (const m of measurements) {
-    // Calculate Euclidean distance
-    const dx = lon - m.lon;
-    const dy = lat - m.lat;
-    const distance = Math.sqrt(dx * dx + dy * dy);
-
-    // Avoid division by zero for exact matches
-    if (distance < 0.001) {
-      return m.amount;
-    }
+interface MarkerProperties {
+  featureId: string;
+  amount: number;
+  station: string;
+  source: string;
+  timestamp: string;
+  color: string;
+}
 
-    // Skip distant points if radius specified
-    if (searchRadius && distance > searchRadius) continue;
+type MarkerFeature = GeoJSON.Feature<GeoJSON.Point, MarkerProperties>;
+type RegionFeature = GeoJSON.Feature<GeoJSON.MultiPolygon, ChoroplethProperties & { featureId: number }>;
+
+// Highest zoom at which markers are clustered
+const CLUSTER_MAX_ZOOM = 12;
+
+// Marker pop-in: markers start at this fraction of their size and grow back over the duration
+const MARKER_POP_IN_SCALE = 0.5;
+const MARKER_POP_IN_MS = 200; // 200ms as per design spec
+
+// Unclustered marker radius, scaled for the pop-in animation
+function markerRadius(scale: number): mapboxgl.ExpressionSpecification {
+  return [
+    'interpolate',
+    ['linear'],
+    ['zoom'],
+    0, 22 * scale,   // 44px diameter at low zoom (mobile-optimized)
+    10, 22 * scale,  // 44px diameter at medium zoom
+    15, 16 * scale   // 32px diameter at high zoom (desktop when zoomed in)
+  ];
+}
 
-    // Inverse distance weighting
-    const weight = 1 / Math.pow(distance, power);
-    weightSum += weight;
-    valueSum += weight * m.amount;
-  }
+// Clusters are rebuilt at each integer zoom up to CLUSTER_MAX_ZOOM, so only
+// zooms that change that level can reveal new markers
+function crossesClusterLevel(fromZoom: number, toZoom: number): boolean {
+  const from = Math.floor(fromZoom);
+  const to = Math.floor(toZoom);
+  return from !== to && Math.min(from, to) <= CLUSTER_MAX_ZOOM;
+}
 
-  return valueSum / weightSum;
+// Point features for a storm's measurements, shared by the marker and GPU heatmap sources.
+// Features are keyed by station so stations present in both storms diff as updates
+function toMarkersGeoJSON(event: SnowfallEvent): GeoJSON.FeatureCollection<GeoJSON.Point, MarkerProperties> {
+  const seen = new Map<string, number>();
+
+  return {
+    type: 'FeatureCollection',
+    features: event.measurements.map(m => {
+      const repeats = seen.get(m.station) ?? 0;
+      seen.set(m.station, repeats + 1);
+
+      return {
+        type: 'Feature',
+        geometry: {
+          type: 'Point',
+          coordinates: [m.lon, m.lat]
+        },
+        properties: {
+          [FEATURE_ID_PROPERTY]: repeats === 0 ? m.station : `${m.station}#${repeats}`,
+          amount: Math.round(m.amount * 10) / 10, // Round to 1 decimal place
+          station: m.station,
+          source: m.source,
+          timestamp: m.timestamp,
+          color: getSnowfallColor(m.amount)
+        }
+      };
+    })
+  };
 }
 
-// Create dense grid with interpolated values, then generate Voronoi polygons
-function createVoronoiPolygons(measurements: SnowfallEvent['measurements'], bounds: [[number, number], [number, number]]) {
-  if (measurements.length === 0) return [];
+// Choropleth bands keyed by their lower bound, which is stable across storms
+function withBandIds(
+  regions: ChoroplethFeatureCollection
+): GeoJSON.FeatureCollection<GeoJSON.MultiPolygon, RegionFeature['properties']> {
+  return {
+    type: 'FeatureCollection',
+    features: regions.features.map(feature => ({
+      ...feature,
+      properties: { ...feature.properties, [FEATURE_ID_PROPERTY]: feature.properties.amount }
+    }))
+  };
+}
 
-  const [[minX, minY], [maxX, maxY]] = bounds;
+export default function SnowfallMap() {
+  const { snowfallData: data, setSelectedMarker, stormCache } = useSnowfall();
+  const mapContainer = useRef<HTMLDivElement>(null);
+  const map = useRef<mapboxgl.Map | null>(null);
+  const [vizMode, setVizMode] = useState<VisualizationMode>('both');
+  const isAnimatingRef = useRef(false);
+  const choroplethClient = useRef<ChoroplethWorkerClient | null>(null);
+  const regionsRequestId = useRef(0);
+  const detailSurface = useRef<DetailSurface | null>(null);
+  const detailActive = useRef(false);
+  const vizModeRef = useRef(vizMode);
+  const dataRef = useRef(data);
+  const regionsStormId = useRef<string | null>(null);
+  const appliedStormId = useRef<string | null>(null);
+  const idleUpdateQueued = useRef(false);
+  const regionsSync = useRef<GeoJSONSourceSync<RegionFeature> | null>(null);
+  const markersSync = useRef<GeoJSONSourceSync<MarkerFeature> | null>(null);
+  const pointsSync = useRef<GeoJSONSourceSync<MarkerFeature> | null>(null);
+  const viewportRequest = useRef<AbortController | null>(null);
+
+  // Load server-built choropleth regions (cached per storm), falling back to the
+  // Web Worker if the endpoint fails; only the latest storm's regions are applied
+  const updateRegions = async (event: SnowfallEvent) => {
+    const requestId = ++regionsRequestId.current;
+    choroplethClient.current?.cancel();
+
+    // The GPU heatmap draws straight from the points; regions are rebuilt when leaving it
+    if (vizModeRef.current === 'gpu') return;
+
+    let features = await stormCache.loadRegions(event.stormId);
+
+    if (requestId !== regionsRequestId.current) return;
+
+    if (!features) {
+      if (!choroplethClient.current) {
+        choroplethClient.current = new ChoroplethWorkerClient();
+      }
 
-  // Create dense grid of interpolated points
-  const gridResolution = 0.25; // Grid spacing in degrees (~17 miles)
-  const gridPoints: Array<{ lon: number; lat: number; amount: number }> = [];
+      try {
+        features = await choroplethClient.current.build(stormCache.getColumns(event.stormId) ?? event.measurements);
+        if (features) stormCache.setRegions(event.stormId, features);
+      } catch (error) {
+        console.error('Failed to build choropleth regions:', error);
+        return;
+      }
+    }
 
-  for (let lon = minX; lon <= maxX; lon += gridResolution) {
-    for (let lat = minY; lat <= maxY; lat += gridResolution) {
-      const interpolatedAmount = interpolateValue(lon, lat, measurements);
-      gridPoints.push({ lon, lat, amount: interpolatedAmount });
+    if (features && regionsSync.current && requestId === regionsRequestId.current) {
+      regionsSync.current.update(withBandIds(features));
+      regionsStormId.current = event.stormId;
+    }
+  };
+
+  // Show either the coarse regional surface, the viewport detail tiles or the GPU heatmap
+  const applyRegionOpacity = () => {
+    if (!map.current) return;
+
+    const showHeatmap = vizModeRef.current === 'heatmap' || vizModeRef.current === 'both';
+    const showGpuHeatmap = vizModeRef.current === 'gpu';
+    const showDetail = detailActive.current;
+
+    if (map.current.getLayer('snowfall-fill')) {
+      map.current.setPaintProperty('snowfall-fill', 'fill-opacity', showHeatmap && !showDetail ? 0.6 : 0);
+    }
+
+    if (map.current.getLayer('snowfall-borders')) {
+      map.current.setPaintProperty('snowfall-borders', 'line-opacity', showHeatmap && !showDetail ? 0.3 : 0);
+    }
+
+    if (map.current.getLayer('snowfall-detail-fill')) {
+      map.current.setPaintProperty('snowfall-detail-fill', 'fill-opacity', showHeatmap && showDetail ? 0.6 : 0);
+    }
+
+    if (map.current.getLayer('snowfall-raster')) {
+      map.current.setPaintProperty('snowfall-raster', 'raster-opacity', showHeatmap ? 0.6 : 0);
     }
-  }
 
-  // Create Delaunay triangulation from dense grid
-  const points = gridPoints.map(p => [p.lon, p.lat] as [number, number]);
-  const delaunay = Delaunay.from(points);
-
-  // Create Voronoi diagram
-  const voronoi = delaunay.voronoi([minX, minY, maxX, maxY]);
-
-  // Convert Voronoi cells to GeoJSON features
-  const features = [];
-  for (let i = 0; i < gridPoints.length; i++) {
-    const cell = voronoi.cellPolygon(i);
-    if (!cell) continue;
-
-    const amount = gridPoints[i].amount;
-    features.push({
-      type: 'Feature' as const,
-      properties: {
-        amount: amount,
-        color: getSnowfallColor(amount)
-      },
-      geometry: {
-        type: 'Polygon' as const,
-        coordinates: [cell.map(([x, y]) => [x, y])]
+    if (map.current.getLayer('snowfall-heat')) {
+      map.current.setPaintProperty('snowfall-heat', 'heatmap-opacity', showGpuHeatmap ? 0.7 : 0);
+    }
+  };
+
+  const setDetailActive = (active: boolean) => {
+    if (detailActive.current === active) return;
+    detailActive.current = active;
+    applyRegionOpacity();
+  };
+
+  // Swap in fine tiles for the current viewport once zoomed in past the coarse surface
+  const refreshDetail = async () => {
+    if (!map.current || USE_TILED_SURFACE || vizModeRef.current === 'gpu') return;
+
+    const zoom = map.current.getZoom();
+    const bounds = map.current.getBounds();
+
+    if (zoom < DETAIL_MIN_ZOOM || !bounds) {
+      detailSurface.current?.cancel();
+      setDetailActive(false);
+      return;
+    }
+
+    if (!detailSurface.current) {
+      detailSurface.current = new DetailSurface();
+    }
+
+    try {
+      const features = await detailSurface.current.load(
+        stormCache.getColumns(dataRef.current.stormId) ?? dataRef.current.measurements,
+        [[bounds.getWest(), bounds.getSouth()], [bounds.getEast(), bounds.getNorth()]],
+        zoom
+      );
+
+      // Superseded by a newer viewport or storm
+      if (!features) return;
+
+      const source = map.current?.getSource('snowfall-detail') as mapboxgl.GeoJSONSource | undefined;
+      if (source) {
+        source.setData(features);
+        setDetailActive(true);
       }
-    });
-  }
+    } catch (error) {
+      console.error('Failed to build detail tiles:', error);
+    }
+  };
 
-  return features;
-}
+  // Load just the on-screen measurements (grid points binned when zoomed out) into the point
+  // sources, so their size follows the viewport rather than the whole storm
+  const refreshViewportPoints = async () => {
+    const bounds = map.current?.getBounds();
+    if (!map.current || !bounds) return;
+
+    viewportRequest.current?.abort();
+    const controller = new AbortController();
+    viewportRequest.current = controller;
+
+    const event = dataRef.current;
+    let pointsEvent = event;
+    try {
+      pointsEvent = await stormCache.loadViewport(
+        event.stormId,
+        {
+          bbox: [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()],
+          zoom: map.current.getZoom()
+        },
+        controller.signal
+      );
+    } catch (error) {
+      if (controller.signal.aborted) return;
+      // Fall back to every measurement of the storm
+      console.warn('Failed to fetch viewport measurements:', error);
+    }
 
-export default function SnowfallMap() {
-  const { snowfallData: data, setSelectedMarker } = useSnowfall();
-  const mapContainer = useRef<HTMLDivElement>(null);
-  const map = useRef<mapboxgl.Map | null>(null);
-  const [vizMode, setVizMode] = useState<VisualizationMode>('both');
-  const isAnimatingRef = useRef(false);
+    // Superseded by a newer viewport or storm
+    if (controller.signal.aborted || event.stormId !== dataRef.current.stormId) return;
+
+    // Send only stations that changed
+    const markersGeoJSON = toMarkersGeoJSON(pointsEvent);
+    markersSync.current?.update(markersGeoJSON);
+    pointsSync.current?.update(markersGeoJSON);
+  };
 
-  // Spring animation for marker pop-in when zooming
+  // Pop newly visible markers in: snap them small, then let one paint
+  // transition grow them back on the GPU instead of restyling every frame
   const triggerMarkerPopInAnimation = () => {
-    if (!map.current || isAnimatingRef.current) return;
+    if (!map.current?.getLayer('unclustered-point') || isAnimatingRef.current) return;
 
     isAnimatingRef.current = true;
-    const startTime = performance.now();
-    const duration = 200; // 200ms as per design spec
-
-    // Ease-out-back function for spring/bouncy effect
-    const easeOutBack = (t: number): number => {
-      const c1 = 1.70158;
-      const c3 = c1 + 1;
-      return 1 + c3 * Math.pow(t - 1, 3) + c1 * Math.pow(t - 1, 2);
-    };
+    map.current.setPaintProperty('unclustered-point', 'circle-radius-transition', { duration: 0, delay: 0 });
+    map.current.setPaintProperty('unclustered-point', 'circle-radius', markerRadius(MARKER_POP_IN_SCALE));
 
-    const animate = (currentTime: number) => {
-      if (!map.current) {
-        isAnimatingRef.current = false;
-        return;
-      }
+    requestAnimationFrame(() => {
+      isAnimatingRef.current = false;
+      if (!map.current?.getLayer('unclustered-point')) return;
+
+      map.current.setPaintProperty('unclustered-point', 'circle-radius-transition', {
+        duration: MARKER_POP_IN_MS,
+        delay: 0
+      });
+      map.current.setPaintProperty('unclustered-point', 'circle-radius', markerRadius(1));
+    });
+  };
 
-      const elapsed = currentTime - startTime;
-      const progress = Math.min(elapsed / duration, 1);
-      const scale = easeOutBack(progress);
+  // Apply the latest storm to the map. Calls made before the sources exist
+  // collapse into a single idle retry, which picks up whichever storm is current
+  const applyStormData = () => {
+    if (!map.current) return;
 
-      // Apply spring scale to marker radius
-      try {
-        map.current.setPaintProperty('unclustered-point', 'circle-radius', [
-          'interpolate',
-          ['linear'],
-          ['zoom'],
-          0, 22 * scale,
-          10, 22 * scale,
-          15, 16 * scale
-        ]);
-      } catch (e) {
-        // Layer might not exist yet, ignore
-      }
+    const event = dataRef.current;
+    if (appliedStormId.current === event.stormId) return;
 
-      if (progress < 1) {
-        requestAnimationFrame(animate);
-      } else {
-        // Animation complete - reset to normal size
-        isAnimatingRef.current = false;
-        if (map.current) {
-          try {
-            map.current.setPaintProperty('unclustered-point', 'circle-radius', [
-              'interpolate',
-              ['linear'],
-              ['zoom'],
-              0, 22,
-              10, 22,
-              15, 16
-            ]);
-          } catch (e) {
-            // Layer might not exist, ignore
-          }
-        }
+    // Check if sources exist
+    const surfaceSource = map.current.getSource(USE_TILED_SURFACE ? 'snowfall-raster' : 'snowfall-regions');
+    const markersSource = map.current.getSource('markers');
+
+    if (!surfaceSource || !markersSource) {
+      // Sources not ready yet, wait for map to be idle
+      if (!idleUpdateQueued.current) {
+        idleUpdateQueued.current = true;
+        map.current.once('idle', () => {
+          idleUpdateQueued.current = false;
+          applyStormData();
+        });
       }
-    };
+      return;
+    }
+
+    appliedStormId.current = event.stormId;
+
+    if (USE_TILED_SURFACE) {
+      // Point the raster source at the new storm's tiles
+      (surfaceSource as mapboxgl.RasterTileSource).setTiles([snowTileUrl(event.stormId)]);
+    } else {
+      // Update choropleth data (precomputed on the server)
+      updateRegions(event);
+
+      // Detail tiles belong to the previous storm; show the coarse surface until they're rebuilt
+      detailSurface.current?.reset();
+      setDetailActive(false);
+      refreshDetail();
+    }
 
-    requestAnimationFrame(animate);
+    // Show the new storm's markers right away from the cached storm, then narrow
+    // them to the current viewport once that request returns
+    const markersGeoJSON = toMarkersGeoJSON(event);
+    markersSync.current?.update(markersGeoJSON);
+    pointsSync.current?.update(markersGeoJSON);
+    refreshViewportPoints();
   };
 
   // Reset map to Chicago default view
@@ -194,27 +362,27 @@ export default function SnowfallMap() {
 
   // Update layer visibility based on visualization mode
   useEffect(() => {
+    const wasGpu = vizModeRef.current === 'gpu';
+    vizModeRef.current = vizMode;
     if (!map.current) return;
 
-    const showHeatmap = vizMode === 'heatmap' || vizMode === 'both';
     const showMarkers = vizMode === 'markers' || vizMode === 'both';
 
-    // Update heatmap layers visibility with fade transition
-    if (map.current.getLayer('snowfall-fill')) {
-      map.current.setPaintProperty(
-        'snowfall-fill',
-        'fill-opacity',
-        showHeatmap ? 0.6 : 0
-      );
+    if (vizMode === 'gpu') {
+      // Stop any CPU surface work; the heatmap layer needs none
+      regionsRequestId.current++;
+      choroplethClient.current?.cancel();
+      detailSurface.current?.cancel();
+    } else if (wasGpu && !USE_TILED_SURFACE) {
+      // Catch the CPU surface up with any storm selected while in GPU mode
+      if (regionsStormId.current !== dataRef.current.stormId) {
+        updateRegions(dataRef.current);
+      }
+      refreshDetail();
     }
 
-    if (map.current.getLayer('snowfall-borders')) {
-      map.current.setPaintProperty(
-        'snowfall-borders',
-        'line-opacity',
-        showHeatmap ? 0.3 : 0
-      );
-    }
+    // Update heatmap layers visibility with fade transition
+    applyRegionOpacity();
 
     // Update marker layers visibility (clusters and unclustered points)
     const markerOpacity = showMarkers ? 1 : 0;
@@ -238,58 +406,8 @@ export default function SnowfallMap() {
 
   // Update map data when storm changes
   useEffect(() => {
-    if (!map.current) return;
-
-    const updateMapData = () => {
-      if (!map.current) return;
-
-      // Check if sources exist
-      const snowfallSource = map.current.getSource('snowfall-regions') as mapboxgl.GeoJSONSource;
-      const markersSource = map.current.getSource('markers') as mapboxgl.GeoJSONSource;
-
-      if (!snowfallSource || !markersSource) {
-        // Sources not ready yet, wait for map to be idle
-        if (map.current) {
-          map.current.once('idle', updateMapData);
-        }
-        return;
-      }
-
-      // Update choropleth data
-      const bounds: [[number, number], [number, number]] = [
-        [-95, 38], // Southwest corner (expanded for Illinois region)
-        [-82, 45]  // Northeast corner
-      ];
-      const voronoiFeatures = createVoronoiPolygons(data.measurements, bounds);
-
-      snowfallSource.setData({
-        type: 'FeatureCollection',
-        features: voronoiFeatures
-      });
-
-      // Update marker data
-      const markersGeoJSON = {
-        type: 'FeatureCollection' as const,
-        features: data.measurements.map(m => ({
-          type: 'Feature' as const,
-          geometry: {
-            type: 'Point' as const,
-            coordinates: [m.lon, m.lat]
-          },
-          properties: {
-            amount: Math.round(m.amount * 10) / 10, // Round to 1 decimal place
-            station: m.station,
-            source: m.source,
-            timestamp: m.timestamp,
-            color: getSnowfallColor(m.amount)
-          }
-        }))
-      };
-
-      markersSource.setData(markersGeoJSON);
-    };
-
-    updateMapData();
+    dataRef.current = data;
+    applyStormData();
   }, [data.stormId]);
 
   useEffect(() => {
@@ -315,72 +433,139 @@ export default function SnowfallMap() {
     map.current.on('load', () => {
       if (!map.current) return;
 
-      // Create Voronoi polygons for choropleth visualization
-      const bounds: [[number, number], [number, number]] = [
-        [-95, 38], // Southwest corner (expanded for Illinois region)
-        [-82, 45]  // Northeast corner
-      ];
-      const voronoiFeatures = createVoronoiPolygons(data.measurements, bounds);
+      // Build the sources from the latest storm, which may have changed while the style loaded
+      const initialData = dataRef.current;
+      appliedStormId.current = initialData.stormId;
+
+      if (USE_TILED_SURFACE) {
+        // Server-rendered raster tiles of the snow surface
+        const [[west, south], [east, north]] = CHOROPLETH_BOUNDS;
+        map.current!.addSource('snowfall-raster', {
+          type: 'raster',
+          tiles: [snowTileUrl(initialData.stormId)],
+          tileSize: 256,
+          bounds: [west, south, east, north],
+          maxzoom: 12
+        });
 
-      // Add filled regions (choropleth style)
-      map.current!.addSource('snowfall-regions', {
-        type: 'geojson',
-        data: {
-          type: 'FeatureCollection',
-          features: voronoiFeatures
-        }
-      } as mapboxgl.GeoJSONSourceSpecification);
+        map.current!.addLayer({
+          id: 'snowfall-raster',
+          type: 'raster',
+          source: 'snowfall-raster',
+          paint: {
+            'raster-opacity': 0.6,
+            'raster-opacity-transition': { duration: 300 }
+          }
+        });
+      } else {
+        // Add filled regions (choropleth style), filled in once the regions have loaded.
+        // Dynamic so bands that changed between storms can be updated on their own
+        map.current!.addSource('snowfall-regions', {
+          type: 'geojson',
+          data: {
+            type: 'FeatureCollection',
+            features: []
+          },
+          dynamic: true,
+          promoteId: FEATURE_ID_PROPERTY
+        } as mapboxgl.GeoJSONSourceSpecification);
+        regionsSync.current = new GeoJSONSourceSync(map.current!, 'snowfall-regions', true);
+        updateRegions(initialData);
+
+        map.current!.addLayer({
+          id: 'snowfall-fill',
+          type: 'fill',
+          source: 'snowfall-regions',
+          paint: {
+            'fill-color': ['get', 'color'],
+            'fill-opacity': 0.6,
+            'fill-opacity-transition': { duration: 300 }
+          }
+        });
 
-      map.current!.addLayer({
-        id: 'snowfall-fill',
-        type: 'fill',
-        source: 'snowfall-regions',
-        paint: {
-          'fill-color': ['get', 'color'],
-          'fill-opacity': 0.6,
-          'fill-opacity-transition': { duration: 300 }
-        }
+        // Add borders between regions for clarity
+        map.current!.addLayer({
+          id: 'snowfall-borders',
+          type: 'line',
+          source: 'snowfall-regions',
+          paint: {
+            'line-color': '#ffffff',
+            'line-width': 1,
+            'line-opacity': 0.3,
+            'line-opacity-transition': { duration: 300 }
+          }
+        });
+
+        // Fine tiles for the current viewport, faded in over the coarse surface once built
+        map.current!.addSource('snowfall-detail', {
+          type: 'geojson',
+          data: {
+            type: 'FeatureCollection',
+            features: []
+          }
+        } as mapboxgl.GeoJSONSourceSpecification);
+
+        map.current!.addLayer({
+          id: 'snowfall-detail-fill',
+          type: 'fill',
+          source: 'snowfall-detail',
+          paint: {
+            'fill-color': ['get', 'color'],
+            'fill-opacity': 0,
+            'fill-opacity-transition': { duration: 300 }
+          }
+        });
+      }
+
+      // Create GeoJSON source for markers with clustering
+      const markersGeoJSON = toMarkersGeoJSON(initialData);
+
+      // Unclustered points for the GPU heatmap, which blends them per frame on the GPU
+      map.current!.addSource('measurement-points', {
+        type: 'geojson',
+        data: markersGeoJSON,
+        dynamic: true,
+        promoteId: FEATURE_ID_PROPERTY
       });
+      pointsSync.current = new GeoJSONSourceSync(map.current!, 'measurement-points', true);
+      pointsSync.current.prime(markersGeoJSON);
 
-      // Add borders between regions for clarity
       map.current!.addLayer({
-        id: 'snowfall-borders',
-        type: 'line',
-        source: 'snowfall-regions',
+        id: 'snowfall-heat',
+        type: 'heatmap',
+        source: 'measurement-points',
         paint: {
-          'line-color': '#ffffff',
-          'line-width': 1,
-          'line-opacity': 0.3,
-          'line-opacity-transition': { duration: 300 }
+          // Deeper snow contributes more to the surface
+          'heatmap-weight': ['interpolate', ['linear'], ['get', 'amount'], 0, 0, 12, 1],
+          'heatmap-intensity': ['interpolate', ['linear'], ['zoom'], 5, 1, 12, 3],
+          // Stations are sparse, so spread each one wide enough to meet its neighbours
+          'heatmap-radius': ['interpolate', ['exponential', 2], ['zoom'], 5, 20, 9, 60, 12, 160],
+          'heatmap-color': [
+            'interpolate',
+            ['linear'],
+            ['heatmap-density'],
+            0, 'rgba(219, 234, 254, 0)',
+            0.1, SNOWFALL_BANDS[0].color,
+            0.3, SNOWFALL_BANDS[1].color,
+            0.5, SNOWFALL_BANDS[2].color,
+            0.75, SNOWFALL_BANDS[3].color,
+            1, SNOWFALL_BANDS[4].color
+          ],
+          'heatmap-opacity': vizModeRef.current === 'gpu' ? 0.7 : 0,
+          'heatmap-opacity-transition': { duration: 300 }
         }
       });
 
-      // Create GeoJSON source for markers with clustering
-      const markersGeoJSON = {
-        type: 'FeatureCollection' as const,
-        features: data.measurements.map(m => ({
-          type: 'Feature' as const,
-          geometry: {
-            type: 'Point' as const,
-            coordinates: [m.lon, m.lat]
-          },
-          properties: {
-            amount: Math.round(m.amount * 10) / 10, // Round to 1 decimal place
-            station: m.station,
-            source: m.source,
-            timestamp: m.timestamp,
-            color: getSnowfallColor(m.amount)
-          }
-        }))
-      };
-
       map.current!.addSource('markers', {
         type: 'geojson',
         data: markersGeoJSON,
         cluster: true,
-        clusterMaxZoom: 12, // Max zoom to cluster points
+        clusterMaxZoom: CLUSTER_MAX_ZOOM, // Max zoom to cluster points
         clusterRadius: 50   // Radius of each cluster when clustering points
       });
+      // Supercluster re-indexes every point on any change, so this source is only ever replaced
+      markersSync.current = new GeoJSONSourceSync(map.current!, 'markers', false);
+      markersSync.current.prime(markersGeoJSON);
 
       // Layer for clustered points
       map.current!.addLayer({
@@ -430,15 +615,8 @@ export default function SnowfallMap() {
         filter: ['!', ['has', 'point_count']],
         paint: {
           'circle-color': ['get', 'color'],
-          'circle-radius': [
-            'interpolate',
-            ['linear'],
-            ['zoom'],
-            0, 22,   // 44px diameter at low zoom (mobile-optimized)
-            10, 22,  // 44px diameter at medium zoom
-            15, 16   // 32px diameter at high zoom (desktop when zoomed in)
-          ],
-          'circle-radius-transition': { duration: 200, delay: 0 }, // 200ms spring-like animation
+          'circle-radius': markerRadius(1),
+          'circle-radius-transition': { duration: MARKER_POP_IN_MS, delay: 0 },
           'circle-stroke-width': 2,
           'circle-stroke-color': '#ffffff',
           'circle-opacity': 1,
@@ -538,16 +716,32 @@ export default function SnowfallMap() {
         if (map.current) map.current.getCanvas().style.cursor = '';
       });
 
-      // Trigger spring animation when zoom ends (new markers may appear)
+      // Pop markers in when a zoom changes the clustering level (new markers may appear)
+      let zoomStart = map.current!.getZoom();
+      map.current!.on('zoomstart', () => {
+        if (map.current) zoomStart = map.current.getZoom();
+      });
       map.current!.on('zoomend', () => {
-        triggerMarkerPopInAnimation();
+        if (map.current && crossesClusterLevel(zoomStart, map.current.getZoom())) {
+          triggerMarkerPopInAnimation();
+        }
       });
 
-      // Trigger initial spring animation when markers first load
+      // Refine the surface and points for whatever the user is now looking at
+      map.current!.on('moveend', () => {
+        refreshDetail();
+        refreshViewportPoints();
+      });
+
+      // Trigger initial pop-in animation when markers first load
       triggerMarkerPopInAnimation();
+      refreshDetail();
     });
 
     return () => {
+      viewportRequest.current?.abort();
+      choroplethClient.current?.dispose();
+      detailSurface.current?.dispose();
       map.current?.remove();
     };
   }, []); // Only run once on mount - data updates handled by separate useEffect
@@ -584,7 +778,7 @@ export default function SnowfallMap() {
         </button>
         <button
           onClick={() => setVizMode('both')}
-          className={`px-4 py-3 md:py-2 text-sm font-semibold transition-colors duration-200 rounded-r-lg ${
+          className={`px-4 py-3 md:py-2 text-sm font-semibold transition-colors duration-200 border-r border-gray-300 ${
             vizMode === 'both'
               ? 'bg-blue-600 text-white'
               : 'bg-white text-gray-800 hover:bg-gray-50'
@@ -594,6 +788,19 @@ export default function SnowfallMap() {
         >
           Both
         </button>
+        <button
+          onClick={() => setVizMode('gpu')}
+          className={`px-4 py-3 md:py-2 text-sm font-semibold transition-colors duration-200 rounded-r-lg ${
+            vizMode === 'gpu'
+              ? 'bg-blue-600 text-white'
+              : 'bg-white text-gray-800 hover:bg-gray-50'
+          }`}
+          data-testid="toggle-gpu"
+          aria-label="Show GPU heatmap only"
+          title="Heatmap drawn on the GPU, for slower devices"
+        >
+          GPU
+        </button>
       </div>
 
       {/* Reset to Chicago button */}
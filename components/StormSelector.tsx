@@ -15,9 +15,16 @@ function formatDate(dateString: string): string {
 }
 
 export default function StormSelector() {
-  const { storms, selectedStormId, handleStormChange } = useSnowfall();
+  const { storms, selectedStormId, handleStormChange, prefetchStorm } = useSnowfall();
   const selectedStorm = storms.find(storm => storm.id === selectedStormId);
 
+  // Fetch the other storms ahead of a likely switch
+  const prefetchStorms = () => {
+    storms.forEach(storm => {
+      if (storm.id !== selectedStormId) prefetchStorm(storm.id);
+    });
+  };
+
   if (!selectedStorm) {
     return null;
   }
@@ -39,6 +46,8 @@ export default function StormSelector() {
           <select
             value={selectedStormId}
             onChange={(e) => handleStormChange(e.target.value)}
+            onMouseEnter={prefetchStorms}
+            onFocus={prefetchStorms}
             className="px-3 py-3 md:py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
           >
             {storms.map((storm) => (
@@ -0,0 +1,64 @@
+// ABOUTME: Tests for the binary snowfall wire format
+// ABOUTME: Verifies round trips, zero-copy column views and rejection of foreign payloads
+
+import { describe, it, expect } from 'vitest';
+import { decodeBinary, toBinary, wantsBinary } from './binary-snowfall';
+import { createGridSpec, gridToMeasurements, interpolateGrid, toSampleColumns } from './idw-grid';
+import type { SnowfallEvent } from '@/types';
+
+const timestamp = '2025-12-04T12:00:00.000Z';
+
+const event: SnowfallEvent = {
+  stormId: 'storm-2025-12-04',
+  date: timestamp,
+  measurements: [
+    { lat: 41.8781, lon: -87.6298, amount: 3.25, source: 'NOAA_NWS', station: 'KORD', timestamp },
+    { lat: 41.5, lon: -88, amount: 1.5, source: 'NOAA_GRIDDED', station: 'INTERPOLATED_41.50_-88.00', timestamp },
+    { lat: 42.1, lon: -87.7, amount: 6, source: 'NOAA_NWS', station: 'KPWK', timestamp: '2025-12-04T13:00:00.000Z' },
+  ],
+};
+
+describe('binary format', () => {
+  it('round-trips an event to Float32 precision', () => {
+    const bytes = toBinary(event);
+    const { event: decoded, columns } = decodeBinary(bytes.buffer);
+
+    expect(decoded.stormId).toBe(event.stormId);
+    expect(decoded.measurements.map((m) => [m.station, m.source, m.timestamp])).toEqual(
+      event.measurements.map((m) => [m.station, m.source, m.timestamp])
+    );
+    decoded.measurements.forEach((m, i) => {
+      expect(m.lat).toBeCloseTo(event.measurements[i].lat, 4);
+      expect(m.lon).toBeCloseTo(event.measurements[i].lon, 4);
+      expect(m.amount).toBeCloseTo(event.measurements[i].amount, 2);
+    });
+
+    // Columns view the payload buffer rather than copying it
+    expect(columns.lats.buffer).toBe(bytes.buffer);
+    expect(Array.from(columns.sourceIndexes)).toEqual([0, 1, 0]);
+  });
+
+  it('rebuilds synthesized station names for an interpolated grid', () => {
+    const grid = interpolateGrid(
+      toSampleColumns(event.measurements),
+      createGridSpec({ minLon: -89, minLat: 41, maxLon: -87, maxLat: 43 }, 0.05)
+    );
+    const gridEvent: SnowfallEvent = { ...event, measurements: gridToMeasurements(grid, timestamp) };
+    const bytes = toBinary(gridEvent);
+
+    expect(decodeBinary(bytes.buffer).event.measurements.map((m) => m.station)).toEqual(
+      gridEvent.measurements.map((m) => m.station)
+    );
+    expect(bytes.byteLength).toBeLessThan(JSON.stringify(gridEvent).length / 5);
+  });
+
+  it('rejects payloads in another format', () => {
+    expect(() => decodeBinary(new TextEncoder().encode('{"stormId":"x"}').buffer)).toThrow();
+  });
+
+  it('is selected by query string or Accept header', () => {
+    expect(wantsBinary(new URLSearchParams('format=binary'), null)).toBe(true);
+    expect(wantsBinary(new URLSearchParams(), 'application/octet-stream')).toBe(true);
+    expect(wantsBinary(new URLSearchParams(), 'application/json')).toBe(false);
+  });
+});
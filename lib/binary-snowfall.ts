@@ -0,0 +1,182 @@
+// ABOUTME: Binary wire format for snowfall events: a fixed header, Float32/Uint8 columns and a JSON tail
+// ABOUTME: Browsers view the columns in place with typed arrays instead of parsing JSON
+
+import type { Measurement, SnowfallEvent } from '@/types';
+import { interpolatedStationName, toColumnar, type ColumnarSnowfallEvent } from './columnar';
+import type { SampleColumns } from './idw-grid';
+
+/**
+ * Media type of the binary format
+ */
+export const BINARY_MEDIA_TYPE = 'application/octet-stream';
+
+/**
+ * Layout, all little-endian:
+ *
+ *   0   magic "CSNW"
+ *   4   u8 version, 3 bytes reserved
+ *   8   u32 measurement count (n)
+ *   12  u32 metadata length in bytes
+ *   16  f32[n] longitudes, f32[n] latitudes, f32[n] amounts (inches)
+ *       u8[n] source indexes, zero padding to a multiple of 4
+ *       UTF-8 JSON metadata (BinaryMetadata)
+ */
+const MAGIC = 'CSNW';
+export const BINARY_FORMAT_VERSION = 1;
+const HEADER_BYTES = 16;
+
+/**
+ * Non-numeric fields, carried as JSON after the columns
+ */
+interface BinaryMetadata {
+  stormId: string;
+  date: string;
+  timestamp: string;
+  timestampOverrides?: Record<number, string>;
+  sources: ColumnarSnowfallEvent['sources'];
+  stations: Record<number, string>; // Only names that aren't synthesized from the coordinates
+}
+
+/**
+ * A decoded binary event: columns viewing the response buffer plus the equivalent measurements
+ */
+export interface DecodedBinarySnowfallEvent {
+  event: SnowfallEvent;
+  columns: SampleColumns & { sourceIndexes: Uint8Array };
+}
+
+// Keyed by the cached event, so each refresh is encoded once
+const encodedEvents = new WeakMap<SnowfallEvent, Uint8Array<ArrayBuffer>>();
+
+/**
+ * Checks whether a request asked for the binary format by query string or Accept header
+ */
+export function wantsBinary(searchParams: URLSearchParams, accept: string | null): boolean {
+  return searchParams.get('format') === 'binary' || (accept ?? '').includes(BINARY_MEDIA_TYPE);
+}
+
+/**
+ * Encodes an event in the binary format
+ */
+export function toBinary(event: SnowfallEvent): Uint8Array<ArrayBuffer> {
+  const cached = encodedEvents.get(event);
+  if (cached) return cached;
+
+  const columnar = toColumnar(event);
+  const count = columnar.lats.length;
+
+  const columnsEnd = HEADER_BYTES + count * 13;
+  const metadataStart = Math.ceil(columnsEnd / 4) * 4;
+
+  const lons = new Float32Array(count);
+  const lats = new Float32Array(count);
+  const amounts = new Float32Array(count);
+  const stations: Record<number, string> = {};
+
+  for (let i = 0; i < count; i++) {
+    lons[i] = columnar.lons[i] / columnar.coordinateScale;
+    lats[i] = columnar.lats[i] / columnar.coordinateScale;
+    amounts[i] = columnar.amounts[i] / columnar.amountScale;
+
+    // Float32 rounding can move a synthesized name; keep any the decoder wouldn't rebuild exactly
+    const station = columnar.stations[i] ?? event.measurements[i].station;
+    if (station !== interpolatedStationName(lats[i], lons[i])) {
+      stations[i] = station;
+    }
+  }
+
+  const metadata: BinaryMetadata = {
+    stormId: columnar.stormId,
+    date: columnar.date,
+    timestamp: columnar.timestamp,
+    ...(columnar.timestampOverrides ? { timestampOverrides: columnar.timestampOverrides } : {}),
+    sources: columnar.sources,
+    stations,
+  };
+  const metadataBytes = new TextEncoder().encode(JSON.stringify(metadata));
+
+  const bytes = new Uint8Array(metadataStart + metadataBytes.byteLength);
+  const view = new DataView(bytes.buffer);
+
+  for (let i = 0; i < MAGIC.length; i++) {
+    bytes[i] = MAGIC.charCodeAt(i);
+  }
+  view.setUint8(4, BINARY_FORMAT_VERSION);
+  view.setUint32(8, count, true);
+  view.setUint32(12, metadataBytes.byteLength, true);
+
+  // Typed arrays use the platform's byte order, so columns are written value by value
+  for (let i = 0; i < count; i++) {
+    view.setFloat32(HEADER_BYTES + i * 4, lons[i], true);
+    view.setFloat32(HEADER_BYTES + (count + i) * 4, lats[i], true);
+    view.setFloat32(HEADER_BYTES + (2 * count + i) * 4, amounts[i], true);
+  }
+  bytes.set(columnar.sourceIndexes, HEADER_BYTES + count * 12);
+  bytes.set(metadataBytes, metadataStart);
+
+  encodedEvents.set(event, bytes);
+  return bytes;
+}
+
+/**
+ * Decodes a binary event; the columns are views into the buffer, not copies
+ *
+ * @throws Error if the buffer isn't in this format
+ */
+export function decodeBinary(buffer: ArrayBuffer): DecodedBinarySnowfallEvent {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, Math.min(MAGIC.length, buffer.byteLength)));
+
+  if (buffer.byteLength < HEADER_BYTES || magic !== MAGIC) {
+    throw new Error('Not a binary snowfall payload');
+  }
+
+  const version = view.getUint8(4);
+  if (version !== BINARY_FORMAT_VERSION) {
+    throw new Error(`Unsupported binary snowfall version ${version}`);
+  }
+
+  const count = view.getUint32(8, true);
+  const metadataLength = view.getUint32(12, true);
+  const metadataStart = Math.ceil((HEADER_BYTES + count * 13) / 4) * 4;
+
+  if (metadataStart + metadataLength > buffer.byteLength) {
+    throw new Error('Truncated binary snowfall payload');
+  }
+
+  if (!isLittleEndian()) {
+    throw new Error('Binary snowfall payloads require a little-endian platform');
+  }
+
+  const lons = new Float32Array(buffer, HEADER_BYTES, count);
+  const lats = new Float32Array(buffer, HEADER_BYTES + count * 4, count);
+  const amounts = new Float32Array(buffer, HEADER_BYTES + count * 8, count);
+  const sourceIndexes = new Uint8Array(buffer, HEADER_BYTES + count * 12, count);
+  const metadata: BinaryMetadata = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, metadataStart, metadataLength))
+  );
+
+  const measurements: Measurement[] = new Array(count);
+  for (let i = 0; i < count; i++) {
+    measurements[i] = {
+      lat: lats[i],
+      lon: lons[i],
+      amount: amounts[i],
+      source: metadata.sources[sourceIndexes[i]],
+      station: metadata.stations[i] ?? interpolatedStationName(lats[i], lons[i]),
+      timestamp: metadata.timestampOverrides?.[i] ?? metadata.timestamp,
+    };
+  }
+
+  return {
+    event: { stormId: metadata.stormId, date: metadata.date, measurements },
+    columns: { lons, lats, amounts, sourceIndexes },
+  };
+}
+
+/**
+ * Whether typed arrays on this platform read little-endian data as written
+ */
+function isLittleEndian(): boolean {
+  return new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+}
@@ -0,0 +1,182 @@
+// ABOUTME: Unit tests for the in-memory cache
+// ABOUTME: Tests TTL expiry, stale-while-revalidate, LRU eviction and request coalescing
+
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { MemoryCache } from './cache';
+
+describe('MemoryCache', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+    vi.restoreAllMocks();
+  });
+
+  it('returns null for expired entries', () => {
+    vi.useFakeTimers();
+    const cache = new MemoryCache();
+
+    cache.set('key', 'value', 1000, 0);
+    expect(cache.get('key')).toBe('value');
+
+    vi.advanceTimersByTime(1001);
+    expect(cache.get('key')).toBeNull();
+  });
+
+  it('reports stale entries between the soft and hard TTL', () => {
+    vi.useFakeTimers();
+    const cache = new MemoryCache();
+
+    cache.set('key', 'value', 1000, 1000);
+    expect(cache.getStatus('key')).toBe('hit');
+
+    vi.advanceTimersByTime(1500);
+    expect(cache.getStatus('key')).toBe('stale');
+    expect(cache.get('key')).toBe('value');
+
+    vi.advanceTimersByTime(1000);
+    expect(cache.getStatus('key')).toBe('miss');
+  });
+
+  it('evicts the least recently used entry past maxEntries', () => {
+    const cache = new MemoryCache({ maxEntries: 2 });
+
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a'); // 'b' is now least recently used
+    cache.set('c', 3);
+
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('b')).toBeNull();
+    expect(cache.get('c')).toBe(3);
+    expect(cache.size()).toBe(2);
+    expect(cache.stats().evictions).toBe(1);
+  });
+
+  it('evicts entries to stay within maxBytes', () => {
+    const cache = new MemoryCache({ maxBytes: 100 });
+
+    cache.set('a', 'x'.repeat(20)); // 40 bytes
+    cache.set('b', 'y'.repeat(20));
+    cache.set('c', 'z'.repeat(20));
+
+    expect(cache.get('a')).toBeNull();
+    expect(cache.stats().bytes).toBeLessThanOrEqual(100);
+  });
+
+  it('sizes binary values by their byte length', () => {
+    const cache = new MemoryCache();
+
+    cache.set('tile', new Uint8Array(1000));
+
+    expect(cache.stats().bytes).toBe(1000);
+  });
+
+  it('counts an array shared between entries once', () => {
+    const cache = new MemoryCache();
+    const measurements = Array.from({ length: 1000 }, (_, i) => ({ lat: 41.8, lon: -87.6, amount: i }));
+
+    cache.set('measurements', measurements);
+    const alone = cache.stats().bytes;
+    cache.set('storm', { stormId: 'storm-2025-12-04', measurements });
+    const shared = cache.stats().bytes;
+
+    expect(shared - alone).toBeLessThan(100);
+    cache.delete('measurements');
+    expect(cache.stats().bytes).toBe(shared);
+    cache.delete('storm');
+    expect(cache.stats().bytes).toBe(0);
+  });
+
+  it('sweeps expired entries that are never read again', () => {
+    vi.useFakeTimers();
+    const cache = new MemoryCache({ sweepIntervalMs: 1000 });
+
+    cache.set('key', 'value', 500, 0);
+    vi.advanceTimersByTime(1000);
+
+    expect(cache.size()).toBe(0);
+    expect(cache.stats().expirations).toBe(1);
+  });
+
+  it('tracks hits and misses', () => {
+    const cache = new MemoryCache();
+
+    cache.set('key', 'value');
+    cache.get('key');
+    cache.get('missing');
+
+    expect(cache.stats()).toEqual(expect.objectContaining({ hits: 1, misses: 1 }));
+  });
+
+  describe('getOrLoad', () => {
+    it('runs a single loader for concurrent misses', async () => {
+      const cache = new MemoryCache();
+      let resolveLoad: (value: string) => void = () => {};
+      const loader = vi.fn(
+        () => new Promise<string>((resolve) => { resolveLoad = resolve; })
+      );
+
+      const results = Promise.all([
+        cache.getOrLoad('key', loader),
+        cache.getOrLoad('key', loader),
+        cache.getOrLoad('key', loader),
+      ]);
+      resolveLoad('value');
+
+      expect(await results).toEqual(['value', 'value', 'value']);
+      expect(loader).toHaveBeenCalledTimes(1);
+      expect(cache.stats()).toEqual(
+        expect.objectContaining({ loads: 1, coalesced: 2, inFlight: 0 })
+      );
+    });
+
+    it('serves later calls from the cache', async () => {
+      const cache = new MemoryCache();
+      const loader = vi.fn().mockResolvedValue('value');
+
+      await cache.getOrLoad('key', loader);
+      await cache.getOrLoad('key', loader);
+
+      expect(loader).toHaveBeenCalledTimes(1);
+    });
+
+    it('does not cache failed loads', async () => {
+      const cache = new MemoryCache();
+      const loader = vi.fn()
+        .mockRejectedValueOnce(new Error('Network error'))
+        .mockResolvedValueOnce('value');
+
+      await expect(cache.getOrLoad('key', loader)).rejects.toThrow('Network error');
+      expect(await cache.getOrLoad('key', loader)).toBe('value');
+      expect(loader).toHaveBeenCalledTimes(2);
+    });
+
+    it('serves stale data immediately and refreshes in the background', async () => {
+      vi.useFakeTimers();
+      const cache = new MemoryCache();
+      cache.set('key', 'old', 1000, 60000);
+      vi.advanceTimersByTime(1001);
+
+      const loader = vi.fn().mockResolvedValue('new');
+
+      expect(await cache.getOrLoad('key', loader, 1000, 60000)).toBe('old');
+      expect(loader).toHaveBeenCalledTimes(1);
+
+      await vi.waitFor(() => expect(cache.getStatus('key')).toBe('hit'));
+      expect(cache.get('key')).toBe('new');
+    });
+
+    it('keeps stale data when the background refresh fails', async () => {
+      vi.useFakeTimers();
+      const cache = new MemoryCache();
+      cache.set('key', 'old', 1000, 60000);
+      vi.advanceTimersByTime(1001);
+      vi.spyOn(console, 'error').mockImplementation(() => {});
+
+      const loader = vi.fn().mockRejectedValue(new Error('Network error'));
+
+      expect(await cache.getOrLoad('key', loader)).toBe('old');
+      await vi.waitFor(() => expect(cache.stats().inFlight).toBe(0));
+      expect(cache.get('key')).toBe('old');
+    });
+  });
+});
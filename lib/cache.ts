@@ -1,65 +1,509 @@
-// ABOUTME: In-memory cache implementation with TTL support
-// ABOUTME: Used to reduce external API calls with 2-hour default TTL
+// ABOUTME: In-memory LRU cache with soft/hard TTL (stale-while-revalidate) and size budgets
+// ABOUTME: Used to reduce external API calls with 2-hour default TTL, optionally backed by a disk tier
+
+import { DiskCacheStore } from './disk-cache';
 
 interface CacheEntry<T> {
   data: T;
+  storedAt: number; // When the data was loaded (its Last-Modified time)
+  staleAt: number; // Soft TTL: served but refreshed in the background after this
+  expiresAt: number; // Hard TTL: evicted after this
+  size: number; // Approximate size in bytes, excluding its top-level arrays
+  arrays: unknown[][]; // Top-level arrays, sized once however many entries share them
+}
+
+interface SharedArray {
+  size: number;
+  refs: number; // Entries holding the array
+}
+
+/**
+ * Entry shape stored by a persistent tier
+ */
+export interface PersistedEntry<T> {
+  data: T;
+  storedAt?: number; // Missing from entries written before it was tracked
+  staleAt: number;
   expiresAt: number;
 }
 
-class MemoryCache {
+/**
+ * Optional second cache tier that survives process restarts
+ */
+export interface PersistentStore {
+  accepts(key: string): boolean;
+  read<T>(key: string): PersistedEntry<T> | null;
+  write<T>(key: string, entry: PersistedEntry<T>): Promise<void>;
+  delete(key: string): void;
+  clear(): void;
+}
+
+/**
+ * Freshness of a cache key: fresh hit, stale (served while revalidating) or miss
+ */
+export type CacheStatus = 'hit' | 'stale' | 'miss';
+
+/**
+ * Budgets and housekeeping settings for a MemoryCache instance
+ */
+export interface MemoryCacheOptions {
+  maxEntries?: number; // Least recently used entries are evicted past this count
+  maxBytes?: number; // Least recently used entries are evicted past this approximate size
+  sweepIntervalMs?: number; // How often expired entries are swept (0 disables)
+  persistentStore?: PersistentStore; // Second tier read on memory misses and written through on set
+}
+
+/**
+ * Cache counters for monitoring hit rate, evictions and request coalescing
+ */
+export interface CacheStats {
+  entries: number;
+  bytes: number; // Approximate size of all entries, counting shared arrays once
+  maxEntries: number;
+  maxBytes: number;
+  hits: number; // Lookups served fresh
+  staleHits: number; // Lookups served stale while revalidating
+  misses: number;
+  persistentHits: number; // Memory misses served from the persistent tier
+  evictions: number; // Entries dropped to stay within budget
+  expirations: number; // Entries dropped after their hard TTL
+  loads: number; // Loader invocations that actually ran
+  coalesced: number; // Callers that awaited an already in-flight loader
+  inFlight: number; // Loaders currently running
+}
+
+/**
+ * Default TTL for cached entries (2 hours)
+ */
+export const DEFAULT_TTL_MS = 2 * 60 * 60 * 1000;
+
+/**
+ * Default window past the soft TTL during which stale entries are still served (1 hour)
+ */
+export const DEFAULT_STALE_TTL_MS = 60 * 60 * 1000;
+
+const DEFAULT_MAX_ENTRIES = 500;
+const DEFAULT_MAX_BYTES = 50 * 1024 * 1024; // 50 MB
+const DEFAULT_SWEEP_INTERVAL_MS = 10 * 60 * 1000; // 10 minutes
+
+// Rough in-memory cost of a number or boolean, and of an object or array header
+const PRIMITIVE_BYTES = 8;
+const OBJECT_OVERHEAD_BYTES = 16;
+
+/**
+ * Approximates the in-memory size of a cached value from its structure, without
+ * serializing it: strings cost 2 bytes per character (UTF-16), binary values
+ * their byte length, and arrays their length times the size of their first
+ * element, so sizing a storm costs the same however many measurements it has
+ */
+function estimateSize(data: unknown): number {
+  if (data === null || data === undefined) {
+    return 0;
+  }
+
+  if (typeof data === 'string') {
+    return data.length * 2;
+  }
+
+  if (typeof data !== 'object') {
+    return PRIMITIVE_BYTES;
+  }
+
+  if (ArrayBuffer.isView(data)) {
+    return data.byteLength;
+  }
+
+  if (Array.isArray(data)) {
+    return OBJECT_OVERHEAD_BYTES + (data.length === 0 ? 0 : data.length * estimateSize(data[0]));
+  }
+
+  let size = OBJECT_OVERHEAD_BYTES;
+  for (const [key, value] of Object.entries(data)) {
+    size += key.length * 2 + estimateSize(value);
+  }
+  return size;
+}
+
+/**
+ * Gets the arrays a value is, or holds directly, such as an event's measurements
+ * These are what cache entries share (e.g. a storm and its hourly measurements)
+ */
+function topLevelArrays(data: unknown): unknown[][] {
+  if (Array.isArray(data)) {
+    return [data];
+  }
+
+  if (data === null || typeof data !== 'object' || ArrayBuffer.isView(data)) {
+    return [];
+  }
+
+  return Object.values(data).filter((value): value is unknown[] => Array.isArray(value));
+}
+
+export class MemoryCache {
+  // Map iteration order doubles as recency order: oldest entries come first
   private cache: Map<string, CacheEntry<unknown>> = new Map();
+  private inFlight: Map<string, Promise<unknown>> = new Map();
+  private sharedArrays: Map<unknown[], SharedArray> = new Map();
+  private readonly maxEntries: number;
+  private readonly maxBytes: number;
+  private readonly persistentStore?: PersistentStore;
+  private bytes = 0;
+  private hits = 0;
+  private staleHits = 0;
+  private misses = 0;
+  private persistentHits = 0;
+  private evictions = 0;
+  private expirations = 0;
+  private loads = 0;
+  private coalesced = 0;
+
+  constructor(options: MemoryCacheOptions = {}) {
+    this.maxEntries = options.maxEntries ?? DEFAULT_MAX_ENTRIES;
+    this.maxBytes = options.maxBytes ?? DEFAULT_MAX_BYTES;
+    this.persistentStore = options.persistentStore;
+
+    const sweepIntervalMs = options.sweepIntervalMs ?? DEFAULT_SWEEP_INTERVAL_MS;
+    if (sweepIntervalMs > 0) {
+      const timer = setInterval(() => this.sweep(), sweepIntervalMs);
+      // Don't keep the Node.js process alive just for housekeeping
+      if (typeof timer === 'object' && 'unref' in timer) {
+        timer.unref();
+      }
+    }
+  }
 
   /**
-   * Gets a value from the cache if it exists and hasn't expired
+   * Gets a value from the cache if it exists and hasn't hit its hard TTL
+   * Stale entries (past the soft TTL) are still returned
    */
   get<T>(key: string): T | null {
+    const entry = this.getEntry<T>(key);
+    this.recordLookup(entry);
+    return entry ? entry.data : null;
+  }
+
+  /**
+   * Gets the freshness of a key without triggering a load
+   */
+  getStatus(key: string): CacheStatus {
+    const entry = this.getEntry(key);
+
+    if (!entry) {
+      return 'miss';
+    }
+
+    return Date.now() > entry.staleAt ? 'stale' : 'hit';
+  }
+
+  /**
+   * Gets when a key's current value was loaded, without touching its recency
+   */
+  getStoredAt(key: string): Date | null {
+    const entry = this.cache.get(key);
+    return entry ? new Date(entry.storedAt) : null;
+  }
+
+  /**
+   * Sets a value in the cache with a soft TTL and a stale window (in milliseconds)
+   * Default TTL is 2 hours, followed by a 1-hour stale window
+   * Persisted keys are also written through to the persistent tier
+   */
+  set<T>(
+    key: string,
+    data: T,
+    ttlMs: number = DEFAULT_TTL_MS,
+    staleTtlMs: number = DEFAULT_STALE_TTL_MS
+  ): void {
+    const storedAt = Date.now();
+    const staleAt = storedAt + ttlMs;
+    const entry: PersistedEntry<T> = { data, storedAt, staleAt, expiresAt: staleAt + staleTtlMs };
+
+    this.store(key, entry);
+
+    if (this.persistentStore?.accepts(key)) {
+      this.persistentStore.write(key, entry).catch((error) => {
+        console.warn(`[Cache] Failed to persist ${key}:`, error);
+      });
+    }
+  }
+
+  /**
+   * Stores an entry in memory and evicts to stay within budget
+   */
+  private store<T>(key: string, entry: PersistedEntry<T>): void {
+    const size = estimateSize(entry.data);
+    const arrays = topLevelArrays(entry.data);
+    this.remove(key);
+
+    if (size > this.maxBytes) {
+      console.warn(`[Cache] Skipping ${key}: ${size} bytes exceeds the ${this.maxBytes} byte budget`);
+      return;
+    }
+
+    let ownSize = size;
+    for (const array of arrays) {
+      const arraySize = estimateSize(array);
+      ownSize -= arraySize;
+      this.retainArray(array, arraySize);
+    }
+
+    this.cache.set(key, { ...entry, storedAt: entry.storedAt ?? Date.now(), size: ownSize, arrays });
+    this.bytes += ownSize;
+
+    this.evictToBudget();
+  }
+
+  /**
+   * Counts an array against the budget when the first entry holding it is stored
+   */
+  private retainArray(array: unknown[], size: number): void {
+    const shared = this.sharedArrays.get(array);
+    if (shared) {
+      shared.refs++;
+      return;
+    }
+
+    this.sharedArrays.set(array, { size, refs: 1 });
+    this.bytes += size;
+  }
+
+  /**
+   * Releases an array from the budget when the last entry holding it is removed
+   */
+  private releaseArray(array: unknown[]): void {
+    const shared = this.sharedArrays.get(array);
+    if (!shared || --shared.refs > 0) return;
+
+    this.sharedArrays.delete(array);
+    this.bytes -= shared.size;
+  }
+
+  /**
+   * Gets a value from the cache, or runs the loader to fill it on a miss
+   *
+   * Concurrent misses for the same key share a single in-flight loader,
+   * so only one upstream fetch runs while the other callers await its result.
+   * Stale entries are returned immediately while the loader refreshes them
+   * in the background. Failed loads are not cached and the next caller retries.
+   */
+  async getOrLoad<T>(
+    key: string,
+    loader: () => Promise<T>,
+    ttlMs: number = DEFAULT_TTL_MS,
+    staleTtlMs: number = DEFAULT_STALE_TTL_MS
+  ): Promise<T> {
+    const entry = this.getEntry<T>(key);
+    this.recordLookup(entry);
+
+    if (entry) {
+      if (Date.now() > entry.staleAt && !this.inFlight.has(key)) {
+        this.load(key, loader, ttlMs, staleTtlMs).catch((error) => {
+          console.error(`[Cache] Background refresh failed for ${key}:`, error);
+        });
+      }
+      return entry.data;
+    }
+
+    if (this.inFlight.has(key)) {
+      this.coalesced++;
+    }
+
+    return this.load(key, loader, ttlMs, staleTtlMs);
+  }
+
+  /**
+   * Runs the loader for a key unless one is already in flight, then stores the result
+   */
+  private load<T>(
+    key: string,
+    loader: () => Promise<T>,
+    ttlMs: number,
+    staleTtlMs: number
+  ): Promise<T> {
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      return pending as Promise<T>;
+    }
+
+    this.loads++;
+    const load = loader()
+      .then((data) => {
+        this.set(key, data, ttlMs, staleTtlMs);
+        return data;
+      })
+      .finally(() => {
+        this.inFlight.delete(key);
+      });
+
+    this.inFlight.set(key, load);
+    return load;
+  }
+
+  /**
+   * Gets the entry for a key and marks it most recently used,
+   * deleting it once its hard TTL has passed
+   * Memory misses fall back to the persistent tier
+   */
+  private getEntry<T>(key: string): CacheEntry<T> | null {
     const entry = this.cache.get(key);
 
     if (!entry) {
-      return null;
+      return this.getPersistedEntry<T>(key);
     }
 
     // Check if expired
     if (Date.now() > entry.expiresAt) {
-      this.cache.delete(key);
+      this.discard(key);
+      this.expirations++;
+      return null;
+    }
+
+    // Re-insert to move the key to the most recently used position
+    this.cache.delete(key);
+    this.cache.set(key, entry);
+
+    return entry as CacheEntry<T>;
+  }
+
+  /**
+   * Loads an entry from the persistent tier into memory
+   */
+  private getPersistedEntry<T>(key: string): CacheEntry<T> | null {
+    if (!this.persistentStore?.accepts(key)) {
       return null;
     }
 
-    return entry.data as T;
+    const persisted = this.persistentStore.read<T>(key);
+    if (!persisted) {
+      return null;
+    }
+
+    this.persistentHits++;
+    this.store(key, persisted);
+    return (this.cache.get(key) as CacheEntry<T> | undefined) ?? null;
+  }
+
+  /**
+   * Updates hit/miss counters for a lookup
+   */
+  private recordLookup(entry: CacheEntry<unknown> | null): void {
+    if (!entry) {
+      this.misses++;
+    } else if (Date.now() > entry.staleAt) {
+      this.staleHits++;
+    } else {
+      this.hits++;
+    }
   }
 
   /**
-   * Sets a value in the cache with a TTL (in milliseconds)
-   * Default TTL is 2 hours
+   * Evicts least recently used entries until the cache is within its budgets
    */
-  set<T>(key: string, data: T, ttlMs: number = 2 * 60 * 60 * 1000): void {
-    this.cache.set(key, {
-      data,
-      expiresAt: Date.now() + ttlMs,
-    });
+  private evictToBudget(): void {
+    for (const key of this.cache.keys()) {
+      if (this.cache.size <= this.maxEntries && this.bytes <= this.maxBytes) {
+        break;
+      }
+
+      this.discard(key);
+      this.evictions++;
+    }
+  }
+
+  /**
+   * Removes all entries past their hard TTL
+   * Runs periodically so keys that are never read again don't linger
+   *
+   * @returns Number of entries removed
+   */
+  sweep(): number {
+    const now = Date.now();
+    let removed = 0;
+
+    for (const [key, entry] of this.cache) {
+      if (now > entry.expiresAt) {
+        this.discard(key);
+        removed++;
+      }
+    }
+
+    this.expirations += removed;
+    return removed;
   }
 
   /**
-   * Clears a specific key from the cache
+   * Clears a specific key from the cache (including the persistent tier)
    */
   delete(key: string): void {
-    this.cache.delete(key);
+    this.discard(key);
   }
 
   /**
-   * Clears all entries from the cache
+   * Clears all entries from the cache (including the persistent tier)
    */
   clear(): void {
     this.cache.clear();
+    this.sharedArrays.clear();
+    this.bytes = 0;
+    this.persistentStore?.clear();
+  }
+
+  /**
+   * Removes a key from memory and the persistent tier, so evicted and
+   * expired keys don't outlive the memory tier on disk
+   */
+  private discard(key: string): void {
+    this.remove(key);
+
+    if (this.persistentStore?.accepts(key)) {
+      this.persistentStore.delete(key);
+    }
+  }
+
+  /**
+   * Removes a key from memory only
+   */
+  private remove(key: string): void {
+    const entry = this.cache.get(key);
+    if (entry) {
+      this.bytes -= entry.size;
+      this.cache.delete(key);
+      entry.arrays.forEach((array) => this.releaseArray(array));
+    }
   }
 
   /**
-   * Gets the size of the cache
+   * Gets the number of entries in the cache
    */
   size(): number {
     return this.cache.size;
   }
+
+  /**
+   * Gets hit/miss, eviction and coalescing counters
+   */
+  stats(): CacheStats {
+    return {
+      entries: this.cache.size,
+      bytes: this.bytes,
+      maxEntries: this.maxEntries,
+      maxBytes: this.maxBytes,
+      hits: this.hits,
+      staleHits: this.staleHits,
+      misses: this.misses,
+      persistentHits: this.persistentHits,
+      evictions: this.evictions,
+      expirations: this.expirations,
+      loads: this.loads,
+      coalesced: this.coalesced,
+      inFlight: this.inFlight.size,
+    };
+  }
 }
 
 // Export a singleton instance
-export const cache = new MemoryCache();
+// Setting CACHE_DIR enables the on-disk tier so restarts start warm
+export const cache = new MemoryCache({
+  persistentStore: process.env.CACHE_DIR ? new DiskCacheStore(process.env.CACHE_DIR) : undefined,
+});
@@ -0,0 +1,139 @@
+// ABOUTME: Main-thread client for the choropleth Web Worker with latest-request-wins cancellation
+// ABOUTME: Falls back to building features on the main thread where Worker is unavailable (SSR, tests)
+
+import type { Measurement } from '@/types';
+import {
+  buildChoroplethFeatures,
+  CHOROPLETH_BOUNDS,
+  CHOROPLETH_RESOLUTION,
+  type ChoroplethBounds,
+  type ChoroplethFeatureCollection,
+} from './choropleth';
+import { toSampleColumns, type SampleColumn, type SampleColumns } from './idw-grid';
+
+/**
+ * Message posted to the choropleth worker
+ */
+export interface ChoroplethRequest {
+  id: number;
+  lons: SampleColumn;
+  lats: SampleColumn;
+  amounts: SampleColumn;
+  bounds: ChoroplethBounds;
+  resolution: number;
+}
+
+/**
+ * Message posted back by the choropleth worker
+ */
+export interface ChoroplethResponse {
+  id: number;
+  features?: ChoroplethFeatureCollection;
+  error?: string;
+}
+
+interface PendingBuild {
+  id: number;
+  resolve: (features: ChoroplethFeatureCollection | null) => void;
+  reject: (error: Error) => void;
+}
+
+/**
+ * Builds choropleth features in a dedicated worker
+ *
+ * Only the latest build is kept: starting a new one terminates the worker if
+ * it is still busy with the previous build (a synchronous computation can't
+ * observe a cancel message) and resolves the superseded promise with null.
+ */
+export class ChoroplethWorkerClient {
+  private worker: Worker | null = null;
+  private pending: PendingBuild | null = null;
+  private nextId = 0;
+
+  /**
+   * Builds region features for measurements (or their columns) over bounds at a grid resolution
+   *
+   * @returns The features, or null if a newer build or cancel() superseded this one
+   */
+  build(
+    samples: Measurement[] | SampleColumns,
+    bounds: ChoroplethBounds = CHOROPLETH_BOUNDS,
+    resolution: number = CHOROPLETH_RESOLUTION
+  ): Promise<ChoroplethFeatureCollection | null> {
+    this.cancel();
+    // Columns are copied because the worker takes ownership of the buffers it is sent
+    const { lons, lats, amounts } = Array.isArray(samples)
+      ? toSampleColumns(samples)
+      : { lons: samples.lons.slice(), lats: samples.lats.slice(), amounts: samples.amounts.slice() };
+
+    if (typeof Worker === 'undefined') {
+      return Promise.resolve(buildChoroplethFeatures({ lons, lats, amounts }, bounds, resolution));
+    }
+
+    const worker = this.getWorker();
+    const id = ++this.nextId;
+
+    return new Promise((resolve, reject) => {
+      this.pending = { id, resolve, reject };
+
+      const request: ChoroplethRequest = { id, lons, lats, amounts, bounds, resolution };
+      // Hand the column buffers to the worker without copying
+      worker.postMessage(request, [lons.buffer, lats.buffer, amounts.buffer]);
+    });
+  }
+
+  /**
+   * Abandons the in-flight build, if any
+   */
+  cancel(): void {
+    if (!this.pending) return;
+
+    this.pending.resolve(null);
+    this.pending = null;
+
+    // The worker is still computing the abandoned build
+    this.worker?.terminate();
+    this.worker = null;
+  }
+
+  /**
+   * Cancels any in-flight build and shuts the worker down
+   */
+  dispose(): void {
+    this.cancel();
+    this.worker?.terminate();
+    this.worker = null;
+  }
+
+  /**
+   * Gets the worker, starting one if needed
+   */
+  private getWorker(): Worker {
+    if (this.worker) return this.worker;
+
+    const worker = new Worker(new URL('./workers/choropleth.worker.ts', import.meta.url));
+
+    worker.addEventListener('message', (event: MessageEvent<ChoroplethResponse>) => {
+      const pending = this.pending;
+      if (!pending || pending.id !== event.data.id) return;
+
+      this.pending = null;
+      if (event.data.features) {
+        pending.resolve(event.data.features);
+      } else {
+        pending.reject(new Error(event.data.error ?? 'Choropleth worker failed'));
+      }
+    });
+
+    worker.addEventListener('error', (event) => {
+      const pending = this.pending;
+      this.pending = null;
+      this.worker = null;
+      worker.terminate();
+      pending?.reject(new Error(event.message || 'Choropleth worker crashed'));
+    });
+
+    this.worker = worker;
+    return worker;
+  }
+}
@@ -0,0 +1,66 @@
+// ABOUTME: Unit tests for level-of-detail snow surface tiles
+// ABOUTME: Covers tile zoom selection, tile reuse across loads and superseded loads
+
+import { describe, it, expect, vi } from 'vitest';
+import { DetailSurface, detailTileZoom } from './choropleth-detail';
+import { tilesCovering } from './tile-math';
+import type { ChoroplethWorkerClient } from './choropleth-client';
+import { Measurement } from '@/types';
+
+const measurements: Measurement[] = [
+  { lat: 41.9, lon: -87.6, amount: 8.0, source: 'NOAA_GRIDDED', station: 'A', timestamp: '2025-01-01' },
+];
+const chicago: [[number, number], [number, number]] = [[-87.9, 41.7], [-87.5, 42.0]];
+
+function fakeClient() {
+  const client = {
+    build: vi.fn().mockResolvedValue({ type: 'FeatureCollection', features: [] }),
+    cancel: vi.fn(),
+    dispose: vi.fn(),
+  };
+  return client;
+}
+
+describe('detailTileZoom', () => {
+  it('clamps tile zoom to the detail range', () => {
+    expect(detailTileZoom(6.5)).toBe(8);
+    expect(detailTileZoom(9.7)).toBe(9);
+    expect(detailTileZoom(16)).toBe(12);
+  });
+});
+
+describe('DetailSurface', () => {
+  it('reuses cached tiles on later loads', async () => {
+    const client = fakeClient();
+    const surface = new DetailSurface(64, client as unknown as ChoroplethWorkerClient);
+
+    await surface.load(measurements, chicago, 10);
+    const builds = client.build.mock.calls.length;
+    await surface.load(measurements, chicago, 10);
+
+    expect(builds).toBe(tilesCovering(chicago, 10).length);
+    expect(client.build.mock.calls.length).toBe(builds);
+  });
+
+  it('rebuilds tiles after a reset', async () => {
+    const client = fakeClient();
+    const surface = new DetailSurface(64, client as unknown as ChoroplethWorkerClient);
+
+    await surface.load(measurements, chicago, 10);
+    surface.reset();
+    await surface.load(measurements, chicago, 10);
+
+    expect(client.build.mock.calls.length).toBe(2 * tilesCovering(chicago, 10).length);
+  });
+
+  it('returns null for a load superseded by a newer one', async () => {
+    const client = fakeClient();
+    const surface = new DetailSurface(64, client as unknown as ChoroplethWorkerClient);
+
+    const first = surface.load(measurements, chicago, 10);
+    const second = surface.load(measurements, chicago, 10);
+
+    await expect(first).resolves.toBeNull();
+    await expect(second).resolves.not.toBeNull();
+  });
+});
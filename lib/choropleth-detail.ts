@@ -0,0 +1,110 @@
+// ABOUTME: Level-of-detail tiles for the snow surface: fine choropleth tiles for the current viewport
+// ABOUTME: Tiles are built in the choropleth worker and kept in an LRU keyed by z/x/y
+
+import type { Measurement } from '@/types';
+import type { ChoroplethBounds, ChoroplethFeatureCollection } from './choropleth';
+import { ChoroplethWorkerClient } from './choropleth-client';
+import type { SampleColumns } from './idw-grid';
+import { LruMap } from './lru-map';
+import { tileBounds, tilesCovering } from './tile-math';
+
+/**
+ * Map zoom at which detail tiles replace the coarse regional surface
+ */
+export const DETAIL_MIN_ZOOM = 8;
+
+/**
+ * Finest tile zoom built; deeper map zooms reuse these tiles
+ */
+export const DETAIL_MAX_TILE_ZOOM = 12;
+
+/**
+ * Grid cells along each side of a detail tile
+ */
+export const DETAIL_TILE_CELLS = 32;
+
+const DEFAULT_MAX_TILES = 256;
+
+/**
+ * Tile zoom used for a map zoom level
+ */
+export function detailTileZoom(zoom: number): number {
+  return Math.min(Math.max(Math.floor(zoom), DETAIL_MIN_ZOOM), DETAIL_MAX_TILE_ZOOM);
+}
+
+/**
+ * Builds and caches detail tiles for the current storm
+ *
+ * Only the latest load is kept: a newer load (or reset) makes earlier ones
+ * resolve with null instead of finishing tiles for a stale viewport or storm.
+ */
+export class DetailSurface {
+  private readonly client: ChoroplethWorkerClient;
+  private readonly tiles: LruMap<string, ChoroplethFeatureCollection['features']>;
+  private generation = 0;
+
+  constructor(maxTiles: number = DEFAULT_MAX_TILES, client: ChoroplethWorkerClient = new ChoroplethWorkerClient()) {
+    this.tiles = new LruMap(maxTiles);
+    this.client = client;
+  }
+
+  /**
+   * Gets detail regions covering a viewport, building any tiles not already cached
+   *
+   * @returns The merged tile features, or null if a newer load superseded this one
+   */
+  async load(
+    samples: Measurement[] | SampleColumns,
+    viewport: ChoroplethBounds,
+    zoom: number
+  ): Promise<ChoroplethFeatureCollection | null> {
+    const generation = ++this.generation;
+    this.client.cancel();
+
+    const features: ChoroplethFeatureCollection['features'] = [];
+
+    for (const tile of tilesCovering(viewport, detailTileZoom(zoom))) {
+      const key = `${tile.z}/${tile.x}/${tile.y}`;
+      let tileFeatures = this.tiles.get(key);
+
+      if (!tileFeatures) {
+        const bounds = tileBounds(tile);
+        const resolution = (bounds[1][0] - bounds[0][0]) / DETAIL_TILE_CELLS;
+        const collection = await this.client.build(samples, bounds, resolution);
+
+        if (!collection || generation !== this.generation) return null;
+
+        tileFeatures = collection.features;
+        this.tiles.set(key, tileFeatures);
+      }
+
+      features.push(...tileFeatures);
+    }
+
+    return generation === this.generation ? { type: 'FeatureCollection', features } : null;
+  }
+
+  /**
+   * Abandons any in-flight load
+   */
+  cancel(): void {
+    this.generation++;
+    this.client.cancel();
+  }
+
+  /**
+   * Drops all cached tiles, e.g. when the storm changes
+   */
+  reset(): void {
+    this.cancel();
+    this.tiles.clear();
+  }
+
+  /**
+   * Cancels any in-flight load and shuts the worker down
+   */
+  dispose(): void {
+    this.cancel();
+    this.client.dispose();
+  }
+}
@@ -0,0 +1,133 @@
+// ABOUTME: Unit tests for choropleth region building and the worker client
+// ABOUTME: Covers color bands, band dissolving and latest-request-wins cancellation
+
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { buildChoroplethFeatures, getSnowfallColor } from './choropleth';
+import { ChoroplethWorkerClient, type ChoroplethRequest } from './choropleth-client';
+import { toSampleColumns } from './idw-grid';
+import { Measurement } from '@/types';
+
+const measurements: Measurement[] = [
+  { lat: 41.9, lon: -87.6, amount: 8.0, source: 'NOAA_GRIDDED', station: 'A', timestamp: '2025-01-01' },
+  { lat: 40.1, lon: -88.2, amount: 1.0, source: 'NOAA_GRIDDED', station: 'B', timestamp: '2025-01-01' },
+];
+const bounds: [[number, number], [number, number]] = [[-89, 40], [-87, 42]];
+
+describe('getSnowfallColor', () => {
+  it('maps amounts to color bands', () => {
+    expect(getSnowfallColor(0.5)).toBe('#DBEAFE');
+    expect(getSnowfallColor(2)).toBe('#60A5FA');
+    expect(getSnowfallColor(4)).toBe('#2563EB');
+    expect(getSnowfallColor(6)).toBe('#1E40AF');
+    expect(getSnowfallColor(12)).toBe('#7C3AED');
+  });
+});
+
+describe('buildChoroplethFeatures', () => {
+  it('returns one MultiPolygon per color band present', () => {
+    const collection = buildChoroplethFeatures(toSampleColumns(measurements), bounds, 0.5);
+    const colors = collection.features.map((feature) => feature.properties.color);
+
+    expect(new Set(colors).size).toBe(colors.length);
+    for (const feature of collection.features) {
+      expect(feature.geometry.type).toBe('MultiPolygon');
+      expect(feature.properties.color).toBe(getSnowfallColor(feature.properties.amount));
+    }
+  });
+
+  it('merges touching same-band cells and cuts holes for other bands', () => {
+    // 3x3 grid of 5" cells around a snow-free center cell
+    const lons: number[] = [];
+    const lats: number[] = [];
+    const amounts: number[] = [];
+    for (let row = 0; row < 3; row++) {
+      for (let col = 0; col < 3; col++) {
+        lons.push(col);
+        lats.push(row);
+        amounts.push(row === 1 && col === 1 ? 0 : 5);
+      }
+    }
+
+    const collection = buildChoroplethFeatures(
+      { lons: new Float64Array(lons), lats: new Float64Array(lats), amounts: new Float64Array(amounts) },
+      [[0, 0], [2, 2]],
+      1
+    );
+    const ring = collection.features.find((feature) => feature.properties.amount === 4);
+
+    expect(ring?.geometry.coordinates).toEqual([
+      [
+        [[2, 0], [2, 2], [0, 2], [0, 0], [2, 0]], // Counter-clockwise outer ring
+        [[0.5, 0.5], [0.5, 1.5], [1.5, 1.5], [1.5, 0.5], [0.5, 0.5]], // Clockwise hole
+      ],
+    ]);
+  });
+
+  it('keeps cells that only touch at a corner as separate polygons', () => {
+    const collection = buildChoroplethFeatures(
+      {
+        lons: new Float64Array([0, 1, 0, 1]),
+        lats: new Float64Array([0, 0, 1, 1]),
+        amounts: new Float64Array([12, 0, 0, 12]),
+      },
+      [[0, 0], [1, 1]],
+      1
+    );
+    const heavy = collection.features.find((feature) => feature.properties.amount === 10);
+
+    expect(heavy?.geometry.coordinates).toHaveLength(2);
+  });
+
+  it('returns no features without measurements', () => {
+    expect(buildChoroplethFeatures(toSampleColumns([]), bounds).features).toEqual([]);
+  });
+});
+
+describe('ChoroplethWorkerClient', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('builds on the main thread when Worker is unavailable', async () => {
+    vi.stubGlobal('Worker', undefined);
+    const client = new ChoroplethWorkerClient();
+
+    const collection = await client.build(measurements, bounds);
+    expect(collection?.features.length).toBeGreaterThan(0);
+  });
+
+  it('drops superseded builds and only resolves the latest', async () => {
+    const workers: FakeWorker[] = [];
+    class FakeWorker {
+      listeners: Record<string, (event: { data: unknown }) => void> = {};
+      requests: ChoroplethRequest[] = [];
+      terminated = false;
+      constructor() {
+        workers.push(this);
+      }
+      addEventListener(type: string, listener: (event: { data: unknown }) => void) {
+        this.listeners[type] = listener;
+      }
+      postMessage(request: ChoroplethRequest) {
+        this.requests.push(request);
+      }
+      terminate() {
+        this.terminated = true;
+      }
+    }
+    vi.stubGlobal('Worker', FakeWorker);
+
+    const client = new ChoroplethWorkerClient();
+    const first = client.build(measurements, bounds);
+    const second = client.build(measurements, bounds);
+
+    // The busy worker is replaced rather than left computing a stale storm
+    expect(workers).toHaveLength(2);
+    expect(workers[0].terminated).toBe(true);
+    await expect(first).resolves.toBeNull();
+
+    const features = { type: 'FeatureCollection', features: [] };
+    workers[1].listeners.message({ data: { id: workers[1].requests[0].id, features } });
+    await expect(second).resolves.toEqual(features);
+  });
+});
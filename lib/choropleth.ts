@@ -0,0 +1,267 @@
+// ABOUTME: Builds the snowfall choropleth: IDW over a regular grid, dissolved into one shape per color band
+// ABOUTME: Pure functions shared by the server regions route, the choropleth Web Worker and its fallback
+
+import { createGridSpec, interpolateGrid, type IdwGrid, type SampleColumns } from './idw-grid';
+
+/**
+ * Region covered by the choropleth as [[west, south], [east, north]]
+ */
+export type ChoroplethBounds = [[number, number], [number, number]];
+
+/**
+ * Properties carried by each choropleth band feature
+ */
+export interface ChoroplethProperties {
+  amount: number; // Lower bound of the band (inches)
+  color: string;
+}
+
+export type ChoroplethFeatureCollection = GeoJSON.FeatureCollection<GeoJSON.MultiPolygon, ChoroplethProperties>;
+
+/**
+ * Default choropleth region (expanded around Illinois)
+ */
+export const CHOROPLETH_BOUNDS: ChoroplethBounds = [
+  [-95, 38], // Southwest corner
+  [-82, 45], // Northeast corner
+];
+
+/**
+ * Grid spacing in degrees (~17 miles)
+ */
+export const CHOROPLETH_RESOLUTION = 0.25;
+
+/**
+ * Snowfall color bands, lowest first; a band covers amounts from its min up to the next band's
+ */
+export const SNOWFALL_BANDS: ReadonlyArray<{ min: number; color: string }> = [
+  { min: 0, color: '#DBEAFE' },  // Light blue
+  { min: 2, color: '#60A5FA' },  // Medium blue
+  { min: 4, color: '#2563EB' },  // Deep blue
+  { min: 6, color: '#1E40AF' },  // Dark blue
+  { min: 10, color: '#7C3AED' }, // Purple
+];
+
+/**
+ * Index into SNOWFALL_BANDS for a snowfall amount
+ */
+export function getSnowfallBand(amount: number): number {
+  for (let band = SNOWFALL_BANDS.length - 1; band > 0; band--) {
+    if (amount >= SNOWFALL_BANDS[band].min) return band;
+  }
+  return 0;
+}
+
+/**
+ * Color mapping for snowfall amounts
+ */
+export function getSnowfallColor(amount: number): string {
+  return SNOWFALL_BANDS[getSnowfallBand(amount)].color;
+}
+
+/**
+ * Interpolates samples onto a dense grid and returns one MultiPolygon per color band
+ *
+ * Each grid point owns the square around it (its Voronoi cell on a regular
+ * grid, clipped to the bounds). Adjacent squares in the same band are merged
+ * so the map draws a handful of band shapes instead of one polygon per point.
+ */
+export function buildChoroplethFeatures(
+  samples: SampleColumns,
+  bounds: ChoroplethBounds = CHOROPLETH_BOUNDS,
+  resolution: number = CHOROPLETH_RESOLUTION
+): ChoroplethFeatureCollection {
+  const collection: ChoroplethFeatureCollection = { type: 'FeatureCollection', features: [] };
+  if (samples.amounts.length === 0) return collection;
+
+  const [[minX, minY], [maxX, maxY]] = bounds;
+  const grid = interpolateGrid(
+    samples,
+    createGridSpec({ minLon: minX, minLat: minY, maxLon: maxX, maxLat: maxY }, resolution)
+  );
+
+  const bands = new Uint8Array(grid.values.length);
+  for (let i = 0; i < grid.values.length; i++) {
+    bands[i] = getSnowfallBand(grid.values[i]);
+  }
+
+  // Cell edges sit halfway between grid points; the outer edges follow the bounds
+  const xs = cellEdges(grid.minLon, grid.resolution, grid.cols, maxX);
+  const ys = cellEdges(grid.minLat, grid.resolution, grid.rows, maxY);
+
+  for (let band = 0; band < SNOWFALL_BANDS.length; band++) {
+    const rings = traceBandRings(grid, bands, band);
+    if (rings.length === 0) continue;
+
+    collection.features.push({
+      type: 'Feature',
+      properties: { amount: SNOWFALL_BANDS[band].min, color: SNOWFALL_BANDS[band].color },
+      geometry: {
+        type: 'MultiPolygon',
+        coordinates: assemblePolygons(rings.map((ring) => ring.map(([i, j]) => [xs[i], ys[j]]))),
+      },
+    });
+  }
+
+  return collection;
+}
+
+/**
+ * Positions of the boundaries between grid cells along one axis
+ */
+function cellEdges(min: number, resolution: number, count: number, max: number): number[] {
+  const edges = [min];
+  for (let k = 1; k < count; k++) {
+    edges.push(min + (k - 0.5) * resolution);
+  }
+  edges.push(Math.max(max, min + (count - 1) * resolution));
+  return edges;
+}
+
+/**
+ * Traces the boundary of every region of same-band cells as closed lattice rings
+ *
+ * Boundary edges are directed with the band on their left, so outer rings come
+ * out counter-clockwise and holes clockwise (the GeoJSON winding order).
+ * Vertices are (column, row) indices into the cell edge positions.
+ */
+function traceBandRings(grid: IdwGrid, bands: Uint8Array, band: number): Array<Array<[number, number]>> {
+  const { cols, rows } = grid;
+  const stride = cols + 1; // Lattice vertex id = j * stride + i
+  const from: number[] = [];
+  const to: number[] = [];
+  const outgoing = new Map<number, number[]>();
+
+  const addEdge = (i0: number, j0: number, i1: number, j1: number) => {
+    const start = j0 * stride + i0;
+    const edge = from.length;
+    from.push(start);
+    to.push(j1 * stride + i1);
+
+    const edges = outgoing.get(start);
+    if (edges) {
+      edges.push(edge);
+    } else {
+      outgoing.set(start, [edge]);
+    }
+  };
+
+  const sameBand = (row: number, col: number) =>
+    row >= 0 && row < rows && col >= 0 && col < cols && bands[row * cols + col] === band;
+
+  for (let row = 0; row < rows; row++) {
+    for (let col = 0; col < cols; col++) {
+      if (bands[row * cols + col] !== band) continue;
+
+      // Walk each cell counter-clockwise, keeping edges not shared with a same-band neighbour
+      if (!sameBand(row - 1, col)) addEdge(col, row, col + 1, row);
+      if (!sameBand(row, col + 1)) addEdge(col + 1, row, col + 1, row + 1);
+      if (!sameBand(row + 1, col)) addEdge(col + 1, row + 1, col, row + 1);
+      if (!sameBand(row, col - 1)) addEdge(col, row + 1, col, row);
+    }
+  }
+
+  const direction = (edge: number): [number, number] => [
+    Math.sign((to[edge] % stride) - (from[edge] % stride)),
+    Math.sign(Math.floor(to[edge] / stride) - Math.floor(from[edge] / stride)),
+  ];
+
+  const visited = new Uint8Array(from.length);
+  const rings: Array<Array<[number, number]>> = [];
+
+  for (let start = 0; start < from.length; start++) {
+    if (visited[start]) continue;
+
+    const ring: Array<[number, number]> = [];
+    let edge = start;
+
+    for (;;) {
+      visited[edge] = 1;
+
+      const [dx, dy] = direction(edge);
+      const candidates = (outgoing.get(to[edge]) ?? []).filter((next) => next === start || !visited[next]);
+
+      // Where two regions touch at a corner, turn left so each region gets its own ring
+      const next =
+        candidates.find((candidate) => {
+          const [nx, ny] = direction(candidate);
+          return nx === -dy && ny === dx;
+        }) ?? candidates[0];
+
+      // Keep only corners; vertices along a straight run add nothing to the shape
+      const [nx, ny] = direction(next);
+      if (nx !== dx || ny !== dy) {
+        ring.push([to[edge] % stride, Math.floor(to[edge] / stride)]);
+      }
+
+      if (next === start) break;
+      edge = next;
+    }
+
+    rings.push(ring);
+  }
+
+  return rings;
+}
+
+/**
+ * Groups rings into polygons: each counter-clockwise ring starts a polygon and
+ * each clockwise ring becomes a hole of the smallest outer ring containing it
+ */
+function assemblePolygons(rings: number[][][]): number[][][][] {
+  const outers: Array<{ ring: number[][]; area: number; holes: number[][][] }> = [];
+  const holes: number[][][] = [];
+
+  for (const ring of rings) {
+    const area = signedArea(ring);
+    if (area > 0) {
+      outers.push({ ring, area, holes: [] });
+    } else {
+      holes.push(ring);
+    }
+  }
+
+  for (const hole of holes) {
+    // A point on the hole's first edge lies inside its outer ring, never on it
+    const x = (hole[0][0] + hole[1][0]) / 2;
+    const y = (hole[0][1] + hole[1][1]) / 2;
+
+    let owner: (typeof outers)[number] | null = null;
+    for (const outer of outers) {
+      if ((!owner || outer.area < owner.area) && containsPoint(outer.ring, x, y)) {
+        owner = outer;
+      }
+    }
+    owner?.holes.push(hole);
+  }
+
+  // GeoJSON rings repeat their first position at the end
+  const close = (ring: number[][]) => [...ring, ring[0]];
+  return outers.map((outer) => [close(outer.ring), ...outer.holes.map(close)]);
+}
+
+/**
+ * Shoelace area of an open ring; positive when counter-clockwise
+ */
+function signedArea(ring: number[][]): number {
+  let area = 0;
+  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+    area += (ring[j][0] - ring[i][0]) * (ring[j][1] + ring[i][1]);
+  }
+  return area / 2;
+}
+
+/**
+ * Even-odd ray casting test for a point against an open ring
+ */
+function containsPoint(ring: number[][], x: number, y: number): boolean {
+  let inside = false;
+  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+    const [xi, yi] = ring[i];
+    const [xj, yj] = ring[j];
+    if (yi > y !== yj > y && x < ((xj - xi) * (y - yi)) / (yj - yi) + xi) {
+      inside = !inside;
+    }
+  }
+  return inside;
+}
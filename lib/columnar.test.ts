@@ -0,0 +1,59 @@
+// ABOUTME: Tests for the columnar snowfall wire format
+// ABOUTME: Verifies round trips, dictionary and timestamp sharing, and dropped synthesized station names
+
+import { describe, it, expect } from 'vitest';
+import { decodeColumnar, isColumnar, toColumnar, wantsColumnar, COLUMNAR_MEDIA_TYPE } from './columnar';
+import { createGridSpec, gridToMeasurements, interpolateGrid, toSampleColumns } from './idw-grid';
+import type { SnowfallEvent } from '@/types';
+
+const timestamp = '2025-12-04T12:00:00.000Z';
+
+const event: SnowfallEvent = {
+  stormId: 'storm-2025-12-04',
+  date: timestamp,
+  measurements: [
+    { lat: 41.8781, lon: -87.6298, amount: 3.25, source: 'NOAA_NWS', station: 'KORD', timestamp },
+    { lat: 41.5, lon: -88, amount: 1.5, source: 'NOAA_GRIDDED', station: 'INTERPOLATED_41.50_-88.00', timestamp },
+    { lat: 42.1, lon: -87.7, amount: 6, source: 'NOAA_NWS', station: 'KPWK', timestamp: '2025-12-04T13:00:00.000Z' },
+  ],
+};
+
+describe('columnar format', () => {
+  it('round-trips an event', () => {
+    const decoded = decodeColumnar(toColumnar(event));
+    expect(decoded.event).toEqual(event);
+    expect(Array.from(decoded.columns.amounts)).toEqual([3.25, 1.5, 6]);
+  });
+
+  it('shares repeated values and drops synthesized station names', () => {
+    const encoded = toColumnar(event);
+
+    expect(encoded.sources).toEqual(['NOAA_NWS', 'NOAA_GRIDDED']);
+    expect(encoded.sourceIndexes).toEqual([0, 1, 0]);
+    expect(encoded.stations).toEqual(['KORD', null, 'KPWK']);
+    expect(encoded.timestamp).toBe(timestamp);
+    expect(encoded.timestampOverrides).toEqual({ 2: '2025-12-04T13:00:00.000Z' });
+    expect(toColumnar(event)).toBe(encoded);
+  });
+
+  it('is several times smaller than plain JSON for an interpolated grid', () => {
+    const grid = interpolateGrid(
+      toSampleColumns(event.measurements),
+      createGridSpec({ minLon: -89, minLat: 41, maxLon: -87, maxLat: 43 }, 0.05)
+    );
+    const gridEvent: SnowfallEvent = { ...event, measurements: gridToMeasurements(grid, timestamp) };
+    const encoded = toColumnar(gridEvent);
+
+    expect(JSON.stringify(gridEvent).length / JSON.stringify(encoded).length).toBeGreaterThan(3);
+    expect(decodeColumnar(encoded).event.measurements.map((m) => m.station)).toEqual(
+      gridEvent.measurements.map((m) => m.station)
+    );
+  });
+
+  it('is selected by query string or Accept header', () => {
+    expect(wantsColumnar(new URLSearchParams('format=columnar'), null)).toBe(true);
+    expect(wantsColumnar(new URLSearchParams(), `${COLUMNAR_MEDIA_TYPE}, application/json`)).toBe(true);
+    expect(wantsColumnar(new URLSearchParams(), 'application/json')).toBe(false);
+    expect(isColumnar(event)).toBe(false);
+  });
+});
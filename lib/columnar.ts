@@ -0,0 +1,180 @@
+// ABOUTME: Compact columnar wire format for snowfall events: parallel arrays of quantized values
+// ABOUTME: Encoded once per cached event on the server and decoded into typed arrays on the client
+
+import type { DataSource, Measurement, SnowfallEvent } from '@/types';
+import type { SampleColumns } from './idw-grid';
+
+/**
+ * Media type clients send in Accept to ask for the columnar format
+ */
+export const COLUMNAR_MEDIA_TYPE = 'application/vnd.chisnow.columnar+json';
+
+/**
+ * Coordinates travel as integer degrees × this (~11 m precision)
+ */
+export const COORDINATE_SCALE = 1e4;
+
+/**
+ * Amounts travel as integer inches × this
+ */
+export const AMOUNT_SCALE = 100;
+
+/**
+ * A snowfall event as parallel arrays, one entry per measurement
+ */
+export interface ColumnarSnowfallEvent {
+  format: 'columnar';
+  stormId: string;
+  date: string;
+  timestamp: string; // Shared by every measurement without an override
+  timestampOverrides?: Record<number, string>;
+  coordinateScale: number;
+  amountScale: number;
+  lats: number[];
+  lons: number[];
+  amounts: number[];
+  sources: DataSource[]; // Dictionary of source values
+  sourceIndexes: number[];
+  stations: Array<string | null>; // Null where the name is the synthesized interpolated-point name
+}
+
+/**
+ * A decoded event: typed-array columns for the map plus the equivalent measurements
+ */
+export interface DecodedSnowfallEvent {
+  event: SnowfallEvent;
+  columns: SampleColumns;
+}
+
+/**
+ * Station name prefix marking synthetic interpolated grid points
+ */
+export const INTERPOLATED_STATION_PREFIX = 'INTERPOLATED_';
+
+/**
+ * Name given to interpolated grid points (see gridToMeasurements)
+ */
+export function interpolatedStationName(lat: number, lon: number): string {
+  return `${INTERPOLATED_STATION_PREFIX}${lat.toFixed(2)}_${lon.toFixed(2)}`;
+}
+
+// Keyed by the cached event, so each refresh is encoded once
+const encodedEvents = new WeakMap<SnowfallEvent, ColumnarSnowfallEvent>();
+
+/**
+ * Checks whether a request asked for the columnar format by query string or Accept header
+ */
+export function wantsColumnar(searchParams: URLSearchParams, accept: string | null): boolean {
+  return searchParams.get('format') === 'columnar' || (accept ?? '').includes(COLUMNAR_MEDIA_TYPE);
+}
+
+/**
+ * Encodes an event in the columnar format
+ */
+export function toColumnar(event: SnowfallEvent): ColumnarSnowfallEvent {
+  const cached = encodedEvents.get(event);
+  if (cached) return cached;
+
+  const { measurements } = event;
+  const count = measurements.length;
+  const lats = new Array<number>(count);
+  const lons = new Array<number>(count);
+  const amounts = new Array<number>(count);
+  const sourceIndexes = new Array<number>(count);
+  const stations = new Array<string | null>(count);
+  const sources: DataSource[] = [];
+  const timestampCounts = new Map<string, number>();
+
+  for (let i = 0; i < count; i++) {
+    const m = measurements[i];
+    lats[i] = Math.round(m.lat * COORDINATE_SCALE);
+    lons[i] = Math.round(m.lon * COORDINATE_SCALE);
+    amounts[i] = Math.round(m.amount * AMOUNT_SCALE);
+
+    let sourceIndex = sources.indexOf(m.source);
+    if (sourceIndex === -1) sourceIndex = sources.push(m.source) - 1;
+    sourceIndexes[i] = sourceIndex;
+
+    // Only drop names the decoder will rebuild exactly from the quantized coordinates
+    const synthesized = interpolatedStationName(lats[i] / COORDINATE_SCALE, lons[i] / COORDINATE_SCALE);
+    stations[i] = m.station === synthesized ? null : m.station;
+
+    timestampCounts.set(m.timestamp, (timestampCounts.get(m.timestamp) ?? 0) + 1);
+  }
+
+  // The most common timestamp is shared; the rest are sent per measurement
+  let timestamp = event.date;
+  let best = 0;
+  for (const [value, uses] of timestampCounts) {
+    if (uses > best) {
+      timestamp = value;
+      best = uses;
+    }
+  }
+
+  const timestampOverrides: Record<number, string> = {};
+  let overrides = 0;
+  for (let i = 0; i < count; i++) {
+    if (measurements[i].timestamp !== timestamp) {
+      timestampOverrides[i] = measurements[i].timestamp;
+      overrides++;
+    }
+  }
+
+  const encoded: ColumnarSnowfallEvent = {
+    format: 'columnar',
+    stormId: event.stormId,
+    date: event.date,
+    timestamp,
+    ...(overrides > 0 ? { timestampOverrides } : {}),
+    coordinateScale: COORDINATE_SCALE,
+    amountScale: AMOUNT_SCALE,
+    lats,
+    lons,
+    amounts,
+    sources,
+    sourceIndexes,
+    stations,
+  };
+
+  encodedEvents.set(event, encoded);
+  return encoded;
+}
+
+/**
+ * Checks whether a parsed payload is in the columnar format
+ */
+export function isColumnar(payload: unknown): payload is ColumnarSnowfallEvent {
+  return typeof payload === 'object' && payload !== null && (payload as ColumnarSnowfallEvent).format === 'columnar';
+}
+
+/**
+ * Decodes a columnar event into typed-array columns and measurements
+ */
+export function decodeColumnar(payload: ColumnarSnowfallEvent): DecodedSnowfallEvent {
+  const count = payload.lats.length;
+  const lats = new Float64Array(count);
+  const lons = new Float64Array(count);
+  const amounts = new Float64Array(count);
+  const measurements: Measurement[] = new Array(count);
+
+  for (let i = 0; i < count; i++) {
+    lats[i] = payload.lats[i] / payload.coordinateScale;
+    lons[i] = payload.lons[i] / payload.coordinateScale;
+    amounts[i] = payload.amounts[i] / payload.amountScale;
+
+    measurements[i] = {
+      lat: lats[i],
+      lon: lons[i],
+      amount: amounts[i],
+      source: payload.sources[payload.sourceIndexes[i]],
+      station: payload.stations[i] ?? interpolatedStationName(lats[i], lons[i]),
+      timestamp: payload.timestampOverrides?.[i] ?? payload.timestamp,
+    };
+  }
+
+  return {
+    event: { stormId: payload.stormId, date: payload.date, measurements },
+    columns: { lons, lats, amounts },
+  };
+}
@@ -3,9 +3,10 @@
 
 'use client';
 
-import { createContext, useContext, useState, type ReactNode } from 'react';
+import { createContext, useContext, useEffect, useRef, useState, type ReactNode } from 'react';
 import type { SnowfallEvent, StormMetadata } from '@/types';
 import type { MarkerData } from '@/components/BottomSheet';
+import { StormDataCache } from '@/lib/storm-data-cache';
 
 interface SnowfallContextType {
   snowfallData: SnowfallEvent;
@@ -14,7 +15,9 @@ interface SnowfallContextType {
   isLoading: boolean;
   error: string | null;
   selectedMarker: MarkerData | null;
+  stormCache: StormDataCache;
   handleStormChange: (stormId: string) => Promise<void>;
+  prefetchStorm: (stormId: string) => void;
   setSelectedMarker: (marker: MarkerData | null) => void;
   setError: (error: string | null) => void;
 }
@@ -33,30 +36,87 @@ export function SnowfallProvider({ children, initialData, storms }: SnowfallProv
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [selectedMarker, setSelectedMarker] = useState<MarkerData | null>(null);
+  const [stormCache] = useState(() => {
+    const cache = new StormDataCache();
+    cache.setEvent(initialData);
+    return cache;
+  });
+  const stormRequest = useRef<AbortController | null>(null);
+
+  // Warm the cache with the other listed storms while the browser is idle
+  useEffect(() => {
+    const stormIds = storms.map(storm => storm.id).filter(id => id !== initialData.stormId);
+    if (stormIds.length === 0) return;
+
+    let cancelled = false;
+    let handle: number | undefined;
+
+    const schedule = (callback: () => void) => {
+      handle = typeof window.requestIdleCallback === 'function'
+        ? window.requestIdleCallback(callback)
+        : window.setTimeout(callback, 200);
+    };
+
+    const prefetchNext = () => {
+      const stormId = stormIds.shift();
+      if (cancelled || !stormId) return;
+      stormCache.prefetch(stormId).then(() => {
+        if (!cancelled) schedule(prefetchNext);
+      });
+    };
+
+    schedule(prefetchNext);
+
+    return () => {
+      cancelled = true;
+      if (handle === undefined) return;
+      if (typeof window.cancelIdleCallback === 'function') {
+        window.cancelIdleCallback(handle);
+      } else {
+        window.clearTimeout(handle);
+      }
+    };
+  }, [storms, initialData.stormId, stormCache]);
+
+  const prefetchStorm = (stormId: string) => {
+    stormCache.prefetch(stormId);
+  };
 
   const handleStormChange = async (stormId: string) => {
     if (stormId === selectedStormId) return;
 
-    setIsLoading(true);
+    // Only the latest selection may update state; cancel the one it replaces
+    stormRequest.current?.abort();
+    const request = new AbortController();
+    stormRequest.current = request;
+
     setSelectedStormId(stormId);
     setError(null);
 
+    // Storms viewed or prefetched before switch instantly
+    const cached = stormCache.getEvent(stormId);
+    if (cached) {
+      setSnowfallData(cached);
+      setIsLoading(false);
+      return;
+    }
+
+    setIsLoading(true);
+
     try {
-      const response = await fetch(`/api/snowfall/${stormId}`);
-      if (response.ok) {
-        const data = await response.json();
-        setSnowfallData(data);
-      } else {
-        const errorMsg = 'Unable to load storm data. Please try again later.';
-        setError(errorMsg);
-        console.error('Failed to fetch storm data:', response.statusText);
-      }
+      const data = await stormCache.loadEvent(stormId, request.signal);
+      if (request.signal.aborted) return;
+      setSnowfallData(data);
     } catch (error) {
+      if (request.signal.aborted) return;
       const errorMsg = 'Unable to load storm data. Please try again later.';
       setError(errorMsg);
       console.error('Error fetching storm data:', error);
     } finally {
-      setIsLoading(false);
+      if (!request.signal.aborted) {
+        setIsLoading(false);
+        stormRequest.current = null;
+      }
     }
   };
 
@@ -69,7 +129,9 @@ export function SnowfallProvider({ children, initialData, storms }: SnowfallProv
         isLoading,
         error,
         selectedMarker,
+        stormCache,
         handleStormChange,
+        prefetchStorm,
         setSelectedMarker,
         setError,
       }}
@@ -0,0 +1,115 @@
+// ABOUTME: Unit tests for the on-disk cache tier
+// ABOUTME: Tests checksummed round trips, corruption handling, budgets and warm restarts through MemoryCache
+
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import { mkdtempSync, readdirSync, rmSync, writeFileSync } from 'fs';
+import { tmpdir } from 'os';
+import path from 'path';
+import { DiskCacheStore } from './disk-cache';
+import { MemoryCache } from './cache';
+
+describe('DiskCacheStore', () => {
+  let directory: string;
+
+  beforeEach(() => {
+    directory = mkdtempSync(path.join(tmpdir(), 'chisnow-cache-'));
+  });
+
+  afterEach(() => {
+    rmSync(directory, { recursive: true, force: true });
+    vi.restoreAllMocks();
+  });
+
+  it('round-trips persisted entries', async () => {
+    const store = new DiskCacheStore(directory);
+    const entry = { data: { stormId: 'storm-2025-12-04' }, staleAt: Date.now() + 1000, expiresAt: Date.now() + 2000 };
+
+    await store.write('snowfall:storm-2025-12-04', entry);
+
+    expect(store.read('snowfall:storm-2025-12-04')).toEqual(entry);
+  });
+
+  it('only persists snowfall and storm keys by default', () => {
+    const store = new DiskCacheStore(directory);
+
+    expect(store.accepts('snowfall:latest')).toBe(true);
+    expect(store.accepts('storms:list')).toBe(true);
+    expect(store.accepts('measurements:mock:2025-12-04T15')).toBe(false);
+  });
+
+  it('discards entries that fail their checksum', async () => {
+    vi.spyOn(console, 'warn').mockImplementation(() => {});
+    const store = new DiskCacheStore(directory);
+    await store.write('storms:list', { data: [], staleAt: Date.now() + 1000, expiresAt: Date.now() + 2000 });
+
+    const [file] = readdirSync(directory);
+    writeFileSync(path.join(directory, file), 'CSC1corrupted');
+
+    expect(store.read('storms:list')).toBeNull();
+    expect(readdirSync(directory)).toHaveLength(0);
+  });
+
+  it('ignores entries past their hard TTL', async () => {
+    const store = new DiskCacheStore(directory);
+    await store.write('storms:list', { data: [], staleAt: Date.now() - 2000, expiresAt: Date.now() - 1000 });
+
+    expect(store.read('storms:list')).toBeNull();
+  });
+
+  it('serves a restarted MemoryCache from disk', async () => {
+    const store = new DiskCacheStore(directory);
+    const writeSpy = vi.spyOn(store, 'write');
+    const before = new MemoryCache({ persistentStore: store });
+
+    before.set('snowfall:latest', { stormId: 'storm-2025-12-04' });
+    await writeSpy.mock.results[0].value;
+
+    const after = new MemoryCache({ persistentStore: new DiskCacheStore(directory) });
+    const loader = vi.fn();
+
+    expect(await after.getOrLoad('snowfall:latest', loader)).toEqual({ stormId: 'storm-2025-12-04' });
+    expect(loader).not.toHaveBeenCalled();
+    expect(after.stats().persistentHits).toBe(1);
+  });
+
+  it('prunes least recently used files past its budget', async () => {
+    const store = new DiskCacheStore(directory, undefined, { maxFiles: 2 });
+    const entry = () => ({ data: [], staleAt: Date.now() + 1000, expiresAt: Date.now() + 2000 });
+
+    await store.write('storms:a', entry());
+    await store.write('storms:b', entry());
+    store.read('storms:a');
+    await store.write('storms:c', entry());
+
+    expect(store.read('storms:a')).not.toBeNull();
+    expect(store.read('storms:b')).toBeNull();
+    expect(readdirSync(directory)).toHaveLength(2);
+  });
+
+  it('keeps the latest of concurrent writes to one key', async () => {
+    const store = new DiskCacheStore(directory);
+    const expiresAt = Date.now() + 2000;
+
+    await Promise.all([
+      store.write('storms:list', { data: ['old'], staleAt: expiresAt, expiresAt }),
+      store.write('storms:list', { data: ['new'], staleAt: expiresAt, expiresAt }),
+    ]);
+
+    expect(store.read('storms:list')?.data).toEqual(['new']);
+    expect(readdirSync(directory)).toHaveLength(1);
+  });
+
+  it('deletes files for keys the memory tier evicts', async () => {
+    const store = new DiskCacheStore(directory);
+    const writeSpy = vi.spyOn(store, 'write');
+    const memory = new MemoryCache({ persistentStore: store, maxEntries: 1 });
+
+    memory.set('snowfall:storm-2025-12-04', { stormId: 'storm-2025-12-04' });
+    await writeSpy.mock.results[0].value;
+    memory.set('snowfall:storm-2025-12-05', { stormId: 'storm-2025-12-05' });
+    await writeSpy.mock.results[1].value;
+
+    expect(store.read('snowfall:storm-2025-12-04')).toBeNull();
+    expect(store.usage().files).toBe(1);
+  });
+});
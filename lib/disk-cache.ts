@@ -0,0 +1,340 @@
+// ABOUTME: Persistent on-disk cache tier so restarts and cold starts don't begin with an empty cache
+// ABOUTME: Stores one gzip-compressed, SHA-256-checksummed file per key in a budgeted local directory
+
+import { createHash, randomBytes } from 'crypto';
+import { closeSync, openSync, promises as fs, readFileSync, readSync, readdirSync, statSync, unlinkSync } from 'fs';
+import path from 'path';
+import { promisify } from 'util';
+import { gunzipSync, gzip } from 'zlib';
+import type { PersistedEntry, PersistentStore } from './cache';
+
+const gzipAsync = promisify(gzip);
+
+/**
+ * File layout: 4-byte magic + 8-byte hard expiry (float64 BE, ms) + 32-byte SHA-256
+ * of the payload + gzip(JSON payload). The expiry sits outside the payload so
+ * the directory can be indexed and pruned without decompressing anything.
+ */
+const FILE_MAGIC = Buffer.from('CSC2');
+const EXPIRY_BYTES = 8;
+const CHECKSUM_BYTES = 32;
+const HEADER_BYTES = FILE_MAGIC.length + EXPIRY_BYTES + CHECKSUM_BYTES;
+const FILE_EXTENSION = '.cache';
+const TEMP_EXTENSION = '.tmp';
+
+/**
+ * Key prefixes persisted by default: SnowfallEvent and StormMetadata[] payloads
+ */
+const DEFAULT_PERSISTED_PREFIXES = ['snowfall:', 'storms:'];
+
+const DEFAULT_MAX_FILES = 500;
+const DEFAULT_MAX_BYTES = 200 * 1024 * 1024; // 200 MB
+
+/**
+ * Budgets for a DiskCacheStore directory
+ */
+export interface DiskCacheOptions {
+  maxFiles?: number; // Least recently used files are deleted past this count
+  maxBytes?: number; // Least recently used files are deleted past this total size
+}
+
+interface PersistedFile<T> extends PersistedEntry<T> {
+  key: string;
+}
+
+interface IndexedFile {
+  size: number;
+  expiresAt: number;
+}
+
+/**
+ * Directory-backed cache store
+ *
+ * The directory is indexed once, from file headers, when the store is
+ * created. Lookups for keys that aren't on disk (or have expired) never touch
+ * the filesystem; a persisted hit is read once and then lives in the memory
+ * tier. Writes compress off the main thread and go to a uniquely named temp
+ * file that is renamed into place, so a crash mid-write never leaves a
+ * truncated entry behind and concurrent writes can't collide.
+ */
+export class DiskCacheStore implements PersistentStore {
+  private readonly directory: string;
+  private readonly prefixes: string[];
+  private readonly maxFiles: number;
+  private readonly maxBytes: number;
+  // Map iteration order doubles as recency order: oldest files come first
+  private readonly files: Map<string, IndexedFile> = new Map();
+  // Latest write started per file; older writes that finish late are discarded
+  private readonly pendingWrites: Map<string, symbol> = new Map();
+  private bytes = 0;
+
+  constructor(
+    directory: string,
+    prefixes: string[] = DEFAULT_PERSISTED_PREFIXES,
+    options: DiskCacheOptions = {}
+  ) {
+    this.directory = directory;
+    this.prefixes = prefixes;
+    this.maxFiles = options.maxFiles ?? DEFAULT_MAX_FILES;
+    this.maxBytes = options.maxBytes ?? DEFAULT_MAX_BYTES;
+
+    this.loadIndex();
+  }
+
+  /**
+   * Whether entries for this key are persisted
+   */
+  accepts(key: string): boolean {
+    return this.prefixes.some((prefix) => key.startsWith(prefix));
+  }
+
+  /**
+   * Reads a persisted entry, or null if it is missing, corrupt or past its hard TTL
+   */
+  read<T>(key: string): PersistedEntry<T> | null {
+    const fileName = this.getFileName(key);
+    const indexed = this.files.get(fileName);
+
+    if (!indexed) {
+      return null;
+    }
+
+    if (Date.now() > indexed.expiresAt) {
+      this.delete(key);
+      return null;
+    }
+
+    try {
+      const entry = decodeEntry<T>(readFileSync(path.join(this.directory, fileName)));
+
+      if (entry.key !== key) {
+        return null;
+      }
+
+      this.touch(fileName, indexed);
+      return { data: entry.data, storedAt: entry.storedAt, staleAt: entry.staleAt, expiresAt: entry.expiresAt };
+    } catch (error) {
+      console.warn(`[DiskCache] Discarding unreadable entry for ${key}:`, error);
+      this.delete(key);
+      return null;
+    }
+  }
+
+  /**
+   * Writes an entry to disk, then prunes the directory back within budget
+   */
+  async write<T>(key: string, entry: PersistedEntry<T>): Promise<void> {
+    const fileName = this.getFileName(key);
+    const filePath = path.join(this.directory, fileName);
+    const tempPath = `${filePath}.${process.pid}.${randomBytes(6).toString('hex')}${TEMP_EXTENSION}`;
+    const writeId = Symbol(key);
+    this.pendingWrites.set(fileName, writeId);
+
+    const file = await encodeEntry({ key, ...entry });
+    await fs.mkdir(this.directory, { recursive: true });
+    await fs.writeFile(tempPath, file);
+
+    // Superseded by a newer write or deleted meanwhile
+    if (this.pendingWrites.get(fileName) !== writeId) {
+      await fs.unlink(tempPath).catch(() => {});
+      return;
+    }
+
+    await fs.rename(tempPath, filePath);
+    this.pendingWrites.delete(fileName);
+
+    this.forget(fileName);
+    this.files.set(fileName, { size: file.length, expiresAt: entry.expiresAt });
+    this.bytes += file.length;
+    this.prune();
+  }
+
+  /**
+   * Removes a persisted entry
+   */
+  delete(key: string): void {
+    const fileName = this.getFileName(key);
+    this.pendingWrites.delete(fileName);
+    if (this.forget(fileName)) {
+      this.unlink(fileName);
+    }
+  }
+
+  /**
+   * Removes all persisted entries
+   */
+  clear(): void {
+    this.pendingWrites.clear();
+    for (const fileName of [...this.files.keys()]) {
+      this.forget(fileName);
+      this.unlink(fileName);
+    }
+  }
+
+  /**
+   * Gets the number of files and bytes on disk
+   */
+  usage(): { files: number; bytes: number } {
+    return { files: this.files.size, bytes: this.bytes };
+  }
+
+  /**
+   * Deletes expired files, then least recently used files past the budgets
+   */
+  private prune(): void {
+    const now = Date.now();
+
+    for (const [fileName, indexed] of this.files) {
+      if (now > indexed.expiresAt) {
+        this.forget(fileName);
+        this.unlink(fileName);
+      }
+    }
+
+    for (const fileName of this.files.keys()) {
+      if (this.files.size <= this.maxFiles && this.bytes <= this.maxBytes) {
+        break;
+      }
+
+      this.forget(fileName);
+      this.unlink(fileName);
+    }
+  }
+
+  /**
+   * Indexes the files already in the directory from their headers, oldest first,
+   * removing leftover temp files, old formats and expired entries
+   */
+  private loadIndex(): void {
+    let names: string[];
+    try {
+      names = readdirSync(this.directory);
+    } catch {
+      return;
+    }
+
+    const found: Array<{ fileName: string; modifiedAt: number; indexed: IndexedFile }> = [];
+
+    for (const fileName of names) {
+      if (fileName.endsWith(TEMP_EXTENSION)) {
+        this.unlink(fileName);
+        continue;
+      }
+
+      if (!fileName.endsWith(FILE_EXTENSION)) continue;
+
+      try {
+        const filePath = path.join(this.directory, fileName);
+        const { size, mtimeMs } = statSync(filePath);
+        const expiresAt = readExpiry(filePath);
+
+        if (expiresAt === null) {
+          this.unlink(fileName);
+          continue;
+        }
+
+        found.push({ fileName, modifiedAt: mtimeMs, indexed: { size, expiresAt } });
+      } catch {
+        // Removed while indexing
+      }
+    }
+
+    found.sort((a, b) => a.modifiedAt - b.modifiedAt);
+    for (const { fileName, indexed } of found) {
+      this.files.set(fileName, indexed);
+      this.bytes += indexed.size;
+    }
+
+    this.prune();
+  }
+
+  /**
+   * Marks a file most recently used
+   */
+  private touch(fileName: string, indexed: IndexedFile): void {
+    this.files.delete(fileName);
+    this.files.set(fileName, indexed);
+  }
+
+  /**
+   * Drops a file from the index
+   *
+   * @returns Whether the file was indexed
+   */
+  private forget(fileName: string): boolean {
+    const indexed = this.files.get(fileName);
+    if (!indexed) return false;
+
+    this.bytes -= indexed.size;
+    this.files.delete(fileName);
+    return true;
+  }
+
+  /**
+   * Deletes a file from the directory
+   */
+  private unlink(fileName: string): void {
+    try {
+      unlinkSync(path.join(this.directory, fileName));
+    } catch {
+      // Already removed
+    }
+  }
+
+  /**
+   * Maps a cache key to a filesystem-safe file name
+   */
+  private getFileName(key: string): string {
+    return `${createHash('sha1').update(key).digest('hex')}${FILE_EXTENSION}`;
+  }
+}
+
+/**
+ * Serializes an entry into the checksummed on-disk format
+ */
+async function encodeEntry<T>(entry: PersistedFile<T>): Promise<Buffer> {
+  const payload = await gzipAsync(JSON.stringify(entry));
+  const expiry = Buffer.alloc(EXPIRY_BYTES);
+  expiry.writeDoubleBE(entry.expiresAt);
+  const checksum = createHash('sha256').update(payload).digest();
+  return Buffer.concat([FILE_MAGIC, expiry, checksum, payload]);
+}
+
+/**
+ * Reads a file's hard expiry from its header
+ *
+ * @returns The expiry, or null if the file isn't in the current format
+ */
+function readExpiry(filePath: string): number | null {
+  const header = Buffer.alloc(FILE_MAGIC.length + EXPIRY_BYTES);
+  const fd = openSync(filePath, 'r');
+  try {
+    const read = readSync(fd, header, 0, header.length, 0);
+    if (read < header.length || !header.subarray(0, FILE_MAGIC.length).equals(FILE_MAGIC)) {
+      return null;
+    }
+    return header.readDoubleBE(FILE_MAGIC.length);
+  } finally {
+    closeSync(fd);
+  }
+}
+
+/**
+ * Parses an entry from the on-disk format, verifying its magic and checksum
+ *
+ * @throws Error if the file is truncated or fails its checksum
+ */
+function decodeEntry<T>(file: Buffer): PersistedFile<T> {
+  if (file.length < HEADER_BYTES || !file.subarray(0, FILE_MAGIC.length).equals(FILE_MAGIC)) {
+    throw new Error('Unrecognized cache file format');
+  }
+
+  const checksum = file.subarray(FILE_MAGIC.length + EXPIRY_BYTES, HEADER_BYTES);
+  const payload = file.subarray(HEADER_BYTES);
+
+  if (!createHash('sha256').update(payload).digest().equals(checksum)) {
+    throw new Error('Cache file checksum mismatch');
+  }
+
+  return JSON.parse(gunzipSync(payload).toString('utf8')) as PersistedFile<T>;
+}
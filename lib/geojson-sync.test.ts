@@ -0,0 +1,94 @@
+// ABOUTME: Tests for incremental GeoJSON source updates
+// ABOUTME: Verifies feature diffing and the choice between updateData, setData and skipping
+
+import { describe, it, expect, vi } from 'vitest';
+import type { Map as MapboxMap } from 'mapbox-gl';
+import { diffFeatures, GeoJSONSourceSync } from './geojson-sync';
+
+function point(featureId: string, amount: number, lon = -87.6) {
+  return {
+    type: 'Feature' as const,
+    geometry: { type: 'Point' as const, coordinates: [lon, 41.9] },
+    properties: { featureId, amount },
+  };
+}
+
+function collection(...features: ReturnType<typeof point>[]) {
+  return { type: 'FeatureCollection' as const, features };
+}
+
+function fakeMap() {
+  const source = { setData: vi.fn(), updateData: vi.fn() };
+  const map = {
+    getSource: vi.fn(() => source),
+    on: vi.fn(),
+    off: vi.fn(),
+  };
+  return { map: map as unknown as MapboxMap, source };
+}
+
+describe('diffFeatures', () => {
+  it('reports added, modified and removed features', () => {
+    const { index } = diffFeatures(new Map(), [point('a', 1), point('b', 2), point('c', 3)]);
+    const diff = diffFeatures(index, [point('a', 1), point('b', 5), point('d', 4)]);
+
+    expect(diff.changed.map((feature) => feature.properties.featureId)).toEqual(['b', 'd']);
+    expect(diff.removed).toEqual(['c']);
+  });
+
+  it('treats a moved feature as changed', () => {
+    const { index } = diffFeatures(new Map(), [point('a', 1)]);
+    expect(diffFeatures(index, [point('a', 1, -88)]).changed).toHaveLength(1);
+  });
+
+  it('treats a feature whose displayed properties changed as changed', () => {
+    const stamped = (timestamp: string) => ({ ...point('a', 1), properties: { featureId: 'a', amount: 1, timestamp } });
+    const { index } = diffFeatures(new Map(), [stamped('2025-12-04T12:00:00.000Z')]);
+    const diff = diffFeatures(index, [stamped('2026-01-10T12:00:00.000Z')]);
+
+    expect(diff.changed.map((feature) => feature.properties.featureId)).toEqual(['a']);
+  });
+});
+
+describe('GeoJSONSourceSync', () => {
+  it('skips data that has not changed', () => {
+    const { map, source } = fakeMap();
+    const sync = new GeoJSONSourceSync(map, 'points', true);
+    sync.prime(collection(point('a', 1)));
+
+    expect(sync.update(collection(point('a', 1)))).toBe(false);
+    expect(source.setData).not.toHaveBeenCalled();
+    expect(source.updateData).not.toHaveBeenCalled();
+  });
+
+  it('sends only changed features to a dynamic source', () => {
+    const { map, source } = fakeMap();
+    const sync = new GeoJSONSourceSync(map, 'points', true);
+    sync.prime(collection(point('a', 1), point('b', 2)));
+
+    expect(sync.update(collection(point('a', 1), point('b', 3)))).toBe(true);
+    expect(source.updateData).toHaveBeenCalledWith(collection(point('b', 3)));
+    expect(source.setData).not.toHaveBeenCalled();
+  });
+
+  it('replaces the data when features were removed', () => {
+    const { map, source } = fakeMap();
+    const sync = new GeoJSONSourceSync(map, 'points', true);
+    sync.prime(collection(point('a', 1), point('b', 2)));
+
+    const next = collection(point('a', 1));
+    sync.update(next);
+    expect(source.setData).toHaveBeenCalledWith(next);
+    expect(source.updateData).not.toHaveBeenCalled();
+  });
+
+  it('always replaces the data of a non-incremental source', () => {
+    const { map, source } = fakeMap();
+    const sync = new GeoJSONSourceSync(map, 'markers', false);
+    sync.prime(collection(point('a', 1)));
+
+    sync.update(collection(point('a', 2)));
+    expect(source.setData).toHaveBeenCalledTimes(1);
+    expect(source.updateData).not.toHaveBeenCalled();
+  });
+});
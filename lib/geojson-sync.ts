@@ -0,0 +1,138 @@
+// ABOUTME: Keeps a Mapbox GeoJSON source in step with new data by sending only what changed
+// ABOUTME: Features are matched by a stable featureId property; unchanged data is skipped entirely
+
+import type { GeoJSONSource, Map as MapboxMap } from 'mapbox-gl';
+
+/**
+ * Property holding each feature's stable id (also the source's promoteId)
+ */
+export const FEATURE_ID_PROPERTY = 'featureId';
+
+type SyncFeature = GeoJSON.Feature<GeoJSON.Geometry, { [FEATURE_ID_PROPERTY]: string | number }>;
+
+/**
+ * Fingerprint (position and properties) of each feature by id, used to spot changes between updates
+ */
+export type FeatureIndex = Map<string | number, string>;
+
+/**
+ * Difference between an indexed collection and new data
+ */
+export interface FeatureDiff<F extends SyncFeature> {
+  changed: F[];                   // Added or modified features
+  removed: Array<string | number>;
+  index: FeatureIndex;            // Index of the new data
+}
+
+/**
+ * Compares new features against the index of the previous ones
+ */
+export function diffFeatures<F extends SyncFeature>(previous: FeatureIndex, features: F[]): FeatureDiff<F> {
+  const index: FeatureIndex = new Map();
+  const changed: F[] = [];
+
+  for (const feature of features) {
+    const id = feature.properties[FEATURE_ID_PROPERTY];
+    const fingerprint = fingerprintFeature(feature);
+    index.set(id, fingerprint);
+
+    if (previous.get(id) !== fingerprint) {
+      changed.push(feature);
+    }
+  }
+
+  const removed = [...previous.keys()].filter((id) => !index.has(id));
+  return { changed, removed, index };
+}
+
+/**
+ * Identifies everything the map draws or shows for a feature: its position and
+ * every property (flat values such as amount, color, station and timestamp)
+ */
+function fingerprintFeature(feature: SyncFeature): string {
+  const { geometry } = feature;
+
+  // Points are almost all of the features, so skip serializing their coordinates
+  let fingerprint = geometry.type === 'Point'
+    ? `${geometry.coordinates[0]},${geometry.coordinates[1]}`
+    : JSON.stringify(geometry.type === 'GeometryCollection' ? geometry.geometries : geometry.coordinates);
+
+  for (const value of Object.values(feature.properties)) {
+    fingerprint += `\u001f${value}`;
+  }
+  return fingerprint;
+}
+
+/**
+ * Pushes data into one GeoJSON source, as an incremental update where possible
+ *
+ * Sources created with `dynamic: true` get only added and modified features
+ * through updateData. Mapbox can't remove features that way, so removals (and
+ * non-dynamic sources such as clustered ones) fall back to a full setData.
+ */
+export class GeoJSONSourceSync<F extends SyncFeature> {
+  private readonly map: MapboxMap;
+  private readonly sourceId: string;
+  private readonly incremental: boolean;
+  private index: FeatureIndex = new Map();
+  private pendingReport: ((event: { sourceId?: string; isSourceLoaded?: boolean }) => void) | null = null;
+
+  constructor(map: MapboxMap, sourceId: string, incremental: boolean) {
+    this.map = map;
+    this.sourceId = sourceId;
+    this.incremental = incremental;
+  }
+
+  /**
+   * Records data the source was created with, so the next update diffs against it
+   */
+  prime(collection: GeoJSON.FeatureCollection<F['geometry'], F['properties']>): void {
+    this.index = diffFeatures(new Map(), collection.features as F[]).index;
+  }
+
+  /**
+   * Sends a new version of the data to the source
+   *
+   * @returns Whether the source was updated (false when nothing changed)
+   */
+  update(collection: GeoJSON.FeatureCollection<F['geometry'], F['properties']>): boolean {
+    const source = this.map.getSource(this.sourceId) as GeoJSONSource | undefined;
+    if (!source) return false;
+
+    const features = collection.features as F[];
+    const { changed, removed, index } = diffFeatures(this.index, features);
+    if (changed.length === 0 && removed.length === 0) return false;
+
+    this.index = index;
+    const mode = this.incremental && removed.length === 0 ? 'updateData' : 'setData';
+    this.reportTiming(`${changed.length} changed, ${removed.length} removed of ${features.length} via ${mode}`);
+
+    if (mode === 'updateData') {
+      source.updateData({ type: 'FeatureCollection', features: changed });
+    } else {
+      source.setData(collection);
+    }
+    return true;
+  }
+
+  /**
+   * Records how long the source takes to parse (and cluster) the update as a
+   * performance measure, shown in the browser profiler's timings track
+   */
+  private reportTiming(summary: string): void {
+    // A newer update supersedes the one still loading
+    if (this.pendingReport) this.map.off('sourcedata', this.pendingReport);
+
+    const start = performance.now();
+
+    const onSourceData = (event: { sourceId?: string; isSourceLoaded?: boolean }) => {
+      if (event.sourceId !== this.sourceId || !event.isSourceLoaded) return;
+      this.map.off('sourcedata', onSourceData);
+      this.pendingReport = null;
+      performance.measure(`[GeoJSON] ${this.sourceId}: ${summary}`, { start });
+    };
+
+    this.pendingReport = onSourceData;
+    this.map.on('sourcedata', onSourceData);
+  }
+}
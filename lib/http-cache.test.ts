@@ -0,0 +1,100 @@
+// ABOUTME: Tests for HTTP conditional request handling
+// ABOUTME: Verifies ETags, conditional matching and Accept-Encoding negotiation of precompressed bodies
+
+import { describe, it, expect } from 'vitest';
+import { gunzipSync, brotliDecompressSync } from 'zlib';
+import { NextRequest } from 'next/server';
+import { cachedResponse, getRepresentation, isNotModified, negotiateEncoding } from './http-cache';
+
+function request(headers: Record<string, string>) {
+  return new NextRequest('http://localhost:3000/api/storms', { headers });
+}
+
+describe('getRepresentation', () => {
+  it('serializes a value once and hashes its content', () => {
+    const data = { stormId: 'storm-2025-12-04' };
+    const representation = getRepresentation(data);
+
+    expect(new TextDecoder().decode(representation.body)).toBe(JSON.stringify(data));
+    expect(getRepresentation(data)).toBe(representation);
+    expect(getRepresentation({ stormId: 'storm-2025-12-04' }).etag).toBe(representation.etag);
+    expect(getRepresentation({ stormId: 'storm-2025-12-05' }).etag).not.toBe(representation.etag);
+  });
+});
+
+describe('isNotModified', () => {
+  const modifiedAt = new Date('2025-12-04T12:00:00Z');
+  const representation = getRepresentation({ measurements: [] }, modifiedAt);
+
+  it('matches If-None-Match against the ETag, including weak and listed tags', () => {
+    expect(isNotModified(request({ 'If-None-Match': representation.etag }), representation)).toBe(true);
+    expect(isNotModified(request({ 'If-None-Match': `"other", W/${representation.etag}` }), representation)).toBe(true);
+    expect(isNotModified(request({ 'If-None-Match': '"other"' }), representation)).toBe(false);
+  });
+
+  it('falls back to If-Modified-Since', () => {
+    expect(isNotModified(request({ 'If-Modified-Since': modifiedAt.toUTCString() }), representation)).toBe(true);
+    expect(isNotModified(request({ 'If-Modified-Since': 'Wed, 03 Dec 2025 12:00:00 GMT' }), representation)).toBe(false);
+  });
+
+  it('ignores If-Modified-Since when If-None-Match is present', () => {
+    const headers = { 'If-None-Match': '"other"', 'If-Modified-Since': modifiedAt.toUTCString() };
+    expect(isNotModified(request(headers), representation)).toBe(false);
+  });
+
+  it('requires a full response without conditional headers', () => {
+    expect(isNotModified(request({}), representation)).toBe(false);
+  });
+});
+
+describe('negotiateEncoding', () => {
+  it('prefers brotli, then gzip', () => {
+    expect(negotiateEncoding('gzip, deflate, br')).toBe('br');
+    expect(negotiateEncoding('gzip, deflate')).toBe('gzip');
+    expect(negotiateEncoding('br;q=0, gzip;q=0.5')).toBe('gzip');
+    expect(negotiateEncoding('*')).toBe('br');
+    expect(negotiateEncoding(null)).toBe('identity');
+    expect(negotiateEncoding('deflate')).toBe('identity');
+  });
+});
+
+describe('cachedResponse', () => {
+  const data = { measurements: Array.from({ length: 200 }, (_, i) => ({ station: `S${i}`, amount: i / 10 })) };
+  const json = JSON.stringify(data);
+
+  it('serves the precompressed variant the client accepts', async () => {
+    const brotli = cachedResponse(request({ 'Accept-Encoding': 'gzip, br' }), data);
+    expect(brotli.headers.get('Content-Encoding')).toBe('br');
+    expect(brotli.headers.get('Vary')).toBe('Accept-Encoding');
+    expect(brotliDecompressSync(Buffer.from(await brotli.arrayBuffer())).toString()).toBe(json);
+
+    const gzip = cachedResponse(request({ 'Accept-Encoding': 'gzip' }), data);
+    expect(gzip.headers.get('Content-Encoding')).toBe('gzip');
+    expect(gunzipSync(Buffer.from(await gzip.arrayBuffer())).toString()).toBe(json);
+
+    const identity = cachedResponse(request({}), data);
+    expect(identity.headers.get('Content-Encoding')).toBeNull();
+    expect(await identity.text()).toBe(json);
+  });
+
+  it('sends small bodies uncompressed', () => {
+    const response = cachedResponse(request({ 'Accept-Encoding': 'br' }), { ok: true });
+    expect(response.headers.get('Content-Encoding')).toBeNull();
+  });
+
+  it('sends already-compressed media as it is', () => {
+    const png = new Uint8Array(4096).fill(7);
+    const response = cachedResponse(request({ 'Accept-Encoding': 'gzip, br' }), png, { contentType: 'image/png' });
+
+    expect(response.headers.get('Content-Encoding')).toBeNull();
+    expect(response.headers.get('Content-Length')).toBe('4096');
+  });
+
+  it('accepts the weak ETag of an encoded variant for revalidation', () => {
+    const first = cachedResponse(request({ 'Accept-Encoding': 'gzip' }), data);
+    const etag = first.headers.get('ETag')!;
+    expect(etag.startsWith('W/')).toBe(true);
+
+    expect(cachedResponse(request({ 'If-None-Match': etag }), data).status).toBe(304);
+  });
+});
@@ -0,0 +1,176 @@
+// ABOUTME: HTTP caching for API responses: content-hash ETags, Last-Modified and 304 replies
+// ABOUTME: Bodies are serialized and gzip/brotli compressed once per cached object, then served as bytes
+
+import { createHash } from 'crypto';
+import { brotliCompressSync, constants as zlibConstants, gzipSync } from 'zlib';
+import { NextRequest, NextResponse } from 'next/server';
+import { DEFAULT_STALE_TTL_MS, DEFAULT_TTL_MS } from './cache';
+
+/**
+ * Cache-Control for data refreshed on the server cache's TTL: shared caches
+ * (CDNs) reuse it for the TTL and serve it stale while revalidating, while
+ * browsers revalidate every time with a cheap conditional request
+ */
+export const SHARED_CACHE_CONTROL =
+  `public, max-age=0, s-maxage=${DEFAULT_TTL_MS / 1000}, ` +
+  `stale-while-revalidate=${DEFAULT_STALE_TTL_MS / 1000}`;
+
+// Bodies smaller than this are sent uncompressed; the encoding overhead isn't worth it
+const MIN_COMPRESS_BYTES = 1024;
+
+// Media types that are already compressed, so gzip/brotli would only cost CPU
+const PRECOMPRESSED_CONTENT_TYPE = /^(image\/(png|jpeg|webp|avif)|application\/(gzip|zip))\b/;
+
+// Compressed once per refresh, so favour size, but stay clear of quality 11's multi-second runs on large grids
+const BROTLI_QUALITY = 8;
+
+/**
+ * Content codings a representation can be sent in
+ */
+export type ContentEncoding = 'br' | 'gzip' | 'identity';
+
+/**
+ * A serialized response body, its precompressed variants and its validators
+ */
+export interface CachedRepresentation {
+  body: Uint8Array<ArrayBuffer>; // UTF-8 JSON, or the value itself for binary payloads
+  gzip: Uint8Array<ArrayBuffer> | null; // Null when the body is too small to compress
+  br: Uint8Array<ArrayBuffer> | null;
+  etag: string;
+  lastModified: string; // HTTP date
+}
+
+// Keyed by the cached value, so each refresh is serialized and hashed once
+const representations = new WeakMap<object, CachedRepresentation>();
+
+/**
+ * Gets the serialized body and validators for a cached value
+ * Values are sent as JSON, except byte arrays which are sent as they are
+ *
+ * @param modifiedAt - When the value was loaded (defaults to now)
+ * @param compressible - Whether to precompress the body (false for already-compressed media)
+ */
+export function getRepresentation(
+  data: object,
+  modifiedAt: Date | null = null,
+  compressible: boolean = true
+): CachedRepresentation {
+  let representation = representations.get(data);
+
+  if (!representation) {
+    const body = data instanceof Uint8Array
+      ? (data as Uint8Array<ArrayBuffer>)
+      : new TextEncoder().encode(JSON.stringify(data));
+    const compress = compressible && body.byteLength >= MIN_COMPRESS_BYTES;
+
+    representation = {
+      body,
+      gzip: compress ? new Uint8Array(gzipSync(body)) : null,
+      br: compress
+        ? new Uint8Array(brotliCompressSync(body, {
+            params: {
+              [zlibConstants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY,
+              [zlibConstants.BROTLI_PARAM_SIZE_HINT]: body.byteLength,
+            },
+          }))
+        : null,
+      etag: `"${createHash('sha1').update(body).digest('base64url')}"`,
+      lastModified: (modifiedAt ?? new Date()).toUTCString(),
+    };
+    representations.set(data, representation);
+  }
+
+  return representation;
+}
+
+/**
+ * Picks the best encoding a client accepts: brotli, then gzip, then none
+ */
+export function negotiateEncoding(acceptEncoding: string | null): ContentEncoding {
+  if (!acceptEncoding) return 'identity';
+
+  const accepted = new Map<string, number>();
+  for (const part of acceptEncoding.split(',')) {
+    const [coding, ...params] = part.trim().toLowerCase().split(';');
+    const qParam = params.map((param) => param.trim()).find((param) => param.startsWith('q='));
+    const q = qParam ? Number(qParam.slice(2)) : 1;
+    accepted.set(coding.trim(), Number.isNaN(q) ? 0 : q);
+  }
+
+  const quality = (coding: string) => accepted.get(coding) ?? accepted.get('*') ?? 0;
+
+  if (quality('br') > 0) return 'br';
+  if (quality('gzip') > 0) return 'gzip';
+  return 'identity';
+}
+
+/**
+ * Checks a request's conditional headers against a representation
+ * If-None-Match takes precedence over If-Modified-Since, as in RFC 9110
+ */
+export function isNotModified(request: NextRequest, representation: CachedRepresentation): boolean {
+  const ifNoneMatch = request.headers.get('if-none-match');
+  if (ifNoneMatch) {
+    return ifNoneMatch
+      .split(',')
+      .map((tag) => tag.trim().replace(/^W\//, ''))
+      .some((tag) => tag === '*' || tag === representation.etag);
+  }
+
+  const ifModifiedSince = request.headers.get('if-modified-since');
+  if (ifModifiedSince) {
+    const since = Date.parse(ifModifiedSince);
+    return !Number.isNaN(since) && Date.parse(representation.lastModified) <= since;
+  }
+
+  return false;
+}
+
+/**
+ * Responds with a cached value in the best encoding the client accepts,
+ * or an empty 304 if the client's copy is current
+ */
+export function cachedResponse(
+  request: NextRequest,
+  data: object,
+  options: {
+    modifiedAt?: Date | null;
+    cacheControl?: string;
+    contentType?: string;
+    vary?: string; // Request headers besides Accept-Encoding that select the representation
+    headers?: Record<string, string>;
+  } = {}
+): NextResponse {
+  const representation = getRepresentation(
+    data,
+    options.modifiedAt,
+    !PRECOMPRESSED_CONTENT_TYPE.test(options.contentType ?? '')
+  );
+
+  let encoding = negotiateEncoding(request.headers.get('accept-encoding'));
+  const body = encoding === 'identity' ? representation.body : representation[encoding];
+  if (!body) encoding = 'identity';
+
+  const headers: Record<string, string> = {
+    ...options.headers,
+    'Cache-Control': options.cacheControl ?? SHARED_CACHE_CONTROL,
+    // Encoded variants share the content hash, so they are only weakly equivalent
+    ETag: encoding === 'identity' ? representation.etag : `W/${representation.etag}`,
+    'Last-Modified': representation.lastModified,
+    Vary: options.vary ? `${options.vary}, Accept-Encoding` : 'Accept-Encoding',
+  };
+
+  if (isNotModified(request, representation)) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+
+  const bytes = body ?? representation.body;
+  return new NextResponse(bytes, {
+    headers: {
+      ...headers,
+      'Content-Type': options.contentType ?? 'application/json',
+      'Content-Length': String(bytes.byteLength),
+      ...(encoding === 'identity' ? {} : { 'Content-Encoding': encoding }),
+    },
+  });
+}
@@ -0,0 +1,64 @@
+// ABOUTME: Unit tests for the typed-array IDW grid engine
+// ABOUTME: Compares batch grid output with single-point IDW and checks Measurement materialization
+
+import { describe, it, expect } from 'vitest';
+import { createGridSpec, gridToMeasurements, interpolateGrid, toSampleColumns } from './idw-grid';
+import { interpolateIDW } from './spatial-interpolator';
+import { Measurement } from '@/types';
+
+const samples: Measurement[] = [
+  { lat: 42.0, lon: -88.0, amount: 10.0, source: 'NOAA_GRIDDED', station: 'A', timestamp: '2025-01-01' },
+  { lat: 41.0, lon: -89.0, amount: 4.0, source: 'NOAA_GRIDDED', station: 'B', timestamp: '2025-01-01' },
+  { lat: 40.0, lon: -88.0, amount: 0.0, source: 'NOAA_GRIDDED', station: 'C', timestamp: '2025-01-01' },
+];
+const bounds = { minLat: 40.0, maxLat: 42.0, minLon: -89.0, maxLon: -87.5 };
+
+describe('createGridSpec', () => {
+  it('includes both edges of the bounds', () => {
+    expect(createGridSpec(bounds, 0.5)).toMatchObject({ cols: 4, rows: 5 });
+  });
+});
+
+describe('interpolateGrid', () => {
+  it('matches single-point IDW for every cell', () => {
+    // Fewer samples than DEFAULT_IDW_NEIGHBORS, so the nearest neighbours are every sample
+    const spec = createGridSpec(bounds, 0.25);
+    const grid = interpolateGrid(toSampleColumns(samples), spec);
+
+    for (let row = 0; row < spec.rows; row++) {
+      for (let col = 0; col < spec.cols; col++) {
+        const expected = interpolateIDW(
+          spec.minLon + col * spec.resolution,
+          spec.minLat + row * spec.resolution,
+          samples
+        );
+        expect(grid.values[row * spec.cols + col]).toBeCloseTo(expected, 4);
+      }
+    }
+  });
+
+  it('writes into a caller-provided buffer', () => {
+    const spec = createGridSpec(bounds, 0.5);
+    const output = new Float32Array(spec.rows * spec.cols);
+    const grid = interpolateGrid(toSampleColumns(samples), spec, { output });
+
+    expect(grid.values).toBe(output);
+  });
+
+  it('rejects a buffer that is too small', () => {
+    const spec = createGridSpec(bounds, 0.5);
+    expect(() => interpolateGrid(toSampleColumns(samples), spec, { output: new Float32Array(2) })).toThrow();
+  });
+});
+
+describe('gridToMeasurements', () => {
+  it('only materializes cells above the trace threshold with a shared timestamp', () => {
+    const grid = interpolateGrid(toSampleColumns(samples), createGridSpec(bounds, 0.5));
+    const measurements = gridToMeasurements(grid, '2025-01-01T00:00:00.000Z');
+
+    expect(measurements.length).toBeLessThan(grid.values.length);
+    expect(measurements.every((m) => m.amount > 0.1)).toBe(true);
+    expect(new Set(measurements.map((m) => m.timestamp))).toEqual(new Set(['2025-01-01T00:00:00.000Z']));
+    expect(measurements[0].station).toMatch(/^INTERPOLATED_/);
+  });
+});
@@ -0,0 +1,196 @@
+// ABOUTME: Batch IDW engine over typed-array sample columns and a preallocated Float32Array grid
+// ABOUTME: Avoids per-cell object allocation; Measurements are only materialized on request
+
+import type { Measurement } from '@/types';
+import { SpatialIndex } from './spatial-index';
+
+/**
+ * One numeric sample column; Float32 columns come straight from the binary wire format
+ */
+export type SampleColumn = Float64Array | Float32Array;
+
+/**
+ * Sample coordinates and amounts as parallel columns
+ */
+export interface SampleColumns {
+  lons: SampleColumn;
+  lats: SampleColumn;
+  amounts: SampleColumn;
+}
+
+/**
+ * Regular lon/lat grid; cell (row, col) sits at (minLon + col * resolution, minLat + row * resolution)
+ */
+export interface GridSpec {
+  minLon: number;
+  minLat: number;
+  resolution: number;
+  cols: number;
+  rows: number;
+}
+
+/**
+ * Interpolated grid values in row-major order (rows run south to north)
+ */
+export interface IdwGrid extends GridSpec {
+  values: Float32Array;
+}
+
+/**
+ * IDW settings for a grid run
+ */
+export interface IdwGridOptions {
+  power?: number; // Distance exponent (default 2)
+  neighbors?: number; // Nearest samples weighted per cell (default 12)
+  output?: Float32Array; // Reused output buffer, must hold rows * cols values
+}
+
+/**
+ * Number of nearest samples weighted per cell
+ */
+export const DEFAULT_IDW_NEIGHBORS = 12;
+
+/**
+ * Interpolated amounts at or below this (inches) are treated as no snow
+ */
+export const TRACE_THRESHOLD = 0.1;
+
+// Squared distance (degrees²) under which a cell takes a sample's value outright
+const EXACT_MATCH_DISTANCE_SQ = 0.001 * 0.001;
+
+/**
+ * Copies Measurement fields into parallel typed-array columns
+ */
+export function toSampleColumns(samples: Measurement[]): SampleColumns {
+  const columns: SampleColumns = {
+    lons: new Float64Array(samples.length),
+    lats: new Float64Array(samples.length),
+    amounts: new Float64Array(samples.length),
+  };
+
+  for (let i = 0; i < samples.length; i++) {
+    columns.lons[i] = samples[i].lon;
+    columns.lats[i] = samples[i].lat;
+    columns.amounts[i] = samples[i].amount;
+  }
+
+  return columns;
+}
+
+/**
+ * Lays out a grid covering bounds (inclusive) at the given spacing
+ */
+export function createGridSpec(
+  bounds: { minLat: number; maxLat: number; minLon: number; maxLon: number },
+  resolution: number
+): GridSpec {
+  // Small epsilon so floating point error doesn't drop the last row/column
+  const steps = (span: number) => Math.max(Math.floor(span / resolution + 1e-9) + 1, 0);
+
+  return {
+    minLon: bounds.minLon,
+    minLat: bounds.minLat,
+    resolution,
+    cols: steps(bounds.maxLon - bounds.minLon),
+    rows: steps(bounds.maxLat - bounds.minLat),
+  };
+}
+
+/**
+ * Interpolates every grid cell from the nearest samples
+ *
+ * Weights come straight from the squared distances the spatial index already
+ * computed: 1/d² for the default power of 2, d²^(-power/2) otherwise.
+ */
+export function interpolateGrid(
+  columns: SampleColumns,
+  spec: GridSpec,
+  options: IdwGridOptions = {}
+): IdwGrid {
+  const power = options.power ?? 2;
+  const cellCount = spec.rows * spec.cols;
+  const values = options.output ?? new Float32Array(cellCount);
+
+  if (values.length < cellCount) {
+    throw new Error(`Output buffer holds ${values.length} values, grid needs ${cellCount}`);
+  }
+
+  const k = Math.min(options.neighbors ?? DEFAULT_IDW_NEIGHBORS, columns.amounts.length);
+  if (k === 0) {
+    values.fill(0, 0, cellCount);
+    return { ...spec, values };
+  }
+
+  const index = new SpatialIndex(columns.lons, columns.lats);
+  const neighbors = new Int32Array(k);
+  const distancesSq = new Float64Array(k);
+  const halfPower = power / 2;
+
+  for (let row = 0; row < spec.rows; row++) {
+    const lat = spec.minLat + row * spec.resolution;
+
+    for (let col = 0; col < spec.cols; col++) {
+      const lon = spec.minLon + col * spec.resolution;
+      const found = index.nearestInto(lon, lat, k, neighbors, distancesSq);
+
+      let weightSum = 0;
+      let valueSum = 0;
+      let exact = false;
+
+      for (let n = 0; n < found; n++) {
+        const distanceSq = distancesSq[n];
+        const amount = columns.amounts[neighbors[n]];
+
+        // Neighbours are sorted, so only the first can be an exact match
+        if (distanceSq < EXACT_MATCH_DISTANCE_SQ) {
+          values[row * spec.cols + col] = amount;
+          exact = true;
+          break;
+        }
+
+        const weight = power === 2 ? 1 / distanceSq : 1 / Math.pow(distanceSq, halfPower);
+        weightSum += weight;
+        valueSum += weight * amount;
+      }
+
+      if (!exact) {
+        values[row * spec.cols + col] = weightSum > 0 ? valueSum / weightSum : 0;
+      }
+    }
+  }
+
+  return { ...spec, values };
+}
+
+/**
+ * Materializes grid cells above the trace threshold as interpolated Measurements
+ * All points share a single timestamp and amounts are rounded to hundredths
+ */
+export function gridToMeasurements(
+  grid: IdwGrid,
+  timestamp: string = new Date().toISOString(),
+  threshold: number = TRACE_THRESHOLD
+): Measurement[] {
+  const measurements: Measurement[] = [];
+
+  for (let row = 0; row < grid.rows; row++) {
+    const lat = grid.minLat + row * grid.resolution;
+
+    for (let col = 0; col < grid.cols; col++) {
+      const amount = grid.values[row * grid.cols + col];
+      if (amount <= threshold) continue;
+
+      const lon = grid.minLon + col * grid.resolution;
+      measurements.push({
+        lat,
+        lon,
+        amount: Math.round(amount * 100) / 100, // Hundredths of an inch, without Float32 noise
+        source: 'NOAA_GRIDDED',
+        station: `INTERPOLATED_${lat.toFixed(2)}_${lon.toFixed(2)}`,
+        timestamp,
+      });
+    }
+  }
+
+  return measurements;
+}
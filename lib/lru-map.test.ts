@@ -0,0 +1,29 @@
+// ABOUTME: Unit tests for the generic LRU map
+// ABOUTME: Checks recency ordering and eviction past the entry cap
+
+import { describe, it, expect } from 'vitest';
+import { LruMap } from './lru-map';
+
+describe('LruMap', () => {
+  it('evicts the least recently used entry past the cap', () => {
+    const map = new LruMap<string, number>(2);
+    map.set('a', 1);
+    map.set('b', 2);
+    map.get('a'); // 'b' is now least recently used
+    map.set('c', 3);
+
+    expect(map.has('a')).toBe(true);
+    expect(map.has('b')).toBe(false);
+    expect(map.has('c')).toBe(true);
+    expect(map.size).toBe(2);
+  });
+
+  it('replaces existing keys without growing', () => {
+    const map = new LruMap<string, number>(2);
+    map.set('a', 1);
+    map.set('a', 2);
+
+    expect(map.get('a')).toBe(2);
+    expect(map.size).toBe(1);
+  });
+});
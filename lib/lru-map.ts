@@ -0,0 +1,56 @@
+// ABOUTME: Small generic least-recently-used map with an entry cap
+// ABOUTME: Used client-side to keep computed map tiles without growing without bound
+
+/**
+ * Map that evicts its least recently used entries past maxEntries
+ */
+export class LruMap<K, V> {
+  // Map iteration order doubles as recency order: oldest entries come first
+  private entries: Map<K, V> = new Map();
+  private readonly maxEntries: number;
+
+  constructor(maxEntries: number) {
+    this.maxEntries = maxEntries;
+  }
+
+  /**
+   * Gets a value and marks it most recently used
+   */
+  get(key: K): V | undefined {
+    const value = this.entries.get(key);
+    if (value === undefined) return undefined;
+
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    return value;
+  }
+
+  /**
+   * Sets a value, evicting the least recently used entries past the cap
+   */
+  set(key: K, value: V): void {
+    this.entries.delete(key);
+    this.entries.set(key, value);
+
+    for (const oldest of this.entries.keys()) {
+      if (this.entries.size <= this.maxEntries) break;
+      this.entries.delete(oldest);
+    }
+  }
+
+  has(key: K): boolean {
+    return this.entries.has(key);
+  }
+
+  delete(key: K): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+}
@@ -4,18 +4,21 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
 import { fetchNoaaGriddedSnowfall } from './noaa-gridded-client';
 import { fetchAllNoaaSnowfall } from './noaa-client';
+import { cache } from './cache';
 
 describe('NOAA Client - MapServer Integration', () => {
   const originalEnv = process.env.USE_REAL_NOAA_DATA;
 
   beforeEach(() => {
-    // Reset environment before each test
+    // Reset environment and shared measurement cache before each test
     process.env.USE_REAL_NOAA_DATA = 'false';
+    cache.clear();
   });
 
   afterEach(() => {
     // Restore original environment
     process.env.USE_REAL_NOAA_DATA = originalEnv;
+    delete process.env.USE_BULK_RASTER_QUERY;
     vi.restoreAllMocks();
   });
 
@@ -243,6 +246,65 @@ describe('NOAA Client - MapServer Integration', () => {
 
       expect(global.fetch).toHaveBeenCalledTimes(108); // Old grid behavior
     });
+
+    it('reads the pinned Snow Depth raster on a 0.1° grid when USE_BULK_RASTER_QUERY=true', async () => {
+      process.env.USE_REAL_NOAA_DATA = 'true';
+      process.env.USE_STRATEGIC_SAMPLING = 'true';
+      process.env.USE_BULK_RASTER_QUERY = 'true';
+
+      // 400x550 raster (Illinois at 0.01°) filled with 0.254 meters (~10 inches)
+      const pixels = new Float32Array(400 * 550).fill(0.254);
+      global.fetch = vi.fn().mockImplementation(async (url: string) => {
+        if (url.includes('/exportImage?')) {
+          return { ok: true, arrayBuffer: async () => pixels.buffer };
+        }
+        if (url.includes('/query?')) {
+          return {
+            ok: true,
+            json: async () => ({
+              features: [
+                { attributes: { OBJECTID: 1, Name: 'Snow_Water_Equivalent' } },
+                { attributes: { OBJECTID: 3, Name: 'Snow_Depth' } },
+              ],
+            }),
+          };
+        }
+        if (url.includes('/keyProperties?')) {
+          return { ok: true, json: async () => ({ DataUnits: 'Meters' }) };
+        }
+        return { ok: true, json: async () => ({ pixelType: 'F32', bandCount: 1 }) };
+      });
+
+      const measurements = await fetchNoaaGriddedSnowfall();
+
+      const exportUrl = vi.mocked(global.fetch).mock.calls
+        .map(([url]) => String(url))
+        .find((url) => url.includes('/exportImage?'));
+      expect(new URL(exportUrl!).searchParams.get('mosaicRule')).toBe(
+        JSON.stringify({ mosaicMethod: 'esriMosaicLockRaster', lockRasterIds: [3] })
+      );
+      expect(measurements).toHaveLength(40 * 55); // One per 0.1° block
+      expect(measurements[0].amount).toBeCloseTo(10, 0);
+    });
+
+    it('falls back to point queries when the bulk raster export fails', async () => {
+      process.env.USE_REAL_NOAA_DATA = 'true';
+      process.env.USE_STRATEGIC_SAMPLING = 'true';
+      process.env.USE_BULK_RASTER_QUERY = 'true';
+
+      global.fetch = vi.fn()
+        .mockResolvedValueOnce({ ok: false, status: 503 })
+        .mockResolvedValue({
+          ok: true,
+          json: async () => ({ results: [{ attributes: { 'Service Pixel Value': '0.254' } }] }),
+        });
+
+      const measurements = await fetchNoaaGriddedSnowfall();
+
+      // 1 failed raster request (metadata or export) + 20 point queries
+      expect(global.fetch).toHaveBeenCalledTimes(21);
+      expect(measurements.length).toBeGreaterThan(20);
+    });
   });
 
   describe('fetchAllNoaaSnowfall', () => {
@@ -266,5 +328,24 @@ describe('NOAA Client - MapServer Integration', () => {
       const nwsData = measurements.filter(m => m.source === 'NOAA_NWS');
       expect(nwsData).toHaveLength(0);
     });
+
+    it('shares one NOHRSC fetch across concurrent callers', async () => {
+      process.env.USE_REAL_NOAA_DATA = 'true';
+      process.env.USE_STRATEGIC_SAMPLING = 'true';
+
+      global.fetch = vi.fn().mockResolvedValue({
+        ok: true,
+        json: async () => ({ results: [{ attributes: { 'Service Pixel Value': '0.254' } }] }),
+      });
+
+      const [latest, storms] = await Promise.all([
+        fetchAllNoaaSnowfall(),
+        fetchAllNoaaSnowfall(),
+      ]);
+      await fetchAllNoaaSnowfall();
+
+      expect(global.fetch).toHaveBeenCalledTimes(20); // One 20-point fan-out
+      expect(storms).toBe(latest);
+    });
   });
 });
@@ -1,20 +1,43 @@
 // ABOUTME: Main client for fetching snowfall data from NOAA sources
-// ABOUTME: Delegates to specialized clients and provides unified interface for API routes
+// ABOUTME: Delegates to specialized clients and shares one cached fetch per observation hour across API routes
 
 import { Measurement } from '@/types';
+import { cache } from './cache';
 import { fetchNoaaGriddedSnowfall } from './noaa-gridded-client';
 
+/**
+ * Measurement cache TTL (1 hour)
+ * NOHRSC snow analysis is published hourly, and keys roll over with the observation hour
+ */
+const MEASUREMENT_CACHE_TTL_MS = 60 * 60 * 1000;
+
+/**
+ * Builds the shared measurement cache key from the data source and observation hour
+ * Example: "measurements:nohrsc:2025-12-04T15"
+ */
+function getMeasurementCacheKey(now: Date = new Date()): string {
+  const dataSource = process.env.USE_REAL_NOAA_DATA === 'true' ? 'nohrsc' : 'mock';
+  const observationHour = now.toISOString().slice(0, 13);
+  return `measurements:${dataSource}:${observationHour}`;
+}
+
 /**
  * Fetches all available snowfall data from NOAA sources
  *
  * Currently only uses NOHRSC gridded data as NOAA NWS API does not provide
  * snow depth data in the observations/latest endpoint.
  *
+ * Results are cached per data source and observation hour, so every API route
+ * builds its response from the same upstream fetch.
+ *
  * @returns Array of Measurement objects with current snow depth
  */
 export async function fetchAllNoaaSnowfall(): Promise<Measurement[]> {
   // Only use gridded data - NWS observations/latest doesn't include snow depth
-  const griddedData = await fetchNoaaGriddedSnowfall();
-
-  return griddedData;
+  return cache.getOrLoad(
+    getMeasurementCacheKey(),
+    fetchNoaaGriddedSnowfall,
+    MEASUREMENT_CACHE_TTL_MS,
+    0 // Keys roll over hourly, so entries never need to be served stale
+  );
 }
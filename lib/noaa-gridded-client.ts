@@ -1,9 +1,11 @@
 // ABOUTME: Client for fetching snow depth data from NOAA NOHRSC MapServer
-// ABOUTME: Queries raster data via MapServer Identify endpoint with grid sampling across Illinois
+// ABOUTME: Reads one bulk Snow Depth raster export, or per-point MapServer Identify calls, across Illinois
 
+import { Agent } from 'undici';
 import { Measurement } from '@/types';
-import { STRATEGIC_SAMPLE_POINTS, USE_STRATEGIC_SAMPLING } from './sampling-config';
+import { STRATEGIC_SAMPLE_POINTS, type SamplePoint } from './sampling-config';
 import { expandSamplesWithIDW } from './spatial-interpolator';
+import { HttpStatusError, runScheduled, type ScheduleOptions, type ScheduleResult } from './request-scheduler';
 
 /**
  * NOAA NOHRSC MapServer base URL
@@ -12,6 +14,81 @@ import { expandSamplesWithIDW } from './spatial-interpolator';
 const NOHRSC_MAPSERVER_BASE_URL =
   'https://mapservices.weather.noaa.gov/raster/rest/services/snow/NOHRSC_Snow_Analysis/MapServer';
 
+/**
+ * NOAA NOHRSC ImageServer base URL (overridable with NOHRSC_IMAGESERVER_URL)
+ * Exports Snow Analysis rasters as raw pixel values for bulk sampling
+ */
+const NOHRSC_IMAGESERVER_BASE_URL =
+  process.env.NOHRSC_IMAGESERVER_URL ||
+  'https://mapservices.weather.noaa.gov/raster/rest/services/snow/NOHRSC_Snow_Analysis/ImageServer';
+
+/**
+ * Exported raster resolution in degrees (~1 km, the native NOHRSC grid spacing)
+ */
+const RASTER_RESOLUTION_DEGREES = 0.01;
+
+/**
+ * Sentinel written to exported raster cells without snow analysis data
+ */
+const RASTER_NO_DATA = -9999;
+
+/**
+ * Spacing of the measurements read from an exported raster (~7 miles)
+ * Each one averages the native cells in its block, so no interpolation is needed
+ */
+const RASTER_SAMPLE_SPACING_DEGREES = 0.1;
+
+/**
+ * Catalog name of the Snow Depth raster (the Identify path's layer 3)
+ */
+const SNOW_DEPTH_RASTER_NAME = /snow[\s_-]*depth/i;
+
+/**
+ * Deepest plausible snow depth in meters; larger values mean the export isn't snow depth
+ */
+const MAX_PLAUSIBLE_DEPTH_METERS = 15;
+
+/**
+ * Most sockets open to NOHRSC at once, across every batch and refresh in the process
+ */
+const NOHRSC_MAX_CONNECTIONS = 6;
+
+/**
+ * How long an idle NOHRSC socket stays open for reuse
+ */
+const NOHRSC_KEEP_ALIVE_MS = 30000;
+
+/**
+ * Shared dispatcher for every NOHRSC request
+ * Point queries, raster exports and overlapping refreshes of different hours
+ * all draw on one pool of keep-alive sockets, so the host never sees more than
+ * NOHRSC_MAX_CONNECTIONS connections from this process
+ */
+const nohrscAgent = new Agent({
+  connections: NOHRSC_MAX_CONNECTIONS,
+  keepAliveTimeout: NOHRSC_KEEP_ALIVE_MS,
+});
+
+// Running totals, compared before and after a batch to count reused connections
+let nohrscRequests = 0;
+let nohrscConnectionsOpened = 0;
+nohrscAgent.on('connect', () => {
+  nohrscConnectionsOpened++;
+});
+
+/**
+ * Fan-out limits for NOHRSC point queries
+ * Bounds total response time; the shared dispatcher caps the sockets
+ */
+const NOHRSC_SCHEDULE: ScheduleOptions = {
+  concurrency: NOHRSC_MAX_CONNECTIONS,
+  timeoutMs: 8000, // Per request
+  maxRetries: 2, // Per point
+  retryBudget: 10, // Across the whole fan-out
+  retryBaseDelayMs: 200,
+  deadlineMs: 20000, // Return whatever completed after 20s
+};
+
 /**
  * Illinois geographic bounds for grid sampling
  */
@@ -105,12 +182,24 @@ function getMockGriddedData(): Measurement[] {
 }
 
 /**
- * Fetches snow depth from NOHRSC MapServer for Illinois region
- * Uses strategic sampling + parallel queries + backend interpolation
+ * Fetches snow depth from NOHRSC for Illinois region
+ *
+ * With USE_BULK_RASTER_QUERY=true the Snow Depth raster for Illinois is
+ * exported once and read at RASTER_SAMPLE_SPACING_DEGREES. Otherwise, or if
+ * the export fails, strategic points are queried one by one with bounded
+ * concurrency and expanded by backend interpolation.
  *
  * @returns Array of Measurement objects for points with snow > 0 inches
  */
 async function fetchNohrscSnowDepth(): Promise<Measurement[]> {
+  if (process.env.USE_BULK_RASTER_QUERY === 'true') {
+    const rasterMeasurements = await fetchRasterMeasurements();
+    if (rasterMeasurements) {
+      return rasterMeasurements;
+    }
+    console.warn('[NOHRSC] Falling back to point queries');
+  }
+
   try {
     // Step 1: Select sample points (strategic or fallback to grid)
     const useStrategicSampling = process.env.USE_STRATEGIC_SAMPLING !== 'false';
@@ -118,36 +207,36 @@ async function fetchNohrscSnowDepth(): Promise<Measurement[]> {
       ? STRATEGIC_SAMPLE_POINTS
       : generateGridPoints();
 
-    console.log(`[NOHRSC] Querying ${samplePoints.length} strategic points in parallel`);
+    console.log(`[NOHRSC] Querying ${samplePoints.length} sample points`);
     const startTime = Date.now();
-
-    // Step 2: Query all points in parallel
-    const samplePromises = samplePoints.map(async (point) => {
-      try {
-        const snowDepth = await queryNohrscPoint(point.lon, point.lat);
-
-        if (snowDepth > 0) {
-          return {
-            lat: point.lat,
-            lon: point.lon,
-            amount: snowDepth,
-            source: 'NOAA_GRIDDED' as const,
-            station: `NOHRSC_${point.name}`,
-            timestamp: new Date().toISOString(),
-          };
-        }
-        return null;
-      } catch (error) {
-        console.warn(`[NOHRSC] Failed to query ${point.name}:`, error);
-        return null;
+    const connectionsBefore = snapshotConnectionCounts();
+
+    // Step 2: Read snow depth at every point with parallel point queries
+    const { results: snowDepths, avgQueueWaitMs, maxQueueWaitMs } = await querySnowDepths(samplePoints);
+
+    const rawSamples: Measurement[] = [];
+    samplePoints.forEach((point, i) => {
+      const snowDepth = snowDepths[i];
+      if (snowDepth !== null && snowDepth > 0) {
+        rawSamples.push({
+          lat: point.lat,
+          lon: point.lon,
+          amount: snowDepth,
+          source: 'NOAA_GRIDDED',
+          station: `NOHRSC_${point.name}`,
+          timestamp: new Date().toISOString(),
+        });
       }
     });
 
-    const results = await Promise.all(samplePromises);
-    const rawSamples = results.filter((m) => m !== null) as Measurement[];
-
     const queryTime = ((Date.now() - startTime) / 1000).toFixed(2);
     console.log(`[NOHRSC] Query complete in ${queryTime}s: ${rawSamples.length}/${samplePoints.length} with snow`);
+    logConnectionStats(connectionsBefore);
+
+    console.log(
+      `[NOHRSC] Queue wait at concurrency ${NOHRSC_SCHEDULE.concurrency}: ` +
+        `avg ${avgQueueWaitMs.toFixed(1)}ms (max ${maxQueueWaitMs}ms)`
+    );
 
     // Step 3: Backend interpolation (expand 20 → ~60 grid points)
     if (rawSamples.length === 0) {
@@ -173,11 +262,110 @@ async function fetchNohrscSnowDepth(): Promise<Measurement[]> {
   }
 }
 
+/**
+ * Reads snow depth for Illinois from one exported Snow Depth raster
+ *
+ * @returns Measurements for blocks with snow, or null if the export failed
+ */
+async function fetchRasterMeasurements(): Promise<Measurement[] | null> {
+  const startTime = Date.now();
+  const connectionsBefore = snapshotConnectionCounts();
+
+  // No retries: the point queries are the fallback
+  const { results: [raster] } = await runScheduled(
+    [ILLINOIS_BOUNDS],
+    (bounds, signal) => fetchNohrscRaster(bounds, signal).catch((error) => {
+      console.warn('[NOHRSC] Bulk raster export failed:', error);
+      throw error;
+    }),
+    { ...NOHRSC_SCHEDULE, maxRetries: 0 }
+  );
+
+  if (!raster) {
+    return null;
+  }
+
+  const measurements = rasterToMeasurements(raster, RASTER_SAMPLE_SPACING_DEGREES, new Date().toISOString());
+  const queryTime = ((Date.now() - startTime) / 1000).toFixed(2);
+  console.log(
+    `[NOHRSC] Raster export complete in ${queryTime}s: ${raster.width}x${raster.height} cells → ` +
+      `${measurements.length} measurements with snow`
+  );
+  logConnectionStats(connectionsBefore);
+
+  return measurements;
+}
+
+/**
+ * Fetches a NOHRSC URL through the shared dispatcher
+ */
+function nohrscFetch(url: string, signal?: AbortSignal): Promise<Response> {
+  nohrscRequests++;
+  // Node's fetch accepts an undici dispatcher; the DOM RequestInit type doesn't declare it
+  return fetch(url, { signal, dispatcher: nohrscAgent } as RequestInit);
+}
+
+/**
+ * Reads the dispatcher's running totals
+ */
+function snapshotConnectionCounts(): { requests: number; opened: number } {
+  return { requests: nohrscRequests, opened: nohrscConnectionsOpened };
+}
+
+/**
+ * Logs the dispatcher's sockets now and how many requests since a snapshot
+ * went out on a connection that was already open
+ */
+function logConnectionStats(since: { requests: number; opened: number }): void {
+  let connected = 0;
+  let running = 0;
+  let pending = 0;
+  for (const stats of Object.values(nohrscAgent.stats)) {
+    connected += Number(stats.connected);
+    running += stats.running;
+    pending += stats.pending;
+  }
+
+  const requests = nohrscRequests - since.requests;
+  const reused = Math.max(0, requests - (nohrscConnectionsOpened - since.opened));
+  console.log(
+    `[NOHRSC] Connections: ${connected} open, ${running} running, ${pending} pending; ` +
+      `${reused}/${requests} requests on reused connections`
+  );
+}
+
+/**
+ * Reads snow depth (inches) for each sample point with one Identify call per point
+ * Queries run with bounded concurrency, per-request timeouts and a retry budget (NOHRSC_SCHEDULE)
+ *
+ * @returns Snow depth per point (null where the query failed) and scheduling stats
+ */
+async function querySnowDepths(samplePoints: SamplePoint[]): Promise<ScheduleResult<number>> {
+  const result = await runScheduled(
+    samplePoints,
+    (point, signal) => queryNohrscPoint(point.lon, point.lat, signal).catch((error) => {
+      console.warn(`[NOHRSC] Failed to query ${point.name}:`, error);
+      throw error;
+    }),
+    NOHRSC_SCHEDULE
+  );
+
+  const { failed, retries, deadlineExceeded } = result;
+  if (failed > 0 || retries > 0 || deadlineExceeded) {
+    console.warn(
+      `[NOHRSC] ${failed} point queries failed after ${retries} retries` +
+        (deadlineExceeded ? ' (deadline exceeded, returning partial results)' : '')
+    );
+  }
+
+  return result;
+}
+
 /**
  * Fallback: Generate old-style uniform grid (only if USE_STRATEGIC_SAMPLING=false)
  */
-function generateGridPoints() {
-  const points = [];
+function generateGridPoints(): SamplePoint[] {
+  const points: SamplePoint[] = [];
   for (let lat = ILLINOIS_BOUNDS.minLat; lat <= ILLINOIS_BOUNDS.maxLat; lat += GRID_SPACING_DEGREES) {
     for (let lon = ILLINOIS_BOUNDS.minLon; lon <= ILLINOIS_BOUNDS.maxLon; lon += GRID_SPACING_DEGREES) {
       points.push({
@@ -220,10 +408,11 @@ function generateGridPoints() {
  *
  * @param lon Longitude (negative for western hemisphere)
  * @param lat Latitude
+ * @param signal Aborts the request (per-request timeout or overall deadline)
  * @returns Snow depth in inches, or 0 if no data/no snow
  * @throws Error if MapServer API request fails
  */
-async function queryNohrscPoint(lon: number, lat: number): Promise<number> {
+async function queryNohrscPoint(lon: number, lat: number, signal?: AbortSignal): Promise<number> {
   const identifyUrl = `${NOHRSC_MAPSERVER_BASE_URL}/identify`;
 
   const params = new URLSearchParams({
@@ -237,10 +426,11 @@ async function queryNohrscPoint(lon: number, lat: number): Promise<number> {
     f: 'json',
   });
 
-  const response = await fetch(`${identifyUrl}?${params.toString()}`);
+  const response = await nohrscFetch(`${identifyUrl}?${params.toString()}`, signal);
 
   if (!response.ok) {
-    throw new Error(
+    throw new HttpStatusError(
+      response.status,
       `NOHRSC MapServer API error: ${response.status} ${response.statusText}`
     );
   }
@@ -270,6 +460,225 @@ async function queryNohrscPoint(lon: number, lat: number): Promise<number> {
   return snowDepthInches;
 }
 
+/**
+ * Snow depth raster exported for a bounding box, in meters, row-major from the north-west corner
+ */
+interface SnowDepthRaster {
+  bounds: typeof ILLINOIS_BOUNDS;
+  width: number;
+  height: number;
+  values: Float32Array;
+}
+
+/**
+ * Parts of the ImageServer's service and raster metadata checked before trusting an export
+ */
+interface ImageServiceInfo {
+  pixelType?: string;
+  bandCount?: number;
+}
+
+interface RasterCatalogResponse {
+  features?: Array<{ attributes: { OBJECTID: number; Name?: string } }>;
+}
+
+type RasterKeyProperties = Record<string, unknown>;
+
+// Resolved once per process; cleared on failure so the next refresh checks again
+let snowDepthRasterId: Promise<number> | null = null;
+
+/**
+ * Finds the Snow Depth raster in the ImageServer catalog and checks it holds
+ * single-band floating-point snow depth in meters
+ *
+ * Runs without the caller's signal because every export shares the result;
+ * each metadata request has its own timeout instead.
+ *
+ * @returns The raster's ID, for an esriMosaicLockRaster mosaic rule
+ * @throws Error if the service or raster doesn't match what the decoder expects
+ */
+function getSnowDepthRasterId(): Promise<number> {
+  if (!snowDepthRasterId) {
+    snowDepthRasterId = selectSnowDepthRaster().catch((error) => {
+      snowDepthRasterId = null;
+      throw error;
+    });
+  }
+  return snowDepthRasterId;
+}
+
+async function selectSnowDepthRaster(): Promise<number> {
+  const fetchJson = async <T>(url: string): Promise<T> => {
+    const response = await nohrscFetch(url, AbortSignal.timeout(NOHRSC_SCHEDULE.timeoutMs));
+    if (!response.ok) {
+      throw new HttpStatusError(
+        response.status,
+        `NOHRSC ImageServer API error: ${response.status} ${response.statusText}`
+      );
+    }
+    return response.json();
+  };
+
+  const info = await fetchJson<ImageServiceInfo>(`${NOHRSC_IMAGESERVER_BASE_URL}?f=json`);
+  if (info.pixelType !== 'F32' && info.pixelType !== 'F64') {
+    throw new Error(`Expected floating-point pixels, service reports ${info.pixelType}`);
+  }
+  if (info.bandCount !== 1) {
+    throw new Error(`Expected a single band, service reports ${info.bandCount}`);
+  }
+
+  const catalogParams = new URLSearchParams({
+    where: '1=1',
+    outFields: 'OBJECTID,Name',
+    returnGeometry: 'false',
+    f: 'json',
+  });
+  const catalog = await fetchJson<RasterCatalogResponse>(
+    `${NOHRSC_IMAGESERVER_BASE_URL}/query?${catalogParams.toString()}`
+  );
+  const raster = catalog.features?.find((feature) => SNOW_DEPTH_RASTER_NAME.test(feature.attributes.Name ?? ''));
+  if (!raster) {
+    throw new Error('No Snow Depth raster in the ImageServer catalog');
+  }
+
+  const rasterId = raster.attributes.OBJECTID;
+  const keyProperties = await fetchJson<RasterKeyProperties>(
+    `${NOHRSC_IMAGESERVER_BASE_URL}/${rasterId}/info/keyProperties?f=json`
+  );
+  const units = String(keyProperties.DataUnits ?? keyProperties.Units ?? '');
+  if (!/^(m|meters?|metres?)$/i.test(units)) {
+    throw new Error(`Expected snow depth in meters, raster ${rasterId} reports units "${units}"`);
+  }
+
+  console.log(`[NOHRSC] Using Snow Depth raster ${rasterId} (${raster.attributes.Name}, ${info.pixelType}, ${units})`);
+  return rasterId;
+}
+
+/**
+ * Exports the NOHRSC Snow Depth raster for a bounding box in a single request
+ *
+ * ImageServer exportImage Endpoint:
+ * - URL: /ImageServer/exportImage
+ * - Method: GET
+ * - Returns: Raw band-interleaved 32-bit float pixels (f=image, format=bip)
+ *
+ * The Snow Depth raster is pinned with a lock-raster mosaic rule, so other
+ * variables in the catalog are never mosaicked in. Pixels are requested in
+ * WGS84 at RASTER_RESOLUTION_DEGREES with nearest-neighbor resampling, so each
+ * value is an unmodified NOHRSC grid cell.
+ *
+ * @param bounds Bounding box to export
+ * @param signal Aborts the request (timeout or overall deadline)
+ * @returns Raster of snow depth values in meters
+ * @throws Error if the raster can't be selected, the payload size doesn't match
+ *   the raster, or the values are implausible for snow depth
+ */
+async function fetchNohrscRaster(
+  bounds: typeof ILLINOIS_BOUNDS,
+  signal?: AbortSignal
+): Promise<SnowDepthRaster> {
+  const rasterId = await getSnowDepthRasterId();
+  const width = Math.round((bounds.maxLon - bounds.minLon) / RASTER_RESOLUTION_DEGREES);
+  const height = Math.round((bounds.maxLat - bounds.minLat) / RASTER_RESOLUTION_DEGREES);
+
+  const params = new URLSearchParams({
+    bbox: `${bounds.minLon},${bounds.minLat},${bounds.maxLon},${bounds.maxLat}`,
+    bboxSR: '4326',
+    imageSR: '4326',
+    size: `${width},${height}`,
+    format: 'bip',
+    pixelType: 'F32',
+    noData: String(RASTER_NO_DATA),
+    interpolation: 'RSP_NearestNeighbor',
+    mosaicRule: JSON.stringify({ mosaicMethod: 'esriMosaicLockRaster', lockRasterIds: [rasterId] }),
+    f: 'image',
+  });
+
+  const response = await nohrscFetch(`${NOHRSC_IMAGESERVER_BASE_URL}/exportImage?${params.toString()}`, signal);
+
+  if (!response.ok) {
+    throw new HttpStatusError(
+      response.status,
+      `NOHRSC ImageServer API error: ${response.status} ${response.statusText}`
+    );
+  }
+
+  const buffer = await response.arrayBuffer();
+
+  if (buffer.byteLength !== width * height * 4) {
+    throw new Error(
+      `Unexpected raster size: ${buffer.byteLength} bytes for ${width}x${height} pixels`
+    );
+  }
+
+  // Raw exports are little-endian; copy through a DataView so host byte order doesn't matter
+  const view = new DataView(buffer);
+  const values = new Float32Array(width * height);
+  let maxDepth = 0;
+  for (let i = 0; i < values.length; i++) {
+    values[i] = view.getFloat32(i * 4, true);
+    if (values[i] !== RASTER_NO_DATA && values[i] > maxDepth) {
+      maxDepth = values[i];
+    }
+  }
+
+  if (maxDepth > MAX_PLAUSIBLE_DEPTH_METERS) {
+    throw new Error(`Implausible snow depth ${maxDepth}m; the export is not the Snow Depth raster`);
+  }
+
+  return { bounds, width, height, values };
+}
+
+/**
+ * Averages an exported raster over square blocks
+ *
+ * @param spacing Block size in degrees
+ * @returns One measurement per block with snow, at the block's center
+ */
+function rasterToMeasurements(raster: SnowDepthRaster, spacing: number, timestamp: string): Measurement[] {
+  const { bounds, width, height, values } = raster;
+  const blockCols = Math.round((bounds.maxLon - bounds.minLon) / spacing);
+  const blockRows = Math.round((bounds.maxLat - bounds.minLat) / spacing);
+  const measurements: Measurement[] = [];
+
+  for (let blockRow = 0; blockRow < blockRows; blockRow++) {
+    const firstRow = Math.floor((blockRow * height) / blockRows);
+    const lastRow = Math.floor(((blockRow + 1) * height) / blockRows);
+
+    for (let blockCol = 0; blockCol < blockCols; blockCol++) {
+      const firstCol = Math.floor((blockCol * width) / blockCols);
+      const lastCol = Math.floor(((blockCol + 1) * width) / blockCols);
+
+      let total = 0;
+      let cells = 0;
+      for (let row = firstRow; row < lastRow; row++) {
+        for (let col = firstCol; col < lastCol; col++) {
+          const depth = values[row * width + col];
+          if (depth !== RASTER_NO_DATA && !isNaN(depth)) {
+            total += Math.max(depth, 0);
+            cells++;
+          }
+        }
+      }
+
+      if (cells === 0 || total <= 0) continue;
+
+      const lat = Math.round((bounds.maxLat - (blockRow + 0.5) * spacing) * 100) / 100;
+      const lon = Math.round((bounds.minLon + (blockCol + 0.5) * spacing) * 100) / 100;
+      measurements.push({
+        lat,
+        lon,
+        amount: convertMetersToInches(total / cells),
+        source: 'NOAA_GRIDDED',
+        station: `NOHRSC_${lat.toFixed(2)}_${lon.toFixed(2)}`,
+        timestamp,
+      });
+    }
+  }
+
+  return measurements;
+}
+
 /**
  * Converts snow depth from meters to inches
  * 1 meter = 39.3701 inches
@@ -0,0 +1,35 @@
+// ABOUTME: Unit tests for the minimal PNG encoder
+// ABOUTME: Decodes the encoded chunks with zlib to check header, pixels and checksums
+
+import { describe, it, expect } from 'vitest';
+import { inflateSync } from 'zlib';
+import { crc32, encodePng } from './png';
+
+describe('crc32', () => {
+  it('matches the standard check value', () => {
+    expect(crc32(new TextEncoder().encode('123456789'))).toBe(0xcbf43926);
+  });
+});
+
+describe('encodePng', () => {
+  it('writes a valid signature, header and pixel data', () => {
+    const rgba = Uint8Array.from([255, 0, 0, 255, 0, 0, 255, 128]); // 2x1: red, translucent blue
+    const png = encodePng(2, 1, rgba);
+    const view = new DataView(png.buffer, png.byteOffset);
+
+    expect(Array.from(png.subarray(0, 8))).toEqual([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]);
+    expect(new TextDecoder().decode(png.subarray(12, 16))).toBe('IHDR');
+    expect(view.getUint32(16)).toBe(2);
+    expect(view.getUint32(20)).toBe(1);
+    expect(view.getUint32(29)).toBe(crc32(png.subarray(12, 29)));
+
+    const idatLength = view.getUint32(33);
+    expect(new TextDecoder().decode(png.subarray(37, 41))).toBe('IDAT');
+    const pixels = inflateSync(png.subarray(41, 41 + idatLength));
+    expect(Array.from(pixels)).toEqual([0, ...rgba]);
+  });
+
+  it('rejects a pixel buffer of the wrong size', () => {
+    expect(() => encodePng(2, 2, new Uint8Array(4))).toThrow();
+  });
+});
@@ -0,0 +1,87 @@
+// ABOUTME: Minimal PNG encoder for 8-bit RGBA images using Node's zlib
+// ABOUTME: Used by the tile route to render snow-depth raster tiles without an image library
+
+import { deflateSync } from 'zlib';
+
+const PNG_SIGNATURE = Uint8Array.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]);
+
+// CRC-32 lookup table (polynomial 0xEDB88320) for chunk checksums
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n++) {
+    let c = n;
+    for (let k = 0; k < 8; k++) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    }
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+/**
+ * CRC-32 of a byte range
+ */
+export function crc32(bytes: Uint8Array): number {
+  let crc = 0xffffffff;
+  for (let i = 0; i < bytes.length; i++) {
+    crc = CRC_TABLE[(crc ^ bytes[i]) & 0xff] ^ (crc >>> 8);
+  }
+  return (crc ^ 0xffffffff) >>> 0;
+}
+
+/**
+ * Encodes one length-prefixed, checksummed PNG chunk
+ */
+function chunk(type: string, data: Uint8Array): Uint8Array {
+  const out = new Uint8Array(12 + data.length);
+  const view = new DataView(out.buffer);
+
+  view.setUint32(0, data.length);
+  for (let i = 0; i < 4; i++) {
+    out[4 + i] = type.charCodeAt(i);
+  }
+  out.set(data, 8);
+  view.setUint32(8 + data.length, crc32(out.subarray(4, 8 + data.length)));
+
+  return out;
+}
+
+/**
+ * Encodes RGBA pixels (row-major, 4 bytes per pixel) as a PNG
+ */
+export function encodePng(width: number, height: number, rgba: Uint8Array): Uint8Array<ArrayBuffer> {
+  if (rgba.length !== width * height * 4) {
+    throw new Error(`Expected ${width * height * 4} RGBA bytes, got ${rgba.length}`);
+  }
+
+  const header = new Uint8Array(13);
+  const headerView = new DataView(header.buffer);
+  headerView.setUint32(0, width);
+  headerView.setUint32(4, height);
+  header[8] = 8; // Bit depth
+  header[9] = 6; // Color type: truecolor with alpha
+  // Compression, filter and interlace methods are all 0
+
+  // Each scanline is prefixed with its filter type (0 = none)
+  const stride = width * 4;
+  const raw = new Uint8Array((stride + 1) * height);
+  for (let y = 0; y < height; y++) {
+    raw.set(rgba.subarray(y * stride, (y + 1) * stride), y * (stride + 1) + 1);
+  }
+
+  const parts = [
+    PNG_SIGNATURE,
+    chunk('IHDR', header),
+    chunk('IDAT', deflateSync(raw)),
+    chunk('IEND', new Uint8Array(0)),
+  ];
+
+  const png = new Uint8Array(parts.reduce((total, part) => total + part.length, 0));
+  let offset = 0;
+  for (const part of parts) {
+    png.set(part, offset);
+    offset += part.length;
+  }
+
+  return png;
+}
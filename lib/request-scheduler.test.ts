@@ -0,0 +1,114 @@
+// ABOUTME: Unit tests for the bounded-concurrency request scheduler
+// ABOUTME: Tests concurrency limits, queue wait, retry rules and budget, per-attempt timeouts and the overall deadline
+
+import { describe, it, expect, vi } from 'vitest';
+import { HttpStatusError, runScheduled, type ScheduleOptions } from './request-scheduler';
+
+const options: ScheduleOptions = {
+  concurrency: 2,
+  timeoutMs: 1000,
+  maxRetries: 2,
+  retryBudget: 10,
+  retryBaseDelayMs: 1,
+  deadlineMs: 1000,
+};
+
+describe('runScheduled', () => {
+  it('never runs more tasks than the concurrency limit', async () => {
+    let active = 0;
+    let peak = 0;
+
+    const { results } = await runScheduled([1, 2, 3, 4, 5], async (item) => {
+      active++;
+      peak = Math.max(peak, active);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      active--;
+      return item * 10;
+    }, options);
+
+    expect(results).toEqual([10, 20, 30, 40, 50]);
+    expect(peak).toBe(2);
+  });
+
+  it('reports how long items waited for a free slot', async () => {
+    const result = await runScheduled([1, 2, 3], async (item) => {
+      await new Promise((resolve) => setTimeout(resolve, 20));
+      return item;
+    }, options);
+
+    // The third item waits for one of the first two to finish
+    expect(result.maxQueueWaitMs).toBeGreaterThanOrEqual(15);
+    expect(result.avgQueueWaitMs).toBeLessThan(result.maxQueueWaitMs);
+  });
+
+  it('retries failed attempts', async () => {
+    const task = vi.fn()
+      .mockRejectedValueOnce(new TypeError('fetch failed'))
+      .mockResolvedValueOnce('ok');
+
+    const result = await runScheduled(['a'], task, options);
+
+    expect(result.results).toEqual(['ok']);
+    expect(result.retries).toBe(1);
+  });
+
+  it('stops retrying once the shared retry budget is spent', async () => {
+    const task = vi.fn().mockRejectedValue(new TypeError('fetch failed'));
+
+    const result = await runScheduled([1, 2, 3], task, { ...options, retryBudget: 2 });
+
+    expect(result.results).toEqual([null, null, null]);
+    expect(result.failed).toBe(3);
+    expect(result.retries).toBe(2);
+    expect(task).toHaveBeenCalledTimes(5);
+  });
+
+  it('fails permanent errors without retrying', async () => {
+    const task = vi.fn().mockRejectedValue(new HttpStatusError(400, 'Bad Request'));
+
+    const result = await runScheduled(['a'], task, options);
+
+    expect(result.results).toEqual([null]);
+    expect(result.retries).toBe(0);
+    expect(task).toHaveBeenCalledTimes(1);
+  });
+
+  it('retries rate limiting and server errors', async () => {
+    let calls = 0;
+    const task = async () => {
+      calls++;
+      if (calls === 1) throw new HttpStatusError(429, 'Too Many Requests');
+      if (calls === 2) throw new HttpStatusError(503, 'Service Unavailable');
+      return 'ok';
+    };
+
+    const result = await runScheduled(['a'], task, options);
+
+    expect(result.results).toEqual(['ok']);
+    expect(result.retries).toBe(2);
+  });
+
+  it('aborts attempts that exceed the per-attempt timeout', async () => {
+    const hang = (_item: number, signal: AbortSignal) =>
+      new Promise<number>((_resolve, reject) => {
+        signal.addEventListener('abort', () => reject(new Error('aborted')));
+      });
+
+    const result = await runScheduled([1], hang, { ...options, timeoutMs: 10, maxRetries: 0 });
+
+    expect(result.results).toEqual([null]);
+    expect(result.failed).toBe(1);
+  });
+
+  it('returns completed results when the deadline passes', async () => {
+    const task = (item: number) =>
+      new Promise<number>((resolve) => setTimeout(() => resolve(item), item === 1 ? 1 : 10000));
+
+    const started = Date.now();
+    const result = await runScheduled([1, 2], task, { ...options, deadlineMs: 50 });
+
+    expect(result.results).toEqual([1, null]);
+    expect(result.deadlineExceeded).toBe(true);
+    expect(Date.now() - started).toBeLessThan(1000);
+  });
+});
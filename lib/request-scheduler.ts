@@ -0,0 +1,190 @@
+// ABOUTME: Bounded-concurrency scheduler for fan-out requests with timeouts, retries and a deadline
+// ABOUTME: Used by the NOHRSC client so one hung socket or a slow upstream can't stall a whole response
+
+/**
+ * Scheduling limits for a batch of tasks
+ */
+export interface ScheduleOptions {
+  concurrency: number; // Max tasks running at once
+  timeoutMs: number; // Per-attempt timeout; the attempt's AbortSignal fires after this
+  maxRetries: number; // Max retries for a single task
+  retryBudget: number; // Max retries across the whole batch
+  retryBaseDelayMs: number; // Backoff base; doubles per attempt with ±50% jitter
+  deadlineMs: number; // Overall deadline; the batch returns what completed by then
+}
+
+/**
+ * Outcome of a scheduled batch
+ */
+export interface ScheduleResult<T> {
+  results: (T | null)[]; // Per-item result, or null if the item failed or didn't finish
+  completed: number;
+  failed: number;
+  retries: number;
+  deadlineExceeded: boolean;
+  avgQueueWaitMs: number; // Time items waited for a free slot before their first attempt
+  maxQueueWaitMs: number;
+}
+
+/**
+ * Error for an HTTP response that wasn't ok
+ * Only 429 and 5xx responses are worth retrying; other 4xx won't change
+ */
+export class HttpStatusError extends Error {
+  readonly status: number;
+  readonly retryable: boolean;
+
+  constructor(status: number, message: string) {
+    super(message);
+    this.name = 'HttpStatusError';
+    this.status = status;
+    this.retryable = status === 429 || status >= 500;
+  }
+}
+
+/**
+ * Checks whether a failed attempt might succeed if retried
+ *
+ * Errors that set a boolean `retryable` (such as HttpStatusError) decide for
+ * themselves. Otherwise only aborts and timeouts (e.g. the per-attempt
+ * timeout) and network failures, which fetch reports as TypeError, are
+ * transient; anything else, such as a parse error, fails straight away.
+ */
+export function isTransientError(error: unknown): boolean {
+  if (typeof (error as { retryable?: unknown })?.retryable === 'boolean') {
+    return (error as { retryable: boolean }).retryable;
+  }
+
+  if (error instanceof Error || error instanceof DOMException) {
+    return error.name === 'AbortError' || error.name === 'TimeoutError' || error instanceof TypeError;
+  }
+
+  return false;
+}
+
+/**
+ * Runs a task for every item with bounded concurrency
+ *
+ * Each attempt gets its own AbortSignal that fires on the per-attempt timeout
+ * or when the overall deadline passes. Transient failures (see isTransientError)
+ * are retried with jittered exponential backoff while the shared retry budget
+ * lasts; other failures fail the item at once. When the
+ * deadline passes, in-flight attempts are aborted and the results completed
+ * so far are returned instead of blocking.
+ */
+export async function runScheduled<I, T>(
+  items: I[],
+  task: (item: I, signal: AbortSignal) => Promise<T>,
+  options: ScheduleOptions
+): Promise<ScheduleResult<T>> {
+  const results: (T | null)[] = items.map(() => null);
+  const deadline = new AbortController();
+  let nextIndex = 0;
+  let completed = 0;
+  let failed = 0;
+  let retries = 0;
+  let started = 0;
+  let totalQueueWaitMs = 0;
+  let maxQueueWaitMs = 0;
+  const batchStart = Date.now();
+
+  const runAttempt = async (item: I): Promise<T> => {
+    const attempt = new AbortController();
+    const abortAttempt = () => attempt.abort();
+    const timer = setTimeout(abortAttempt, options.timeoutMs);
+    deadline.signal.addEventListener('abort', abortAttempt);
+
+    try {
+      return await task(item, attempt.signal);
+    } finally {
+      clearTimeout(timer);
+      deadline.signal.removeEventListener('abort', abortAttempt);
+    }
+  };
+
+  const runItem = async (index: number): Promise<void> => {
+    for (let attempt = 0; ; attempt++) {
+      try {
+        results[index] = await runAttempt(items[index]);
+        completed++;
+        return;
+      } catch (error) {
+        const canRetry =
+          isTransientError(error) &&
+          attempt < options.maxRetries &&
+          retries < options.retryBudget &&
+          !deadline.signal.aborted;
+
+        if (!canRetry) {
+          failed++;
+          throw error;
+        }
+
+        retries++;
+        const jitter = 0.5 + Math.random();
+        await sleep(options.retryBaseDelayMs * 2 ** attempt * jitter, deadline.signal);
+      }
+    }
+  };
+
+  const worker = async (): Promise<void> => {
+    while (nextIndex < items.length && !deadline.signal.aborted) {
+      const index = nextIndex++;
+      const queueWaitMs = Date.now() - batchStart;
+      started++;
+      totalQueueWaitMs += queueWaitMs;
+      maxQueueWaitMs = Math.max(maxQueueWaitMs, queueWaitMs);
+
+      try {
+        await runItem(index);
+      } catch {
+        // Failures are reported through the null result
+      }
+    }
+  };
+
+  const workerCount = Math.min(options.concurrency, items.length);
+  const workers = Promise.all(Array.from({ length: workerCount }, worker));
+
+  let deadlineTimer: ReturnType<typeof setTimeout> | undefined;
+  const deadlinePassed = new Promise<void>((resolve) => {
+    deadlineTimer = setTimeout(() => {
+      deadline.abort();
+      resolve();
+    }, options.deadlineMs);
+  });
+
+  await Promise.race([workers, deadlinePassed]);
+  clearTimeout(deadlineTimer);
+
+  return {
+    results: [...results],
+    completed,
+    failed,
+    retries,
+    deadlineExceeded: deadline.signal.aborted,
+    avgQueueWaitMs: started > 0 ? totalQueueWaitMs / started : 0,
+    maxQueueWaitMs,
+  };
+}
+
+/**
+ * Waits for a delay, resolving early if the signal aborts
+ */
+function sleep(ms: number, signal: AbortSignal): Promise<void> {
+  return new Promise((resolve) => {
+    if (signal.aborted) {
+      resolve();
+      return;
+    }
+
+    const done = () => {
+      clearTimeout(timer);
+      signal.removeEventListener('abort', done);
+      resolve();
+    };
+
+    const timer = setTimeout(done, ms);
+    signal.addEventListener('abort', done);
+  });
+}
@@ -0,0 +1,43 @@
+// ABOUTME: Unit tests for snow-depth raster tile rendering
+// ABOUTME: Checks band coloring inside the coverage bounds and transparency outside it
+
+import { describe, it, expect } from 'vitest';
+import { inflateSync } from 'zlib';
+import { renderSnowTile, TILE_SIZE } from './snow-tiles';
+import { lonLatToTile } from './tile-math';
+
+const samples = {
+  lons: new Float64Array([-87.6, -88.5]),
+  lats: new Float64Array([41.9, 41.0]),
+  amounts: new Float64Array([11, 5]),
+};
+
+// Decodes the single IDAT chunk written by encodePng back into RGBA rows
+function decodePixels(png: Uint8Array): Uint8Array {
+  const view = new DataView(png.buffer, png.byteOffset);
+  const idatLength = view.getUint32(33);
+  const raw = inflateSync(png.subarray(41, 41 + idatLength));
+  const stride = TILE_SIZE * 4;
+  const rgba = new Uint8Array(stride * TILE_SIZE);
+  for (let y = 0; y < TILE_SIZE; y++) {
+    rgba.set(raw.subarray(y * (stride + 1) + 1, (y + 1) * (stride + 1)), y * stride);
+  }
+  return rgba;
+}
+
+describe('renderSnowTile', () => {
+  it('colors pixels with the snowfall band colors', () => {
+    const rgba = decodePixels(renderSnowTile(samples, lonLatToTile(-87.6, 41.9, 10)));
+    const colors = new Set<string>();
+    for (let i = 0; i < rgba.length; i += 4) {
+      colors.add(`${rgba[i]},${rgba[i + 1]},${rgba[i + 2]},${rgba[i + 3]}`);
+    }
+
+    expect(colors.has('124,58,237,255')).toBe(true); // Purple (10"+) around the 11" sample
+  });
+
+  it('leaves tiles outside the coverage bounds transparent', () => {
+    const rgba = decodePixels(renderSnowTile(samples, lonLatToTile(-120, 35, 8)));
+    expect(rgba.every((value) => value === 0)).toBe(true);
+  });
+});
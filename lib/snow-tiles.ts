@@ -0,0 +1,96 @@
+// ABOUTME: Renders the interpolated snow-depth surface into 256px PNG raster tiles
+// ABOUTME: Server-side counterpart of the choropleth, colored with the same snowfall bands
+
+import {
+  CHOROPLETH_BOUNDS,
+  getSnowfallBand,
+  SNOWFALL_BANDS,
+  type ChoroplethBounds,
+} from './choropleth';
+import { createGridSpec, interpolateGrid, type SampleColumns } from './idw-grid';
+import { encodePng } from './png';
+import { tileBounds, type TileCoord } from './tile-math';
+
+/**
+ * Tile edge length in pixels
+ */
+export const TILE_SIZE = 256;
+
+/**
+ * IDW grid cells across a tile; pixels take the value of their nearest grid cell
+ */
+export const TILE_GRID_CELLS = 64;
+
+// Band colors as [r, g, b]
+const BAND_RGB = SNOWFALL_BANDS.map(({ color }) => [
+  parseInt(color.slice(1, 3), 16),
+  parseInt(color.slice(3, 5), 16),
+  parseInt(color.slice(5, 7), 16),
+]);
+
+/**
+ * Renders one snow-depth tile as a PNG
+ * Pixels outside the coverage bounds (or with no samples at all) are transparent
+ */
+export function renderSnowTile(
+  samples: SampleColumns,
+  tile: TileCoord,
+  coverage: ChoroplethBounds = CHOROPLETH_BOUNDS
+): Uint8Array<ArrayBuffer> {
+  const rgba = new Uint8Array(TILE_SIZE * TILE_SIZE * 4);
+  const [[tileWest, tileSouth], [tileEast, tileNorth]] = tileBounds(tile);
+  const [[coverWest, coverSouth], [coverEast, coverNorth]] = coverage;
+
+  const west = Math.max(tileWest, coverWest);
+  const east = Math.min(tileEast, coverEast);
+  const south = Math.max(tileSouth, coverSouth);
+  const north = Math.min(tileNorth, coverNorth);
+
+  if (samples.amounts.length === 0 || west >= east || south >= north) {
+    return encodePng(TILE_SIZE, TILE_SIZE, rgba);
+  }
+
+  const grid = interpolateGrid(
+    samples,
+    createGridSpec(
+      { minLon: west, maxLon: east, minLat: south, maxLat: north },
+      (tileEast - tileWest) / TILE_GRID_CELLS
+    )
+  );
+
+  const n = 2 ** tile.z;
+  const pixelLon = (px: number) => ((tile.x + (px + 0.5) / TILE_SIZE) / n) * 360 - 180;
+  const pixelLat = (py: number) =>
+    (Math.atan(Math.sinh(Math.PI * (1 - (2 * (tile.y + (py + 0.5) / TILE_SIZE)) / n))) * 180) / Math.PI;
+
+  // Nearest grid column for every pixel column (the same for all rows)
+  const columns = new Int32Array(TILE_SIZE);
+  for (let px = 0; px < TILE_SIZE; px++) {
+    const lon = pixelLon(px);
+    columns[px] =
+      lon < west || lon > east
+        ? -1
+        : Math.min(Math.round((lon - grid.minLon) / grid.resolution), grid.cols - 1);
+  }
+
+  for (let py = 0; py < TILE_SIZE; py++) {
+    const lat = pixelLat(py);
+    if (lat < south || lat > north) continue;
+
+    const row = Math.min(Math.round((lat - grid.minLat) / grid.resolution), grid.rows - 1);
+
+    for (let px = 0; px < TILE_SIZE; px++) {
+      const col = columns[px];
+      if (col < 0) continue;
+
+      const [r, g, b] = BAND_RGB[getSnowfallBand(grid.values[row * grid.cols + col])];
+      const offset = (py * TILE_SIZE + px) * 4;
+      rgba[offset] = r;
+      rgba[offset + 1] = g;
+      rgba[offset + 2] = b;
+      rgba[offset + 3] = 255;
+    }
+  }
+
+  return encodePng(TILE_SIZE, TILE_SIZE, rgba);
+}
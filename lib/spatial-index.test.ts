@@ -0,0 +1,65 @@
+// ABOUTME: Unit tests for the grid-bucket spatial index
+// ABOUTME: Checks k-nearest, radius and bounding-box queries against brute-force results
+
+import { describe, it, expect } from 'vitest';
+import { SpatialIndex } from './spatial-index';
+
+// Deterministic pseudo-random coordinates across the Illinois region
+function makePoints(count: number) {
+  let seed = 42;
+  const random = () => {
+    seed = (seed * 16807) % 2147483647;
+    return seed / 2147483647;
+  };
+
+  const lons = Array.from({ length: count }, () => -91.5 + random() * 4);
+  const lats = Array.from({ length: count }, () => 37 + random() * 5.5);
+  return { lons, lats };
+}
+
+function bruteForceOrder(lons: number[], lats: number[], lon: number, lat: number) {
+  const distanceSq = (i: number) => (lon - lons[i]) ** 2 + (lat - lats[i]) ** 2;
+  return lons.map((_, i) => i).sort((a, b) => distanceSq(a) - distanceSq(b));
+}
+
+describe('SpatialIndex', () => {
+  const { lons, lats } = makePoints(200);
+  const index = new SpatialIndex(lons, lats);
+
+  it('finds the same k nearest points as a full scan', () => {
+    for (const [lon, lat] of [[-88, 41.9], [-90.2, 38.6], [-95, 45], [-87.5, 37]]) {
+      expect(index.nearest(lon, lat, 8)).toEqual(bruteForceOrder(lons, lats, lon, lat).slice(0, 8));
+    }
+  });
+
+  it('finds all points within a radius', () => {
+    const found = index.withinRadius(-89, 40, 0.75).sort((a, b) => a - b);
+    const expected = bruteForceOrder(lons, lats, -89, 40)
+      .filter((i) => (-89 - lons[i]) ** 2 + (40 - lats[i]) ** 2 <= 0.75 ** 2)
+      .sort((a, b) => a - b);
+
+    expect(found).toEqual(expected);
+  });
+
+  it('finds all points inside a bounding box', () => {
+    const found = index.withinBounds(-90, 39, -88.5, 41).sort((a, b) => a - b);
+    const expected = lons
+      .map((_, i) => i)
+      .filter((i) => lons[i] >= -90 && lons[i] <= -88.5 && lats[i] >= 39 && lats[i] <= 41);
+
+    expect(found).toEqual(expected);
+    expect(index.withinBounds(-100, 30, -95, 32)).toEqual([]);
+  });
+
+  it('returns every point when k exceeds the point count', () => {
+    const small = new SpatialIndex([-88, -87], [41, 42]);
+    expect(small.nearest(-88, 41, 5)).toEqual([0, 1]);
+  });
+
+  it('handles an empty point set', () => {
+    const empty = new SpatialIndex([], []);
+    expect(empty.nearest(-88, 41, 3)).toEqual([]);
+    expect(empty.withinRadius(-88, 41, 1)).toEqual([]);
+    expect(empty.withinBounds(-89, 40, -87, 42)).toEqual([]);
+  });
+});
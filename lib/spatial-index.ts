@@ -0,0 +1,249 @@
+// ABOUTME: Uniform grid-bucket spatial index over point coordinates
+// ABOUTME: Answers k-nearest, radius and bounding-box queries without scanning every sample
+
+/**
+ * Static spatial index over a set of lon/lat points
+ *
+ * Points are bucketed into square cells sized so each cell holds about one
+ * point on average. Queries return indices into the original coordinate
+ * arrays, so the index works for Measurement arrays and typed columns alike.
+ * Distances are Euclidean in degrees, matching the IDW interpolator.
+ */
+export class SpatialIndex {
+  private readonly lons: ArrayLike<number>;
+  private readonly lats: ArrayLike<number>;
+  private readonly minLon: number;
+  private readonly minLat: number;
+  private readonly cellSize: number;
+  private readonly cols: number;
+  private readonly rows: number;
+  private readonly cellStart: Int32Array; // Offsets into cellItems per cell (CSR layout)
+  private readonly cellItems: Int32Array; // Point indices grouped by cell
+
+  constructor(lons: ArrayLike<number>, lats: ArrayLike<number>, cellSize?: number) {
+    this.lons = lons;
+    this.lats = lats;
+
+    const count = lons.length;
+    let minLon = Infinity;
+    let minLat = Infinity;
+    let maxLon = -Infinity;
+    let maxLat = -Infinity;
+    for (let i = 0; i < count; i++) {
+      minLon = Math.min(minLon, lons[i]);
+      maxLon = Math.max(maxLon, lons[i]);
+      minLat = Math.min(minLat, lats[i]);
+      maxLat = Math.max(maxLat, lats[i]);
+    }
+
+    if (count === 0) {
+      minLon = minLat = maxLon = maxLat = 0;
+    }
+
+    // Aim for ~1 point per cell over the bounding box
+    const width = maxLon - minLon;
+    const height = maxLat - minLat;
+    const autoCellSize =
+      Math.sqrt((width * height) / Math.max(count, 1)) ||
+      Math.max(width, height) / Math.max(count, 1) ||
+      1;
+
+    this.minLon = minLon;
+    this.minLat = minLat;
+    this.cellSize = cellSize ?? autoCellSize;
+    this.cols = Math.floor(width / this.cellSize) + 1;
+    this.rows = Math.floor(height / this.cellSize) + 1;
+
+    // Counting sort of points into cells
+    const cellOf = new Int32Array(count);
+    this.cellStart = new Int32Array(this.cols * this.rows + 1);
+    for (let i = 0; i < count; i++) {
+      const col = Math.min(Math.floor((lons[i] - minLon) / this.cellSize), this.cols - 1);
+      const row = Math.min(Math.floor((lats[i] - minLat) / this.cellSize), this.rows - 1);
+      cellOf[i] = row * this.cols + col;
+      this.cellStart[cellOf[i] + 1]++;
+    }
+    for (let c = 0; c < this.cols * this.rows; c++) {
+      this.cellStart[c + 1] += this.cellStart[c];
+    }
+
+    const fill = this.cellStart.slice(0, -1);
+    this.cellItems = new Int32Array(count);
+    for (let i = 0; i < count; i++) {
+      this.cellItems[fill[cellOf[i]]++] = i;
+    }
+  }
+
+  /**
+   * Gets the number of indexed points
+   */
+  get size(): number {
+    return this.lons.length;
+  }
+
+  /**
+   * Finds the k points closest to a location
+   *
+   * @returns Point indices sorted by increasing distance
+   */
+  nearest(lon: number, lat: number, k: number): number[] {
+    const indices = new Int32Array(Math.max(k, 0));
+    const distancesSq = new Float64Array(Math.max(k, 0));
+    const found = this.nearestInto(lon, lat, k, indices, distancesSq);
+    return Array.from(indices.subarray(0, found));
+  }
+
+  /**
+   * Allocation-free k-nearest query for batch callers
+   *
+   * Writes point indices and squared distances, sorted by increasing distance,
+   * into caller-owned buffers of length >= k.
+   *
+   * @returns Number of neighbours written (less than k only for small point sets)
+   */
+  nearestInto(
+    lon: number,
+    lat: number,
+    k: number,
+    indices: Int32Array,
+    distancesSq: Float64Array
+  ): number {
+    if (k <= 0 || this.size === 0) {
+      return 0;
+    }
+
+    const queryCol = Math.floor((lon - this.minLon) / this.cellSize);
+    const queryRow = Math.floor((lat - this.minLat) / this.cellSize);
+    const maxRing = Math.max(
+      queryCol,
+      this.cols - 1 - queryCol,
+      queryRow,
+      this.rows - 1 - queryRow
+    );
+    let found = 0;
+
+    for (let ring = 0; ring <= maxRing; ring++) {
+      for (let row = queryRow - ring; row <= queryRow + ring; row++) {
+        if (row < 0 || row >= this.rows) continue;
+
+        // Only the ring's perimeter: full rows at the top/bottom, two cells otherwise
+        const onEdge = row === queryRow - ring || row === queryRow + ring;
+        const step = onEdge ? 1 : Math.max(2 * ring, 1);
+
+        for (let col = queryCol - ring; col <= queryCol + ring; col += step) {
+          if (col < 0 || col >= this.cols) continue;
+          found = this.collectCell(row * this.cols + col, lon, lat, k, found, indices, distancesSq);
+        }
+      }
+
+      // Points in rings beyond this one are at least `ring` cells away
+      const reach = ring * this.cellSize;
+      if (found === k && distancesSq[k - 1] <= reach * reach) {
+        break;
+      }
+    }
+
+    return found;
+  }
+
+  /**
+   * Finds all points within a radius of a location
+   *
+   * @returns Point indices in no particular order
+   */
+  withinRadius(lon: number, lat: number, radius: number): number[] {
+    const found: number[] = [];
+    const radiusSq = radius * radius;
+
+    this.forEachCandidate(lon - radius, lat - radius, lon + radius, lat + radius, (i) => {
+      const dx = lon - this.lons[i];
+      const dy = lat - this.lats[i];
+      if (dx * dx + dy * dy <= radiusSq) {
+        found.push(i);
+      }
+    });
+
+    return found;
+  }
+
+  /**
+   * Finds all points inside a bounding box (edges included)
+   *
+   * @returns Point indices in no particular order
+   */
+  withinBounds(minLon: number, minLat: number, maxLon: number, maxLat: number): number[] {
+    const found: number[] = [];
+
+    this.forEachCandidate(minLon, minLat, maxLon, maxLat, (i) => {
+      const lon = this.lons[i];
+      const lat = this.lats[i];
+      if (lon >= minLon && lon <= maxLon && lat >= minLat && lat <= maxLat) {
+        found.push(i);
+      }
+    });
+
+    return found;
+  }
+
+  /**
+   * Visits every point in cells overlapping a bounding box
+   * Candidates may lie slightly outside the box; callers filter exactly
+   */
+  private forEachCandidate(
+    minLon: number,
+    minLat: number,
+    maxLon: number,
+    maxLat: number,
+    visit: (index: number) => void
+  ): void {
+    const firstCol = Math.max(Math.floor((minLon - this.minLon) / this.cellSize), 0);
+    const lastCol = Math.min(Math.floor((maxLon - this.minLon) / this.cellSize), this.cols - 1);
+    const firstRow = Math.max(Math.floor((minLat - this.minLat) / this.cellSize), 0);
+    const lastRow = Math.min(Math.floor((maxLat - this.minLat) / this.cellSize), this.rows - 1);
+
+    for (let row = firstRow; row <= lastRow; row++) {
+      for (let col = firstCol; col <= lastCol; col++) {
+        const cell = row * this.cols + col;
+        for (let j = this.cellStart[cell]; j < this.cellStart[cell + 1]; j++) {
+          visit(this.cellItems[j]);
+        }
+      }
+    }
+  }
+
+  /**
+   * Merges a cell's points into the sorted k-best candidate buffers
+   *
+   * @returns Updated number of candidates held
+   */
+  private collectCell(
+    cell: number,
+    lon: number,
+    lat: number,
+    k: number,
+    found: number,
+    indices: Int32Array,
+    distancesSq: Float64Array
+  ): number {
+    for (let j = this.cellStart[cell]; j < this.cellStart[cell + 1]; j++) {
+      const index = this.cellItems[j];
+      const dx = lon - this.lons[index];
+      const dy = lat - this.lats[index];
+      const distanceSq = dx * dx + dy * dy;
+
+      if (found === k && distanceSq >= distancesSq[k - 1]) continue;
+
+      // Insertion into a short sorted list (k is small)
+      let position = found < k ? found++ : k - 1;
+      while (position > 0 && distancesSq[position - 1] > distanceSq) {
+        indices[position] = indices[position - 1];
+        distancesSq[position] = distancesSq[position - 1];
+        position--;
+      }
+      indices[position] = index;
+      distancesSq[position] = distanceSq;
+    }
+
+    return found;
+  }
+}
@@ -2,9 +2,11 @@
 // ABOUTME: Expands sparse snow depth samples into denser grids for visualization
 
 import { Measurement } from '@/types';
+import { createGridSpec, gridToMeasurements, interpolateGrid, toSampleColumns } from './idw-grid';
 
 /**
  * Inverse Distance Weighting interpolation at a single point
+ * Scans every sample; grids go through the batch engine in idw-grid instead
  */
 export function interpolateIDW(
   lon: number,
@@ -37,31 +39,16 @@ export function interpolateIDW(
 
 /**
  * Expands sparse samples into denser grid using IDW
+ * The grid is computed in one batch over typed arrays from each cell's
+ * DEFAULT_IDW_NEIGHBORS nearest samples; only cells above the trace
+ * threshold become Measurements
  */
 export function expandSamplesWithIDW(
   samples: Measurement[],
   gridResolution: number,
   bounds: { minLat: number; maxLat: number; minLon: number; maxLon: number }
 ): Measurement[] {
-  const expanded: Measurement[] = [];
+  const grid = interpolateGrid(toSampleColumns(samples), createGridSpec(bounds, gridResolution));
 
-  for (let lat = bounds.minLat; lat <= bounds.maxLat; lat += gridResolution) {
-    for (let lon = bounds.minLon; lon <= bounds.maxLon; lon += gridResolution) {
-      const interpolatedAmount = interpolateIDW(lon, lat, samples);
-
-      // Filter out trace amounts (< 0.1 inches)
-      if (interpolatedAmount > 0.1) {
-        expanded.push({
-          lat,
-          lon,
-          amount: interpolatedAmount,
-          source: 'NOAA_GRIDDED',
-          station: `INTERPOLATED_${lat.toFixed(2)}_${lon.toFixed(2)}`,
-          timestamp: new Date().toISOString(),
-        });
-      }
-    }
-  }
-
-  return expanded;
+  return gridToMeasurements(grid);
 }
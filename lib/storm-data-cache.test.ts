@@ -0,0 +1,137 @@
+// ABOUTME: Tests for the client-side storm data cache
+// ABOUTME: Verifies cache hits, request deduplication, cancellation and best-effort prefetching
+
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { StormDataCache } from './storm-data-cache';
+import { BINARY_MEDIA_TYPE, toBinary } from './binary-snowfall';
+import type { SnowfallEvent } from '@/types';
+
+const event: SnowfallEvent = {
+  stormId: 'storm-2025-12-04',
+  date: '2025-12-04T12:00:00.000Z',
+  measurements: [],
+};
+
+function mockFetch(ok = true) {
+  const fetchMock = vi.fn().mockImplementation(async (url: string) => ({
+    ok,
+    statusText: ok ? 'OK' : 'Internal Server Error',
+    headers: new Headers({ 'Content-Type': 'application/json' }),
+    json: async () => (url.endsWith('/regions') ? { type: 'FeatureCollection', features: [] } : event),
+  }));
+  vi.stubGlobal('fetch', fetchMock);
+  return fetchMock;
+}
+
+describe('StormDataCache', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('serves a seeded storm without fetching', async () => {
+    const fetchMock = mockFetch();
+    const cache = new StormDataCache();
+    cache.setEvent(event);
+
+    await expect(cache.loadEvent(event.stormId)).resolves.toBe(event);
+    expect(fetchMock).not.toHaveBeenCalled();
+  });
+
+  it('shares one request between concurrent loads', async () => {
+    const fetchMock = mockFetch();
+    const cache = new StormDataCache();
+
+    const [first, second] = await Promise.all([
+      cache.loadEvent(event.stormId),
+      cache.loadEvent(event.stormId),
+    ]);
+
+    expect(first).toEqual(event);
+    expect(second).toBe(first);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(cache.getEvent(event.stormId)).toBe(first);
+  });
+
+  it('prefetches the storm and its regions', async () => {
+    const fetchMock = mockFetch();
+    const cache = new StormDataCache();
+
+    await cache.prefetch(event.stormId);
+
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(cache.getEvent(event.stormId)).toEqual(event);
+    expect(cache.getRegions(event.stormId)).toEqual({ type: 'FeatureCollection', features: [] });
+  });
+
+  it('rejects failed loads but swallows failed prefetches', async () => {
+    mockFetch(false);
+    const cache = new StormDataCache();
+
+    await expect(cache.loadEvent(event.stormId)).rejects.toThrow('Failed to fetch storm data');
+    await expect(cache.prefetch(event.stormId)).resolves.toBeUndefined();
+    await expect(cache.loadRegions(event.stormId)).resolves.toBeNull();
+    expect(cache.getEvent(event.stormId)).toBeUndefined();
+  });
+
+  it('aborts the fetch of a superseded load', async () => {
+    const fetchMock = vi.fn().mockImplementation((_url: string, init: RequestInit) =>
+      new Promise((_resolve, reject) => {
+        init.signal?.addEventListener('abort', () => reject(init.signal?.reason));
+      })
+    );
+    vi.stubGlobal('fetch', fetchMock);
+    const cache = new StormDataCache();
+    const controller = new AbortController();
+
+    const load = cache.loadEvent(event.stormId, controller.signal);
+    controller.abort();
+
+    await expect(load).rejects.toThrow();
+    expect((fetchMock.mock.calls[0][1] as RequestInit).signal?.aborted).toBe(true);
+    expect(cache.getEvent(event.stormId)).toBeUndefined();
+  });
+
+  it('keeps a shared fetch alive for the loads still waiting on it', async () => {
+    let respond: (value: unknown) => void = () => {};
+    const fetchMock = vi.fn().mockImplementation(() => new Promise((resolve) => { respond = resolve; }));
+    vi.stubGlobal('fetch', fetchMock);
+    const cache = new StormDataCache();
+    const superseded = new AbortController();
+    const current = new AbortController();
+
+    const aborted = cache.loadEvent(event.stormId, superseded.signal);
+    const other = cache.loadEvent(event.stormId, current.signal);
+    superseded.abort();
+
+    await expect(aborted).rejects.toThrow();
+    expect((fetchMock.mock.calls[0][1] as RequestInit).signal?.aborted).toBe(false);
+    respond({
+      ok: true,
+      headers: new Headers({ 'Content-Type': 'application/json' }),
+      json: async () => event,
+    });
+
+    await expect(other).resolves.toEqual(event);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(cache.getEvent(event.stormId)).toEqual(event);
+  });
+
+  it('decodes binary storm payloads into cached columns', async () => {
+    const binaryEvent: SnowfallEvent = {
+      ...event,
+      measurements: [
+        { lat: 41.5, lon: -88, amount: 2.5, source: 'NOAA_GRIDDED', station: 'GRID_A', timestamp: event.date },
+      ],
+    };
+    const bytes = toBinary(binaryEvent);
+    vi.stubGlobal('fetch', vi.fn().mockResolvedValue({
+      ok: true,
+      headers: new Headers({ 'Content-Type': BINARY_MEDIA_TYPE }),
+      arrayBuffer: async () => bytes.buffer,
+    }));
+    const cache = new StormDataCache();
+
+    expect(await cache.loadEvent(event.stormId)).toEqual(binaryEvent);
+    expect(cache.getColumns(event.stormId)?.amounts).toBeInstanceOf(Float32Array);
+  });
+});
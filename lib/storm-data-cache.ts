@@ -0,0 +1,249 @@
+// ABOUTME: Client-side LRU of storm data and derived choropleth regions, keyed by stormId
+// ABOUTME: Deduplicates concurrent loads so prefetches and storm switches share one request
+
+import type { SnowfallEvent } from '@/types';
+import type { ChoroplethFeatureCollection } from './choropleth';
+import { BINARY_MEDIA_TYPE, decodeBinary } from './binary-snowfall';
+import { decodeColumnar, isColumnar } from './columnar';
+import type { SampleColumns } from './idw-grid';
+import { LruMap } from './lru-map';
+import type { Viewport } from './viewport-snowfall';
+
+const DEFAULT_MAX_STORMS = 12;
+
+// A storm fetch shared by every load waiting on it
+interface InFlightEvent {
+  promise: Promise<SnowfallEvent>;
+  controller: AbortController;
+  waiters: number; // Loads that still want the result; prefetches don't count
+}
+
+interface CachedStorm {
+  event?: SnowfallEvent;
+  columns?: SampleColumns; // Typed-array columns decoded from a binary or columnar payload
+  regions?: ChoroplethFeatureCollection;
+}
+
+/**
+ * Keeps recently viewed or prefetched storms in memory
+ */
+export class StormDataCache {
+  private readonly storms: LruMap<string, CachedStorm>;
+  private readonly inFlightEvents = new Map<string, InFlightEvent>();
+  private readonly inFlightRegions = new Map<string, Promise<ChoroplethFeatureCollection | null>>();
+
+  constructor(maxStorms: number = DEFAULT_MAX_STORMS) {
+    this.storms = new LruMap(maxStorms);
+  }
+
+  /**
+   * Gets a cached storm without fetching
+   */
+  getEvent(stormId: string): SnowfallEvent | undefined {
+    return this.storms.get(stormId)?.event;
+  }
+
+  /**
+   * Gets a cached storm's measurements as typed-array columns, if it was fetched in a compact format
+   */
+  getColumns(stormId: string): SampleColumns | undefined {
+    return this.storms.get(stormId)?.columns;
+  }
+
+  /**
+   * Stores a storm, e.g. the server-rendered initial storm
+   */
+  setEvent(event: SnowfallEvent, columns?: SampleColumns): void {
+    const entry = this.entry(event.stormId);
+    entry.event = event;
+    entry.columns = columns;
+  }
+
+  /**
+   * Gets a storm, fetching it in the binary format if it isn't cached
+   *
+   * Aborting the signal rejects this call with an AbortError. The shared fetch
+   * is cancelled once every load waiting on it has aborted, so a superseded
+   * storm switch stops downloading while a load still waiting keeps its fetch.
+   *
+   * @throws Error if the storm can't be fetched
+   */
+  loadEvent(stormId: string, signal?: AbortSignal): Promise<SnowfallEvent> {
+    const cached = this.getEvent(stormId);
+    if (cached) return Promise.resolve(cached);
+    if (signal?.aborted) return Promise.reject(signal.reason);
+
+    const request = this.fetchEvent(stormId);
+    request.waiters++;
+    if (!signal) return request.promise;
+
+    const release = () => {
+      request.waiters--;
+      if (request.waiters > 0) return;
+
+      // Loads starting after this get a fresh fetch rather than the cancelled one
+      request.controller.abort();
+      this.forgetInFlight(stormId, request);
+    };
+    signal.addEventListener('abort', release, { once: true });
+    request.promise
+      .finally(() => signal.removeEventListener('abort', release))
+      .catch(() => {});
+
+    return abortable(request.promise, signal);
+  }
+
+  /**
+   * Fetches just the measurements of a storm inside a viewport, binned when zoomed out
+   * Not kept here: the browser revalidates them with a conditional request instead
+   *
+   * @throws Error if the viewport can't be fetched
+   */
+  async loadViewport(stormId: string, viewport: Viewport, signal?: AbortSignal): Promise<SnowfallEvent> {
+    const query = new URLSearchParams({
+      format: 'binary',
+      bbox: viewport.bbox.join(','),
+      zoom: String(viewport.zoom),
+    });
+    const response = await fetch(`/api/snowfall/${stormId}?${query}`, { signal });
+    return (await readStormResponse(response)).event;
+  }
+
+  /**
+   * Gets cached choropleth regions for a storm without fetching
+   */
+  getRegions(stormId: string): ChoroplethFeatureCollection | undefined {
+    return this.storms.get(stormId)?.regions;
+  }
+
+  /**
+   * Stores choropleth regions for a storm, e.g. after building them locally
+   */
+  setRegions(stormId: string, regions: ChoroplethFeatureCollection): void {
+    this.entry(stormId).regions = regions;
+  }
+
+  /**
+   * Gets a storm's server-built regions, fetching them if they aren't cached
+   *
+   * @returns The regions, or null if the endpoint failed
+   */
+  loadRegions(stormId: string): Promise<ChoroplethFeatureCollection | null> {
+    const cached = this.getRegions(stormId);
+    if (cached) return Promise.resolve(cached);
+
+    let pending = this.inFlightRegions.get(stormId);
+    if (!pending) {
+      pending = (async () => {
+        try {
+          const response = await fetch(`/api/snowfall/${stormId}/regions`);
+          if (!response.ok) {
+            console.warn('Failed to fetch choropleth regions:', response.statusText);
+            return null;
+          }
+
+          const regions: ChoroplethFeatureCollection = await response.json();
+          this.setRegions(stormId, regions);
+          return regions;
+        } catch (error) {
+          console.warn('Error fetching choropleth regions:', error);
+          return null;
+        }
+      })().finally(() => this.inFlightRegions.delete(stormId));
+
+      this.inFlightRegions.set(stormId, pending);
+    }
+
+    return pending;
+  }
+
+  /**
+   * Warms the cache for a storm; failures are left for a real load to report
+   */
+  async prefetch(stormId: string): Promise<void> {
+    try {
+      // Rides along with any load of the storm, but doesn't keep its fetch alive
+      const event = this.getEvent(stormId) ?? this.fetchEvent(stormId).promise;
+      await Promise.all([event, this.loadRegions(stormId)]);
+    } catch {
+      // Prefetching is best effort
+    }
+  }
+
+  /**
+   * Gets the in-flight fetch of a storm, starting one if needed
+   */
+  private fetchEvent(stormId: string): InFlightEvent {
+    let request = this.inFlightEvents.get(stormId);
+    if (!request) {
+      const controller = new AbortController();
+      const started: InFlightEvent = {
+        promise: (async () => {
+          const response = await fetch(`/api/snowfall/${stormId}?format=binary`, { signal: controller.signal });
+          const { event, columns } = await readStormResponse(response);
+          this.setEvent(event, columns);
+          return event;
+        })().finally(() => this.forgetInFlight(stormId, started)),
+        controller,
+        waiters: 0,
+      };
+
+      request = started;
+      this.inFlightEvents.set(stormId, request);
+    }
+    return request;
+  }
+
+  /**
+   * Drops an in-flight fetch unless a newer one has replaced it
+   */
+  private forgetInFlight(stormId: string, request: InFlightEvent): void {
+    if (this.inFlightEvents.get(stormId) === request) {
+      this.inFlightEvents.delete(stormId);
+    }
+  }
+
+  /**
+   * Gets the cache entry for a storm, creating it if needed
+   */
+  private entry(stormId: string): CachedStorm {
+    let entry = this.storms.get(stormId);
+    if (!entry) {
+      entry = {};
+      this.storms.set(stormId, entry);
+    }
+    return entry;
+  }
+}
+
+/**
+ * Decodes a storm response in whichever format the server sent
+ *
+ * @throws Error if the response failed
+ */
+async function readStormResponse(response: Response): Promise<{ event: SnowfallEvent; columns?: SampleColumns }> {
+  if (!response.ok) {
+    throw new Error(`Failed to fetch storm data: ${response.statusText}`);
+  }
+
+  // Binary columns are views into the response buffer, so nothing is parsed or copied
+  if (response.headers.get('content-type')?.startsWith(BINARY_MEDIA_TYPE)) {
+    return decodeBinary(await response.arrayBuffer());
+  }
+
+  const payload: unknown = await response.json();
+  return isColumnar(payload) ? decodeColumnar(payload) : { event: payload as SnowfallEvent };
+}
+
+/**
+ * Rejects as soon as the signal aborts, without waiting for the promise
+ */
+function abortable<T>(promise: Promise<T>, signal: AbortSignal): Promise<T> {
+  if (signal.aborted) return Promise.reject(signal.reason);
+
+  return new Promise((resolve, reject) => {
+    const onAbort = () => reject(signal.reason);
+    signal.addEventListener('abort', onAbort, { once: true });
+    promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+  });
+}
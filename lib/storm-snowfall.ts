@@ -0,0 +1,69 @@
+// ABOUTME: Storm ID validation and cached loading of per-storm snowfall data
+// ABOUTME: Shared by the /api/snowfall/[stormId] routes so every view of a storm reads one cache entry
+
+import { NextResponse } from 'next/server';
+import { SnowfallEvent } from '@/types';
+import { cache } from './cache';
+import { fetchAllNoaaSnowfall } from './noaa-client';
+import { badRequestError, notFoundError, type ApiErrorResponse } from './api-error';
+
+/**
+ * Cache key for a storm's snowfall event
+ */
+export function stormSnowfallCacheKey(stormId: string): string {
+  return `snowfall:${stormId}`;
+}
+
+/**
+ * Parses the storm date from a storm ID like "storm-2025-12-04"
+ *
+ * @returns The storm date, or an error response for malformed or future storm IDs
+ */
+export function resolveStormDate(stormId: string): Date | NextResponse<ApiErrorResponse> {
+  // Validate stormId format (should be like "storm-2025-12-04")
+  if (!stormId || !stormId.match(/^storm-\d{4}-\d{2}-\d{2}$/)) {
+    return badRequestError('Storm ID must be in format: storm-YYYY-MM-DD');
+  }
+
+  // Extract date from stormId
+  const dateMatch = stormId.match(/storm-(\d{4})-(\d{2})-(\d{2})/);
+  if (!dateMatch) {
+    return badRequestError('Could not parse date from storm ID');
+  }
+
+  const [, year, month, day] = dateMatch;
+  const stormDate = new Date(`${year}-${month}-${day}`);
+
+  // Verify the storm date is not in the future
+  const now = new Date();
+  if (stormDate > now) {
+    return notFoundError('Storm date is in the future');
+  }
+
+  return stormDate;
+}
+
+/**
+ * Builds the snowfall event for a storm from NOAA sources
+ */
+async function loadStormSnowfall(stormId: string, stormDate: Date): Promise<SnowfallEvent> {
+  // For MVP, we'll use the same NOAA data regardless of stormId
+  // In production, this would query historical data for the specific date
+  const measurements = await fetchAllNoaaSnowfall();
+
+  return {
+    stormId,
+    date: stormDate.toISOString(),
+    measurements,
+  };
+}
+
+/**
+ * Gets a storm's snowfall event from the cache, loading it on a miss
+ * Stale entries refresh in the background and concurrent misses share one NOAA fetch
+ */
+export function getStormSnowfall(stormId: string, stormDate: Date): Promise<SnowfallEvent> {
+  return cache.getOrLoad(stormSnowfallCacheKey(stormId), () =>
+    loadStormSnowfall(stormId, stormDate)
+  );
+}
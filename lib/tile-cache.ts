@@ -0,0 +1,9 @@
+// ABOUTME: Bounded cache for rendered snow-depth raster tiles
+// ABOUTME: Kept apart from the data cache so tile churn can't evict storm data
+
+import { MemoryCache } from './cache';
+
+const MAX_TILES = 2000;
+const MAX_TILE_BYTES = 32 * 1024 * 1024; // 32 MB
+
+export const tileCache = new MemoryCache({ maxEntries: MAX_TILES, maxBytes: MAX_TILE_BYTES });
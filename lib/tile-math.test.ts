@@ -0,0 +1,33 @@
+// ABOUTME: Unit tests for Web Mercator tile math
+// ABOUTME: Checks tile lookup, tile bounds and viewport coverage
+
+import { describe, it, expect } from 'vitest';
+import { lonLatToTile, tileBounds, tilesCovering } from './tile-math';
+
+const chicago: [[number, number], [number, number]] = [[-87.9, 41.7], [-87.5, 42.0]];
+
+describe('tile math', () => {
+  it('finds the tile containing a location and its bounds', () => {
+    const tile = lonLatToTile(-87.6298, 41.8781, 10);
+    const [[west, south], [east, north]] = tileBounds(tile);
+
+    expect(tile).toEqual({ z: 10, x: 262, y: 380 });
+    expect(west).toBeLessThanOrEqual(-87.6298);
+    expect(east).toBeGreaterThan(-87.6298);
+    expect(south).toBeLessThanOrEqual(41.8781);
+    expect(north).toBeGreaterThan(41.8781);
+  });
+
+  it('covers the viewport plus a margin of tiles', () => {
+    const withoutMargin = tilesCovering(chicago, 10, 0);
+    const withMargin = tilesCovering(chicago, 10, 1);
+
+    const xs = withoutMargin.map((tile) => tile.x);
+    const ys = withoutMargin.map((tile) => tile.y);
+    const width = Math.max(...xs) - Math.min(...xs) + 1;
+    const height = Math.max(...ys) - Math.min(...ys) + 1;
+
+    expect(withoutMargin).toHaveLength(width * height);
+    expect(withMargin).toHaveLength((width + 2) * (height + 2));
+  });
+});
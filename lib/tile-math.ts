@@ -0,0 +1,64 @@
+// ABOUTME: Web Mercator (slippy map) tile math shared by client detail tiles and the server tile route
+// ABOUTME: Converts between lon/lat, z/x/y tile addresses and tile bounds
+
+/**
+ * Web Mercator tile address
+ */
+export interface TileCoord {
+  z: number;
+  x: number;
+  y: number;
+}
+
+/**
+ * Tile containing a location at zoom z
+ */
+export function lonLatToTile(lon: number, lat: number, z: number): TileCoord {
+  const n = 2 ** z;
+  const latRad = (lat * Math.PI) / 180;
+  const x = Math.floor(((lon + 180) / 360) * n);
+  const y = Math.floor(((1 - Math.log(Math.tan(latRad) + 1 / Math.cos(latRad)) / Math.PI) / 2) * n);
+
+  return {
+    z,
+    x: Math.min(Math.max(x, 0), n - 1),
+    y: Math.min(Math.max(y, 0), n - 1),
+  };
+}
+
+/**
+ * Geographic bounds of a tile as [[west, south], [east, north]]
+ */
+export function tileBounds({ z, x, y }: TileCoord): [[number, number], [number, number]] {
+  const n = 2 ** z;
+  const lon = (tx: number) => (tx / n) * 360 - 180;
+  const lat = (ty: number) => (Math.atan(Math.sinh(Math.PI * (1 - (2 * ty) / n))) * 180) / Math.PI;
+
+  return [
+    [lon(x), lat(y + 1)],
+    [lon(x + 1), lat(y)],
+  ];
+}
+
+/**
+ * Tiles covering a viewport, plus a margin of tiles around it so short pans stay detailed
+ */
+export function tilesCovering(
+  viewport: [[number, number], [number, number]],
+  z: number,
+  margin: number = 1
+): TileCoord[] {
+  const [[west, south], [east, north]] = viewport;
+  const n = 2 ** z;
+  const topLeft = lonLatToTile(west, north, z);
+  const bottomRight = lonLatToTile(east, south, z);
+  const tiles: TileCoord[] = [];
+
+  for (let y = Math.max(topLeft.y - margin, 0); y <= Math.min(bottomRight.y + margin, n - 1); y++) {
+    for (let x = Math.max(topLeft.x - margin, 0); x <= Math.min(bottomRight.x + margin, n - 1); x++) {
+      tiles.push({ z, x, y });
+    }
+  }
+
+  return tiles;
+}
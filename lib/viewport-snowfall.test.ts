@@ -0,0 +1,107 @@
+// ABOUTME: Tests for viewport queries over storm measurements
+// ABOUTME: Checks bbox parsing, filtering, snapping, memoization and low-zoom binning
+
+import { describe, it, expect } from 'vitest';
+import { NextResponse } from 'next/server';
+import {
+  BINNING_MAX_ZOOM,
+  binMeasurements,
+  binSizeDegrees,
+  parseViewport,
+  queryViewport,
+} from './viewport-snowfall';
+import type { Measurement, SnowfallEvent } from '@/types';
+
+const timestamp = '2025-12-04T12:00:00.000Z';
+
+// Grid points every 0.05° across northern Illinois
+function makeEvent(): SnowfallEvent {
+  const measurements: Measurement[] = [];
+  for (let lat = 40; lat <= 43; lat += 0.05) {
+    for (let lon = -90; lon <= -87; lon += 0.05) {
+      measurements.push({
+        lat,
+        lon,
+        amount: 2 + (lat - 40),
+        source: 'NOAA_GRIDDED',
+        station: `INTERPOLATED_${lat.toFixed(2)}_${lon.toFixed(2)}`,
+        timestamp,
+      });
+    }
+  }
+  return { stormId: 'storm-2025-12-04', date: timestamp, measurements };
+}
+
+describe('parseViewport', () => {
+  it('returns null without a bbox', () => {
+    expect(parseViewport(new URLSearchParams('format=binary'))).toBeNull();
+  });
+
+  it('reads the bbox and zoom', () => {
+    expect(parseViewport(new URLSearchParams('bbox=-88,41.6,-87.3,42.1&zoom=9.5'))).toEqual({
+      bbox: [-88, 41.6, -87.3, 42.1],
+      zoom: 9.5,
+    });
+  });
+
+  it('rejects malformed values', () => {
+    for (const query of ['bbox=-88,41.6,-87.3', 'bbox=-87,41,-88,42', 'bbox=a,b,c,d', 'bbox=-88,41,-87,42&zoom=99']) {
+      expect(parseViewport(new URLSearchParams(query))).toBeInstanceOf(NextResponse);
+    }
+  });
+});
+
+describe('queryViewport', () => {
+  const event = makeEvent();
+
+  it('returns every measurement inside the box at high zoom', () => {
+    const { measurements } = queryViewport(event, { bbox: [-88, 41.6, -87.3, 42.1], zoom: BINNING_MAX_ZOOM });
+
+    expect(measurements.length).toBeGreaterThan(0);
+    expect(measurements.length).toBeLessThan(event.measurements.length);
+    // Snapped outward, so the requested box is always covered
+    const covered = event.measurements.filter((m) => m.lon >= -88 && m.lon <= -87.3 && m.lat >= 41.6 && m.lat <= 42.1);
+    expect(covered.every((m) => measurements.includes(m))).toBe(true);
+  });
+
+  it('reuses the result for nearby viewports', () => {
+    const first = queryViewport(event, { bbox: [-88, 41.6, -87.3, 42.05], zoom: 11.2 });
+    const second = queryViewport(event, { bbox: [-87.999, 41.601, -87.301, 42.049], zoom: 11.7 });
+
+    expect(second).toBe(first);
+  });
+
+  it('bins measurements when zoomed out', () => {
+    const bbox: [number, number, number, number] = [-90, 40, -87, 43];
+    const binned = queryViewport(event, { bbox, zoom: 6 }).measurements;
+
+    expect(binned.length).toBeLessThan(event.measurements.length / 10);
+    const average = (values: number[]) => values.reduce((sum, v) => sum + v, 0) / values.length;
+    expect(average(binned.map((m) => m.amount))).toBeCloseTo(average(event.measurements.map((m) => m.amount)), 0);
+  });
+});
+
+describe('binMeasurements', () => {
+  const grid = (lat: number, amount: number): Measurement => ({
+    lat, lon: -87.95, amount, source: 'NOAA_GRIDDED', station: `INTERPOLATED_${lat}_-87.95`, timestamp,
+  });
+
+  it('averages grid points sharing a bin', () => {
+    const binned = binMeasurements([grid(41.91, 2), grid(41.93, 4)], binSizeDegrees(6));
+
+    expect(binned).toHaveLength(1);
+    expect(binned[0]).toMatchObject({ lat: 41.92, amount: 3, source: 'NOAA_GRIDDED', station: 'INTERPOLATED_41.92_-87.95' });
+  });
+
+  it('passes named grid samples through unbinned', () => {
+    const ohare: Measurement = { lat: 41.9742, lon: -87.9073, amount: 4.5, source: 'NOAA_GRIDDED', station: 'GRID_OHARE', timestamp };
+    const nohrsc: Measurement = { lat: 41.95, lon: -87.95, amount: 9, source: 'NOAA_GRIDDED', station: 'NOHRSC_41.95_-87.95', timestamp };
+
+    const binned = binMeasurements([ohare, nohrsc, grid(41.91, 2), grid(41.93, 4)], binSizeDegrees(6));
+
+    expect(binned).toHaveLength(3);
+    expect(binned).toContain(ohare);
+    expect(binned).toContain(nohrsc);
+    expect(binned[2]).toMatchObject({ amount: 3, station: 'INTERPOLATED_41.92_-87.95' });
+  });
+});
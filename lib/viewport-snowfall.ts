@@ -0,0 +1,191 @@
+// ABOUTME: Viewport queries over a storm's measurements: bounding-box filtering and zoom-dependent binning
+// ABOUTME: Backs ?bbox=&zoom= on /api/snowfall/[stormId] with a spatial index built once per cached event
+
+import { NextResponse } from 'next/server';
+import type { Measurement, SnowfallEvent } from '@/types';
+import { badRequestError, type ApiErrorResponse } from './api-error';
+import { INTERPOLATED_STATION_PREFIX, interpolatedStationName } from './columnar';
+import { LruMap } from './lru-map';
+import { SpatialIndex } from './spatial-index';
+
+/**
+ * [minLon, minLat, maxLon, maxLat]
+ */
+export type BoundingBox = [number, number, number, number];
+
+/**
+ * The part of a storm a client is looking at
+ */
+export interface Viewport {
+  bbox: BoundingBox;
+  zoom: number;
+}
+
+/**
+ * Zoom from which grid points are returned individually; below it they are binned
+ */
+export const BINNING_MAX_ZOOM = 10;
+
+// Bins are about this many screen pixels across
+const BIN_PIXELS = 32;
+
+// Boxes are snapped outward to this many bins, so small pans share a cached result
+const SNAP_BINS = 8;
+
+const MAX_ZOOM = 22;
+
+// Viewports kept per cached event
+const MAX_CACHED_VIEWPORTS = 64;
+
+// Keyed by the cached event, so each refresh is indexed once and its queries are dropped with it
+const indexes = new WeakMap<SnowfallEvent, SpatialIndex>();
+const viewportResults = new WeakMap<SnowfallEvent, LruMap<string, SnowfallEvent>>();
+
+/**
+ * Width in degrees of a bin at a zoom level (Mapbox draws the world 512px wide at zoom 0)
+ */
+export function binSizeDegrees(zoom: number): number {
+  return (BIN_PIXELS * 360) / (512 * 2 ** zoom);
+}
+
+/**
+ * Reads ?bbox=minLon,minLat,maxLon,maxLat&zoom=z from a request
+ *
+ * @returns The viewport, null when no bbox was given, or an error response for malformed values
+ */
+export function parseViewport(searchParams: URLSearchParams): Viewport | null | NextResponse<ApiErrorResponse> {
+  const bboxParam = searchParams.get('bbox');
+  if (bboxParam === null) {
+    return null;
+  }
+
+  const bbox = bboxParam.split(',').map(Number);
+  if (
+    bbox.length !== 4 ||
+    !bbox.every(Number.isFinite) ||
+    bbox[0] >= bbox[2] ||
+    bbox[1] >= bbox[3]
+  ) {
+    return badRequestError('bbox must be in format: minLon,minLat,maxLon,maxLat');
+  }
+
+  const zoomParam = searchParams.get('zoom');
+  const zoom = zoomParam === null ? BINNING_MAX_ZOOM : Number(zoomParam);
+  if (zoomParam === '' || !Number.isFinite(zoom) || zoom < 0 || zoom > MAX_ZOOM) {
+    return badRequestError(`zoom must be a number from 0 to ${MAX_ZOOM}`);
+  }
+
+  return { bbox: bbox as BoundingBox, zoom };
+}
+
+/**
+ * Gets the measurements of an event inside a viewport, with grid points binned below BINNING_MAX_ZOOM
+ *
+ * The zoom is floored and the box snapped outward to the bin grid, so nearby
+ * viewports return the same (memoized) event and share its encoded responses.
+ */
+export function queryViewport(event: SnowfallEvent, viewport: Viewport): SnowfallEvent {
+  const zoom = Math.floor(viewport.zoom);
+  const snap = binSizeDegrees(zoom) * SNAP_BINS;
+  const [minLon, minLat, maxLon, maxLat] = viewport.bbox;
+  const bbox: BoundingBox = [
+    Math.floor(minLon / snap) * snap,
+    Math.floor(minLat / snap) * snap,
+    Math.ceil(maxLon / snap) * snap,
+    Math.ceil(maxLat / snap) * snap,
+  ];
+
+  let results = viewportResults.get(event);
+  if (!results) {
+    results = new LruMap(MAX_CACHED_VIEWPORTS);
+    viewportResults.set(event, results);
+  }
+
+  const key = `${zoom}/${bbox.join(',')}`;
+  const cached = results.get(key);
+  if (cached) return cached;
+
+  let index = indexes.get(event);
+  if (!index) {
+    const { measurements } = event;
+    index = new SpatialIndex(
+      measurements.map((m) => m.lon),
+      measurements.map((m) => m.lat)
+    );
+    indexes.set(event, index);
+  }
+
+  const inside = index
+    .withinBounds(...bbox)
+    .sort((a, b) => a - b)
+    .map((i) => event.measurements[i]);
+
+  const result: SnowfallEvent = {
+    stormId: event.stormId,
+    date: event.date,
+    measurements: zoom < BINNING_MAX_ZOOM ? binMeasurements(inside, binSizeDegrees(zoom)) : inside,
+  };
+
+  results.set(key, result);
+  return result;
+}
+
+/**
+ * Resamples interpolated grid points onto a coarser grid of square bins
+ *
+ * Only synthetic INTERPOLATED_ points are binned: they are already samples of
+ * the IDW surface, so a bin's centroid with the mean amount (and latest
+ * timestamp) is just a coarser sample of it. Named samples (strategic grid
+ * points, NOHRSC blocks) pass through unchanged with their names and peak
+ * amounts, and the map clusters them. Bins holding a single grid point keep it.
+ */
+export function binMeasurements(measurements: Measurement[], binSize: number): Measurement[] {
+  const binned: Measurement[] = [];
+  const bins = new Map<string, Measurement[]>();
+
+  for (const m of measurements) {
+    if (!m.station.startsWith(INTERPOLATED_STATION_PREFIX)) {
+      binned.push(m);
+      continue;
+    }
+
+    const key = `${Math.floor(m.lon / binSize)}:${Math.floor(m.lat / binSize)}`;
+    const members = bins.get(key);
+    if (members) {
+      members.push(m);
+    } else {
+      bins.set(key, [m]);
+    }
+  }
+
+  for (const members of bins.values()) {
+    if (members.length === 1) {
+      binned.push(members[0]);
+      continue;
+    }
+
+    let lat = 0;
+    let lon = 0;
+    let amount = 0;
+    let timestamp = members[0].timestamp;
+    for (const m of members) {
+      lat += m.lat;
+      lon += m.lon;
+      amount += m.amount;
+      if (m.timestamp > timestamp) timestamp = m.timestamp;
+    }
+    lat /= members.length;
+    lon /= members.length;
+
+    binned.push({
+      lat,
+      lon,
+      amount: Math.round((amount / members.length) * 100) / 100,
+      source: 'NOAA_GRIDDED',
+      station: interpolatedStationName(lat, lon),
+      timestamp,
+    });
+  }
+
+  return binned;
+}
@@ -0,0 +1,23 @@
+// ABOUTME: Web Worker that builds choropleth region features off the main thread
+// ABOUTME: Receives sample columns as transferable typed arrays and posts back a FeatureCollection
+
+import { buildChoroplethFeatures } from '../choropleth';
+import type { ChoroplethRequest, ChoroplethResponse } from '../choropleth-client';
+
+self.addEventListener('message', (event: MessageEvent<ChoroplethRequest>) => {
+  const { id, lons, lats, amounts, bounds, resolution } = event.data;
+
+  try {
+    const response: ChoroplethResponse = {
+      id,
+      features: buildChoroplethFeatures({ lons, lats, amounts }, bounds, resolution),
+    };
+    self.postMessage(response);
+  } catch (error) {
+    const response: ChoroplethResponse = {
+      id,
+      error: error instanceof Error ? error.message : String(error),
+    };
+    self.postMessage(response);
+  }
+});
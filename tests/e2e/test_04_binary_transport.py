@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test #4: API route /api/snowfall/[stormId] returns specific storm data (binary transport)
+
+Steps:
+1. Get a valid stormId from /api/storms
+2. Request the storm as JSON and as ?format=binary
+3. Verify the binary response has the expected content type and header
+4. Decode the binary payload (little-endian Float32 columns + JSON metadata)
+5. Verify it matches the JSON measurements within Float32 precision
+"""
+
+import json
+import struct
+from decimal import Decimal, ROUND_HALF_UP
+import requests
+from urllib.parse import urljoin
+
+# Base URL for the ChiSnow app
+BASE_URL = "http://localhost:3000"
+
+HEADER_BYTES = 16
+
+
+def to_fixed_2(value):
+    """Formats like JavaScript's toFixed(2), which rounds exact ties away from zero"""
+    return str(Decimal(value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def decode_binary(payload):
+    """Decodes a binary snowfall payload into a list of measurements"""
+    magic, version, count, metadata_length = struct.unpack_from("<4sB3xII", payload, 0)
+    if magic != b"CSNW" or version != 1:
+        raise ValueError(f"Unexpected header: {magic!r} v{version}")
+
+    offset = HEADER_BYTES
+    lons = struct.unpack_from(f"<{count}f", payload, offset)
+    offset += count * 4
+    lats = struct.unpack_from(f"<{count}f", payload, offset)
+    offset += count * 4
+    amounts = struct.unpack_from(f"<{count}f", payload, offset)
+    offset += count * 4
+    source_indexes = payload[offset:offset + count]
+    offset += (count + 3) // 4 * 4
+
+    metadata = json.loads(payload[offset:offset + metadata_length].decode("utf-8"))
+    overrides = metadata.get("timestampOverrides", {})
+
+    measurements = []
+    for i in range(count):
+        station = metadata["stations"].get(str(i))
+        if station is None:
+            station = f"INTERPOLATED_{to_fixed_2(lats[i])}_{to_fixed_2(lons[i])}"
+        measurements.append({
+            "lat": lats[i],
+            "lon": lons[i],
+            "amount": amounts[i],
+            "source": metadata["sources"][source_indexes[i]],
+            "station": station,
+            "timestamp": overrides.get(str(i), metadata["timestamp"]),
+        })
+    return metadata, measurements
+
+
+def test_binary_transport():
+    print("\nStarting Test #4: Binary snowfall transport")
+    print("=" * 60)
+
+    # Step 1: Get a storm id
+    print("\n✓ Step 1: Fetching storm list from /api/storms...")
+    storms = requests.get(urljoin(BASE_URL, "/api/storms")).json()
+    assert storms, "No storms available"
+    storm_id = storms[0]["id"]
+    print(f"  ✓ Using storm {storm_id}")
+
+    # Step 2: Fetch both representations
+    print("\n✓ Step 2: Fetching JSON and binary representations...")
+    json_response = requests.get(urljoin(BASE_URL, f"/api/snowfall/{storm_id}"))
+    binary_response = requests.get(urljoin(BASE_URL, f"/api/snowfall/{storm_id}?format=binary"))
+    assert json_response.status_code == 200 and binary_response.status_code == 200, \
+        f"Requests failed: {json_response.status_code}, {binary_response.status_code}"
+
+    expected = json_response.json()
+    print(f"  ✓ JSON: {len(json_response.content)} bytes, binary: {len(binary_response.content)} bytes")
+
+    # Step 3: Check the content type
+    print("\n✓ Step 3: Verifying content type...")
+    content_type = binary_response.headers.get("Content-Type", "")
+    assert content_type.startswith("application/octet-stream"), f"Unexpected content type: {content_type}"
+    print(f"  ✓ Content-Type: {content_type}")
+
+    # Step 4: Decode
+    print("\n✓ Step 4: Decoding binary payload...")
+    metadata, measurements = decode_binary(binary_response.content)
+    assert metadata["stormId"] == storm_id, f"stormId mismatch: {metadata['stormId']}"
+    print(f"  ✓ Decoded {len(measurements)} measurements")
+
+    # Step 5: Compare with JSON
+    print("\n✓ Step 5: Comparing against JSON measurements...")
+    assert len(measurements) == len(expected["measurements"]), \
+        f"Count mismatch: {len(measurements)} vs {len(expected['measurements'])}"
+
+    for i, (actual, reference) in enumerate(zip(measurements, expected["measurements"])):
+        assert (abs(actual["lat"] - reference["lat"]) <= 1e-4
+                and abs(actual["lon"] - reference["lon"]) <= 1e-4
+                and abs(actual["amount"] - reference["amount"]) <= 0.005
+                and actual["source"] == reference["source"]
+                and actual["station"] == reference["station"]
+                and actual["timestamp"] == reference["timestamp"]), \
+            f"Measurement {i} differs: {actual} vs {reference}"
+    print("  ✓ All measurements match")
+
+    print("\n" + "=" * 60)
+    print("✅ Test #4 verification complete!")
+    print(f"Binary payload is {len(json_response.content) / len(binary_response.content):.1f}x smaller than JSON")
+
+
+if __name__ == "__main__":
+    try:
+        test_binary_transport()
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        exit(1)
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        exit(1)
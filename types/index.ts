@@ -54,7 +54,7 @@ export type StormsApiResponse = StormMetadata[];
 /**
  * Map visualization mode
  */
-export type VisualizationMode = "heatmap" | "markers" | "both";
+export type VisualizationMode = "heatmap" | "markers" | "both" | "gpu";
 
 /**
  * Map view state
@@ -19,6 +19,24 @@ vi.mock('mapbox-gl', () => {
         }
         addSource() {}
         addLayer() {}
+        getSource() {
+          return undefined;
+        }
+        getLayer() {
+          return undefined;
+        }
+        setPaintProperty() {}
+        getZoom() {
+          return 9;
+        }
+        getBounds() {
+          return {
+            getWest: () => -88.0,
+            getSouth: () => 41.6,
+            getEast: () => -87.3,
+            getNorth: () => 42.1,
+          };
+        }
       },
       NavigationControl: class NavigationControl {},
       Marker: class Marker {